@@ -24,4 +24,13 @@ echo "done" &&
 
 echo -n "Building simulator..." &&
 make $MAKEOPTS > ./tmp/pyrosimmake 2>&1 &&
-echo "done"
+echo "done" &&
+
+echo -n "Building headless simulator..." &&
+make $MAKEOPTS headless > ./tmp/pyrosimheadless 2>&1 &&
+echo "done" &&
+
+# capturing blind runs needs EGL, the rest of pyrosim works without it
+echo -n "Building offscreen simulator..." &&
+(make $MAKEOPTS offscreen > ./tmp/pyrosimoffscreen 2>&1 &&
+ echo "done" || echo "skipped, see tmp/pyrosimoffscreen")
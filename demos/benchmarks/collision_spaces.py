@@ -0,0 +1,65 @@
+"""Times the collision spaces on swarms of growing size
+
+Each scene is a square field of spheres that bounce off each other and
+off the ground. Which space is fastest depends on the number of bodies
+and how they are spread out; the table shows where one overtakes the
+other on this machine.
+
+Usage: python collision_spaces.py [eval_time]
+"""
+import sys
+sys.path.insert(0, '../..')
+
+import time
+
+import numpy as np
+import pyrosim
+
+SPACES = ['hash', 'quadtree', 'sap']
+SWARM_SIZES = [10, 50, 100, 200, 400, 800]
+SPACING = 0.5
+REPEATS = 3
+
+
+def send_swarm(sim, num_bodies, seed=0):
+    """Sends num_bodies spheres on a square grid, dropped from random heights"""
+
+    random = np.random.RandomState(seed)
+    side = int(np.ceil(np.sqrt(num_bodies)))
+    for i in range(num_bodies):
+        sim.send_sphere(x=SPACING * (i % side), y=SPACING * (i // side),
+                        z=0.2 + random.rand(), radius=0.2,
+                        collision_group='swarm')
+    sim.assign_collision('swarm', 'swarm')
+
+
+def time_scene(space, num_bodies, eval_time):
+    """Returns the fastest of REPEATS runs of one scene in seconds"""
+
+    times = []
+    for _ in range(REPEATS):
+        sim = pyrosim.Simulator(play_blind=True, eval_time=eval_time,
+                                binary=True, collision_space=space)
+        send_swarm(sim, num_bodies)
+
+        start = time.time()
+        sim.start()
+        sim.wait_to_finish()
+        times.append(time.time() - start)
+
+    return min(times)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        eval_time = int(sys.argv[1])
+    else:
+        eval_time = 200
+
+    print('bodies ' + ''.join('%10s' % space for space in SPACES) +
+          '   fastest')
+    for num_bodies in SWARM_SIZES:
+        times = [time_scene(space, num_bodies, eval_time)
+                 for space in SPACES]
+        print('%6d ' % num_bodies + ''.join('%9.3fs' % t for t in times) +
+              '   ' + SPACES[int(np.argmin(times))])
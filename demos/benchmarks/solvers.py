@@ -0,0 +1,78 @@
+"""Times the constraint solvers on the quadruped of demos/robots
+
+Runs the quadruped with the same random network under ODE's exact
+solver ('world') and under 'quickstep' with a growing number of
+iterations. Besides the time, the table shows how far the hips and
+knees swing past their stops, a measure of how much softer the
+iterative solver makes the joints. Too few iterations let the errors
+grow until the simulator aborts, which shows as diverged.
+
+Usage: python solvers.py [eval_time]
+"""
+import sys
+sys.path.insert(0, '../..')
+sys.path.insert(0, '../robots')
+
+import time
+
+import math
+
+import numpy as np
+import pyrosim
+
+import quadruped
+
+# (solver, solver_iterations)
+SOLVERS = [('world', 20), ('quickstep', 5), ('quickstep', 10),
+           ('quickstep', 20), ('quickstep', 50)]
+TIME_STEPS = [0.05, 0.01]
+NUM_NEURONS = 13
+REPEATS = 3
+
+
+def run_scene(solver, iterations, dt, eval_time):
+    """Returns the fastest of REPEATS runs in seconds and the angles of
+    the hips and knees over time"""
+
+    random = np.random.RandomState(0)
+    weight_matrix = random.rand(NUM_NEURONS, NUM_NEURONS, 4)
+    weight_matrix[:, :, 0:1] = weight_matrix[:, :, 0:1] * 2. - 1.
+
+    times = []
+    for _ in range(REPEATS):
+        sim = pyrosim.Simulator(play_blind=True, eval_time=eval_time,
+                                dt=dt, binary=True, solver=solver,
+                                solver_iterations=iterations)
+        layout = quadruped.send_to_simulator(sim,
+                                             weight_matrix=weight_matrix)
+        angles = [sim.send_proprioceptive_sensor(joint)
+                  for joint in layout['hips'] + layout['knees']]
+
+        start = time.time()
+        sim.start()
+        sim.wait_to_finish()
+        times.append(time.time() - start)
+
+    return min(times), np.array([sim.get_sensor_data(sensor)
+                                 for sensor in angles])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        eval_time = int(sys.argv[1])
+    else:
+        eval_time = 5000
+
+    print('   dt   solver      iterations      time   past stops (rad)')
+    for dt in TIME_STEPS:
+        for solver, iterations in SOLVERS:
+            seconds, angles = run_scene(solver, iterations, dt, eval_time)
+            label = '%5.2f   %-10s %11s %8.3fs' % (
+                dt, solver, iterations if solver == 'quickstep' else '-',
+                seconds)
+            if angles.shape[1] < eval_time or not np.isfinite(angles).all():
+                print(label + '   diverged')
+                continue
+            # every joint of the quadruped stops at pi/4 either way
+            overshoot = np.abs(angles).max() - math.pi / 4.0
+            print(label + '   %.4f' % max(overshoot, 0.0))
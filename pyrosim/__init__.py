@@ -1 +1,5 @@
-from .pyrosim import Simulator
\ No newline at end of file
+from .pyrosim import Simulator
+from .server import SimulatorServer
+from .batch import evaluate_many
+from .poselog import PoseLog, read_pose_log
+from .template import Parameter, SceneTemplate
@@ -0,0 +1,111 @@
+from __future__ import division, print_function
+import multiprocessing
+import threading
+
+from .server import SimulatorServer
+
+
+def evaluate_many(sims, workers=None, retries=1, batch_size=1):
+    """Evaluates many simulators in parallel
+
+    Keeps workers simulator processes busy, each a SimulatorServer that
+    evaluates one scene after the other. The most expensive scenes,
+    estimated from their bodies, joints and synapses times their
+    eval_time, are started first so that a long scene does not end up
+    running alone at the end. Every simulator runs blind.
+
+    With batch_size > 1 each worker loads that many scenes at once into
+    its simulator process and steps them side by side (see
+    SimulatorServer.evaluate_batch).
+
+    Parameters
+    ----------
+    sims    : list of Simulator
+            Simulators that have not been started yet
+    workers : int, optional
+            The number of simulator processes (the default is the number
+            of cpus)
+    retries : int, optional
+            How many more times a scene is tried after its simulator
+            crashed (default is 1)
+    batch_size : int, optional
+            The number of scenes a worker evaluates at once (default is 1)
+
+    Returns
+    -------
+    list of numpy matrix
+            The sensor data of each simulator in the order of sims, None
+            for scenes whose simulator kept crashing. The data is also
+            available from each simulator through get_data and
+            get_sensor_data.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    assert workers > 0, 'Need at least one worker'
+    assert batch_size > 0, 'Batch size must be positive'
+
+    sims = list(sims)
+    results = [None] * len(sims)
+    if not sims:
+        return results
+
+    # pop() takes from the end, so the cheapest scenes go first in line
+    order = sorted(range(len(sims)), key=lambda i: _estimate_cost(sims[i]))
+    attempts = [0] * len(sims)
+    alone = set()
+    lock = threading.Lock()
+    errors = []
+
+    def work():
+        with SimulatorServer(sims[0].pyrosim_path) as server:
+            while True:
+                with lock:
+                    if not order or errors:
+                        return
+                    batch = [order.pop()]
+                    while (len(batch) < batch_size and order and
+                           batch[0] not in alone and order[-1] not in alone):
+                        batch.append(order.pop())
+
+                try:
+                    batch_results = server.evaluate_batch(
+                        [sims[index] for index in batch])
+                except (IOError, OSError):
+                    with lock:
+                        for index in batch:
+                            if len(batch) > 1:
+                                # rerun each scene alone to find the one
+                                # that crashed
+                                alone.add(index)
+                            else:
+                                attempts[index] += 1
+                                if attempts[index] > retries:
+                                    continue
+                            order.append(index)
+                    continue
+                except Exception as error:
+                    with lock:
+                        errors.append(error)
+                    return
+
+                for index, data in zip(batch, batch_results):
+                    results[index] = data
+
+    threads = [threading.Thread(target=work)
+               for _ in range(min(workers, len(sims)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return results
+
+
+def _estimate_cost(sim):
+    """Estimates how long a simulator takes to evaluate"""
+
+    return ((sim.get_num_bodies() + sim.get_num_joints() +
+             sim.get_num_synapses()) * sim.eval_time)
@@ -0,0 +1,120 @@
+from __future__ import division, print_function
+import os
+
+import numpy as np
+
+# the layout of a pose log (see simulator/poseLog.h)
+POSE_LOG_MAGIC = b'PYROPOSE'
+POSE_LOG_VERSION = 1
+POSE_LOG_HEADER = np.dtype([('magic', 'S8'),
+                            ('version', '<i4'),
+                            ('num_bodies', '<i4'),
+                            ('log_every', '<i4'),
+                            ('unused', '<i4'),
+                            ('dt', '<f8')])
+POSE_LOG_BODY = np.dtype([('shape', '<i4'),
+                          ('color', '<f4', (3,)),
+                          ('size', '<f8', (3,))])
+POSE_SIZE = 7
+
+# body shapes, in the order of the simulator's shapes
+# (see simulator/constants.h)
+SHAPES = ['box', 'cylinder', 'sphere', 'capsule']
+
+
+class PoseLog(object):
+    """The poses of the bodies of a run, as logged by the simulator
+
+    The frames are mapped from the file rather than read, so only the
+    parts that are used are loaded.
+
+    Attributes
+    ----------
+    dt          : float
+            The time step interval of the run
+    log_every   : int
+            The number of time steps between two frames
+    shapes      : list of str
+            The shape of each body: 'box', 'cylinder', 'sphere' or
+            'capsule'
+    sizes       : numpy array
+            Length, width and height of each box, length and radius of
+            each cylinder or capsule and radius of each sphere, padded
+            with zeros to three columns
+    colors      : numpy array
+            The r, g, b color of each body
+    positions   : numpy array
+            The x, y, z position of each body in each frame, indexed
+            [frame, body, coordinate]. Frame 0 holds the positions the
+            bodies start in, frame k those after k * log_every time steps
+    quaternions : numpy array
+            The orientation of each body in each frame as a quaternion
+            w, x, y, z, indexed [frame, body, component]
+    """
+
+    def __init__(self, file_name):
+        file_size = os.path.getsize(file_name)
+        if file_size < POSE_LOG_HEADER.itemsize:
+            raise ValueError(file_name + ' is not a pose log')
+
+        contents = np.memmap(file_name, dtype=np.uint8, mode='r')
+        header = contents[:POSE_LOG_HEADER.itemsize].view(POSE_LOG_HEADER)[0]
+
+        num_bodies = int(header['num_bodies'])
+        frames_start = (POSE_LOG_HEADER.itemsize +
+                        num_bodies * POSE_LOG_BODY.itemsize)
+        if (header['magic'] != POSE_LOG_MAGIC or
+                header['version'] != POSE_LOG_VERSION or
+                num_bodies < 0 or frames_start > file_size):
+            raise ValueError(file_name + ' is not a pose log')
+
+        self.dt = float(header['dt'])
+        self.log_every = int(header['log_every'])
+
+        bodies = contents[POSE_LOG_HEADER.itemsize:frames_start].view(
+            POSE_LOG_BODY)
+        self.shapes = [SHAPES[shape] for shape in bodies['shape']]
+        self.sizes = np.array(bodies['size'])
+        self.colors = np.array(bodies['color'])
+
+        # a run that stopped early leaves the frames it got to
+        frame_size = num_bodies * POSE_SIZE * 4
+        num_frames = (file_size - frames_start) // frame_size if (
+            frame_size > 0) else 0
+        frames = contents[frames_start:frames_start +
+                          num_frames * frame_size].view('<f4').reshape(
+                              num_frames, num_bodies, POSE_SIZE)
+
+        self.positions = frames[:, :, :3]
+        self.quaternions = frames[:, :, 3:]
+
+    @property
+    def num_bodies(self):
+        """The number of bodies logged"""
+        return len(self.shapes)
+
+    @property
+    def num_frames(self):
+        """The number of frames logged"""
+        return self.positions.shape[0]
+
+    def times(self):
+        """Returns the time of each frame since the start of the run"""
+
+        return np.arange(self.num_frames) * self.log_every * self.dt
+
+
+def read_pose_log(file_name):
+    """Reads the pose log a simulator wrote
+
+    Parameters
+    ----------
+    file_name : str
+            The pose_log of the simulator
+
+    Returns
+    -------
+    PoseLog
+            The bodies and their poses in each frame
+    """
+    return PoseLog(file_name)
@@ -1,16 +1,25 @@
 from __future__ import division, print_function
+import io
 import math
 import os
+import struct
+import sys
 import numpy as np
 
 from subprocess import Popen, PIPE
 import subprocess
+try:
+    from subprocess import DEVNULL
+except ImportError:
+    DEVNULL = open(os.devnull, 'wb')
 
 import errno
 import shutil
 
 from datetime import datetime
 
+from .template import Parameter, SceneTemplate
+
 #simulator init constants
 evaluation_time = 100;
 dt = 0.05;
@@ -18,6 +27,105 @@ hpr=[121,-27.5000,0.0000];
 xyz=[0.8317,-0.9817,0.8000];
 gravity = -1.0;
 
+# binary sensor data records (see simulator/dataWriter.h)
+END_OF_BLOCK = -1
+SENSOR_HEADER_SIZE = 16
+SENSOR_DATA_TYPES = {0: np.dtype('<f8'),
+                     1: np.dtype('<i4')}
+
+# sensor recording modes besides recording every k-th time step
+# (see simulator/recorder.h)
+RECORD_NOTHING = 0
+RECORD_LAST = -1
+
+# the longest file path the simulator opens (PATH_MAX on linux)
+MAX_PATH_LENGTH = 4095
+
+# broadphase collision spaces, in the order of the simulator's space types
+# (see simulator/constants.h)
+COLLISION_SPACES = ['hash', 'quadtree', 'sap']
+
+# constraint solvers that step the world, in the order of the simulator's
+# solver types (see simulator/datastruct.h)
+SOLVERS = ['world', 'quickstep']
+
+# Commands of the binary scene upload (see simulator/pythonInput.h) with
+# the types of their fields: i is an int32, d a float64 and s a string.
+# A trailing * repeats the type before it for any remaining fields. The
+# index of a command is its opcode.
+COMMANDS = [
+    ('Done', ''),
+    ('Binary', ''),
+
+    ('EvaluationTime', 'i'),
+    ('TimeInterval', 'd'),
+    ('Substeps', 'i'),
+    ('Gravity', 'd'),
+    ('Solver', 'iiddd'),
+    ('TexturePath', 's'),
+    ('Debug', 'i'),
+    ('WindowSize', 'ii'),
+    ('Camera', 'dddddd'),
+    ('FollowBody', 'i'),
+    ('TrackBody', 'i'),
+    ('Render', 'id'),
+    ('Capture', 'ii'),
+    ('CaptureStream', 'i'),
+    ('PoseLog', 'is'),
+    ('StreamChunk', 'i'),
+    ('BatchSize', 'i'),
+    ('CollisionSpace', 'iiiiidddddd'),
+    ('CollisionMatrix', 'ii*'),
+
+    ('ExternalForce', 'idddi'),
+
+    ('Box', 'iddddddddddidddi'),
+    ('Cylinder', 'idddddddddidddi'),
+    ('Capsule', 'idddddddddidddi'),
+    ('Sphere', 'iddddddddidddi'),
+
+    ('HingeJoint', 'iiiddddddddddi'),
+    ('SliderJoint', 'iiidddddddi'),
+    ('Thruster', 'iiddddd'),
+
+    ('IsSeenSensor', 'iii'),
+    ('PositionSensor', 'iii'),
+    ('TouchSensor', 'iii'),
+    ('RaySensor', 'iidddddddi'),
+    ('ProprioceptiveSensor', 'iii'),
+    ('LightSensor', 'iiii'),
+    ('VestibularSensor', 'iii'),
+    ('LightSource', 'i'),
+
+    ('BiasNeuron', 'i'),
+    ('SensorNeuron', 'iii'),
+    ('HiddenNeuron', 'idd'),
+    ('MotorNeuron', 'iiddd'),
+    ('FunctionNeuron', 'id*'),
+
+    ('Synapse', 'iiddii'),
+
+    ('StopCondition', 'iiidi'),
+]
+COMMAND_OPCODES = dict((name, (opcode, fields))
+                       for opcode, (name, fields) in enumerate(COMMANDS))
+# precompiled layouts of the commands whose size is fixed
+COMMAND_STRUCTS = dict((name, struct.Struct('<ii' + fields))
+                       for name, fields in COMMANDS
+                       if '*' not in fields and 's' not in fields)
+
+def blind_simulator(pyrosim_path):
+    """The simulator binary that runs blind in pyrosim_path
+
+    simulator-headless, built by make headless, leaves out drawstuff, GL
+    and GLUT, so it starts faster and runs where they are not installed.
+    Without it the regular simulator runs blind.
+    """
+    headless = pyrosim_path + '/simulator-headless'
+    if os.path.exists(headless):
+        return headless
+    return pyrosim_path + '/simulator'
+
 def make_sure_path_exists(path):
     try:
         shutil.rmtree(path, ignore_errors=True)
@@ -42,8 +150,14 @@ class Simulator(object):
     eval_time    : int, optional
             The number of discrete steps in the simulation (the default is 100)
     dt          : float, optional
-            The time in seconds between physics world steps. Larger dt values 
+            The time in seconds between time steps. Larger dt values 
             create more unstable physics. (the default is 0.05)
+    substeps    : int, optional
+            The number of physics world steps of dt/substeps seconds
+            each per time step. The sensors, the neural network and the
+            recording run once per time step, so more substeps steady
+            the physics of stiff robots without slowing down the rest.
+            (the default is 1)
     gravity     : float, optional
             The gravity in the system. Negative values implies normal downward 
             force of gravity. (default is -1.0)
@@ -61,48 +175,180 @@ class Simulator(object):
     debug       : bool, optional
             If True print out every string command sent through the pipe to 
             the simulator (the default is False)
-    capture     : bool, optional
-            If True captures frames of the simulation every capture
-            timesteps.  Meaningless if playing blind.  (the default is False) 
+    render_every : int, optional
+            The number of time steps simulated for every frame drawn, so
+            long runs can be watched faster than the display draws. None
+            draws every time step, or only the captured frames of blind
+            runs (the default is None)
+    real_time   : float, optional
+            Paces the simulation to the wall clock instead, simulating
+            real_time seconds for every second that passes, whatever the
+            frame rate. Scenes too heavy to keep up run slower. None
+            steps by render_every (the default is None)
+    capture     : int, optional
+            Captures the first frame drawn after every capture time steps
+            into frame/NNNN.ppm, or 0 for none. Blind runs are drawn
+            offscreen by simulator-offscreen, built by make offscreen,
+            which needs EGL but no display. (the default is 0)
+    capture_scale : int, optional
+            Shrinks the captured frames by this factor in each direction
+            by averaging blocks of pixels (the default is 1)
+    movie       : str, optional
+            The file name of a movie to pipe the captured frames into.
+            ffmpeg encodes the frames while the simulation runs, so no
+            frame files are written. None writes frame files instead
+            (the default is None)
+    pose_log    : str, optional
+            The file to log the position and orientation of every body
+            into, for replays and read_pose_log. None logs nothing
+            (the default is None)
+    pose_log_every : int, optional
+            Logs the poses every pose_log_every time steps
+            (the default is 1)
+    replay      : str, optional
+            A pose log to draw instead of simulating. The bodies come
+            from the log, so none may be sent; render_every, real_time
+            and capture count frames of the log. Keys step through the
+            replay: , and . go back and forth by a frame, [ and ] halve
+            and double the speed and 0 to 9 jump to that tenth of the
+            log. Blind replays must capture. (the default is None)
+    binary      : bool, optional
+            If True the scene is sent to the simulator packed in binary
+            instead of as text, which is much faster to parse for large
+            robots. Ignored in debug mode. (the default is False)
+    collision_space : str, optional
+            The broadphase that finds the bodies that may touch: 'hash'
+            for a multi-resolution hash table, 'quadtree' for a quadtree
+            over the ground plane or 'sap' for sweep and prune. The
+            space is sized to the bodies sent. 'quadtree' and 'sap' pay
+            off for scenes of many bodies spread out over a large
+            area, see demos/benchmarks/collision_spaces.py
+            (the default is 'hash')
+    solver      : str, optional
+            The constraint solver that steps the world: 'world' for
+            ODE's exact big matrix solver, whose cost grows with the cube
+            of the constraints touching each other, or 'quickstep' for
+            the iterative solver, whose cost grows linearly. 'quickstep'
+            is faster for robots with many joints and contacts but
+            joints are softer, see docs/advanced/02_solver.rst
+            (the default is 'world')
+    solver_iterations : int, optional
+            The number of iterations of 'quickstep' per time step. More
+            iterations give stiffer joints. (the default is 20)
+    sor         : float, optional
+            The over-relaxation factor of 'quickstep' (the default is 1.3)
+    erp         : float, optional
+            The fraction of joint and contact error corrected each time
+            step, between 0 and 1. None keeps ODE's default of 0.2
+            (the default is None)
+    cfm         : float, optional
+            The constraint force mixing, how much constraints may give.
+            None keeps ODE's default (the default is None)
     """
 
     WORLD = -1
     FOREVER = -1
 
     def __init__(self, play_blind=False, play_paused=False,
-                 eval_time=evaluation_time, dt=dt,
+                 eval_time=evaluation_time, dt=dt, substeps=1,
                  gravity=gravity,
                  window_size = (750,500),
                  xyz=xyz, hpr=hpr, use_textures=False,
-                 debug=False, capture=0):
+                 debug=False, render_every=None, real_time=None,
+                 capture=0, capture_scale=1, movie=None,
+                 pose_log=None, pose_log_every=1, replay=None,
+                 binary=False,
+                 collision_space='hash', solver='world',
+                 solver_iterations=20, sor=1.3, erp=None, cfm=None):
         assert play_blind == False or eval_time > 0, ('Cannot run'
                                                       ' blind forever')
         assert eval_time > 0, ('Cannot run forever: FIXXX MEEE')
+        assert substeps > 0, ('Cannot take fewer than one physics step'
+                              ' per time step')
+        assert collision_space in COLLISION_SPACES, (
+            'Collision space must be one of ' + ', '.join(COLLISION_SPACES))
+        assert solver in SOLVERS, (
+            'Solver must be one of ' + ', '.join(SOLVERS))
+        assert solver_iterations > 0, ('Solver needs at least one'
+                                       ' iteration')
+        assert render_every is None or render_every > 0, (
+            'Cannot draw fewer than one time step per frame')
+        assert real_time is None or real_time > 0, (
+            'Real time factor must be positive')
+        assert capture_scale > 0, 'Capture scale must be positive'
+        assert pose_log_every > 0, ('Cannot log poses fewer than once'
+                                    ' per time step')
+        assert pose_log is None or replay is None, (
+            'Cannot log the poses of a replay')
+        assert pose_log is None or (
+            len(os.path.abspath(pose_log)) <= MAX_PATH_LENGTH), (
+            'Pose log path cannot be longer than ' + str(MAX_PATH_LENGTH) +
+            ' characters')
+        # the text upload separates fields with whitespace
+        assert pose_log is None or binary or (
+            len(os.path.abspath(pose_log).split()) == 1), (
+            'Pose log path cannot contain whitespace without binary')
+        assert replay is None or not play_blind or capture, (
+            'Blind replays must capture')
+        assert (window_size[0] >= capture_scale and
+                window_size[1] >= capture_scale), (
+            'Capture scale cannot exceed the window size')
 
         self.strings_to_send = []
+        self._binary_commands = bytearray()
+        self._parameter_offsets = []
 
         self._num_bodies = 0
         self._num_joints = 0
         self._num_sensors = 0
+        self._sensor_recording = []
+        self._sensor_values = []
         self._num_neurons = 0
+        self._num_synapses = 0
         self._collision_groups = []
         self._collision_matrix = None
         self._matrix_created = False
+        self._body_bounds = []
+        self._static_bodies = set()
 
         self.play_paused = play_paused
         self.play_blind = play_blind
         self.eval_time = eval_time
         self.dt = dt
+        self.substeps = substeps
         self.gravity = gravity
         self.debug = debug
+        self.binary = binary and not debug
+        self.collision_space = collision_space
+        self.solver = solver
+        self.solver_iterations = solver_iterations
+        self.sor = sor
+        self.erp = erp
+        self.cfm = cfm
         self.use_textures = use_textures
 
+        self.window_size = tuple(window_size)
+        if render_every is None:
+            # nobody watches blind runs, draw only the frames captured
+            if play_blind and capture:
+                render_every = capture
+            else:
+                render_every = 1
+        self.render_every = render_every
+        self.real_time = real_time
         self.capture = capture
-        if (self.capture):
+        self.capture_scale = capture_scale
+        self.movie = movie
+        if (self.capture and self.movie is None):
             make_sure_path_exists('frame')
+        self._encoder = None
+        self.pose_log = pose_log
+        self.pose_log_every = pose_log_every
+        self.replay = replay
 
         self.evaluated = False
         self.collision_matrix_sent = False
+        self._stream_chunk = 0
 
         self.pyrosim_path = os.path.dirname(
             os.path.abspath(__file__))+'/simulator'
@@ -117,26 +363,41 @@ class Simulator(object):
             self.play_paused = False
 
         # Initial simulator commands
+        if (self.debug):
+            self._send('Debug', 1)
+        else:
+            self._send('Debug', 0)
         self._send('TexturePath', self.pyrosim_path+'/textures')
         self._send('EvaluationTime', self.eval_time)
         self._send('TimeInterval', self.dt)
+        self._send('Substeps', self.substeps)
         self._send('Gravity', self.gravity)
+        # negative erp and cfm keep the defaults of ODE
+        self._send('Solver', SOLVERS.index(self.solver),
+                   self.solver_iterations, self.sor,
+                   -1.0 if self.erp is None else self.erp,
+                   -1.0 if self.cfm is None else self.cfm)
         self._send('WindowSize', *window_size)
-        if (self.capture):
-            self._send('Capture', 1)
-        else:
-            self._send('Capture', 0)
+        # a real time factor of 0 steps by render_every
+        self._send('Render', self.render_every,
+                   0.0 if self.real_time is None else self.real_time)
+        self._send('Capture', int(self.capture), self.capture_scale)
+        if self.pose_log is not None:
+            self._send('PoseLog', self.pose_log_every,
+                       os.path.abspath(self.pose_log))
 
-        if (self.debug):
-            self._send('Debug', 1)
-        else:
-            self._send('Debug', 0)
         self.send_camera(xyz, hpr)
 
 # ------Collisions-------------------------
     def create_collision_matrix(self, collision_type='none'):
         """Create a predefined collision matrix
 
+        The simulator keeps the bodies of each group in a collision
+        space of their own, so pairs of bodies from groups that do not
+        collide are discarded before they are tested. Giving each robot
+        its own group that does not collide with itself is the cheapest
+        way to ignore overlapping limbs.
+
         Parameters
         ----------
         collision_type : str, optional
@@ -219,8 +480,14 @@ class Simulator(object):
 # ------Getters--------------------------
 
     def get_data(self):
-        """Get all sensor data back as numpy matrix"""
+        """Get all sensor data back as numpy matrix
+
+        Sensors that do not record every time step fill the start of
+        their rows, the rest is zero. Use get_sensor_data to get only
+        the recorded values.
+        """
         assert self.evaluated == True, 'Simulation has not run yet'
+        assert self.data is not None, 'Sensor data is not kept after stream()'
         return self.data
 
     def get_group_id(self, group):
@@ -255,6 +522,18 @@ class Simulator(object):
         """Returns the number of sensors"""
         return self._num_sensors
 
+    def get_num_synapses(self):
+        """Returns the number of synapses"""
+        return self._num_synapses
+
+    def get_stop_step(self):
+        """Returns the number of time steps the simulation ran
+
+        This is eval_time unless a stop condition ended it early.
+        """
+        assert self.evaluated == True, 'Simulation has not run yet'
+        return self._stop_step
+
     def get_sensor_data(self, sensor_id, svi=0):
         """Get the post simulation data from a specified sensor
 
@@ -271,10 +550,12 @@ class Simulator(object):
         Returns
         -------
         list of float
-                Returns the list of sensor values over the simulation.
+                Returns the list of sensor values over the simulation,
+                one per recorded time step.
         """
         assert self.evaluated == True, 'Simulation has not run yet'
-        return self.data[sensor_id, svi, :]
+        assert self.data is not None, 'Sensor data is not kept after stream()'
+        return self.data[sensor_id, svi, :self._recorded_steps[sensor_id]]
 
 # -----Camera---------------------------
     def send_camera(self, xyz, hpr):
@@ -340,7 +621,7 @@ class Simulator(object):
                  r1=0, r2=0, r3=1,
                  length=0.1, width=0.1, height=0.1,
                  collision_group='default',
-                 r=1, g=1, b=1):
+                 r=1, g=1, b=1, static=False):
         """Send box body to the simulator
 
         Parameters
@@ -369,6 +650,11 @@ class Simulator(object):
                 The amount of the color green in the body (g in [0,1])
         b       : float, optional
                 The amount of the color blue in the body (b in [0,1])
+        static  : bool, optional
+                Make the box immovable scenery: a geom without a body that
+                collides and is drawn but adds nothing to the solver. Its
+                mass is ignored and it cannot be jointed, pushed or carry
+                a thruster (default is False)
 
         Returns
         -------
@@ -388,6 +674,8 @@ class Simulator(object):
 
         body_id = self._num_bodies
         self._num_bodies += 1
+        self._add_body_bounds(x, y, z,
+                              math.sqrt(length**2 + width**2 + height**2))
 
         self._send('Box',
                    body_id,
@@ -396,7 +684,8 @@ class Simulator(object):
                    length, width, height,
                    mass,
                    group_id,
-                   r, g, b)
+                   r, g, b,
+                   self._add_static_body(body_id, static))
 
         return body_id
 
@@ -405,7 +694,7 @@ class Simulator(object):
                     r1=0, r2=0, r3=1,
                     radius=0.1, mass=1.0,
                     collision_group='default',
-                    r=1, g=1, b=1):
+                    r=1, g=1, b=1, static=False):
         """Sends a sphere to the simulator
 
         Parameters
@@ -430,6 +719,11 @@ class Simulator(object):
                 The amount of the color green in the body (g in [0,1])
         b       : float, optional
                 The amount of the color blue in the body (b in [0,1])
+        static  : bool, optional
+                Make the sphere immovable scenery: a geom without a body that
+                collides and is drawn but adds nothing to the solver. Its
+                mass is ignored and it cannot be jointed, pushed or carry
+                a thruster (default is False)
 
         Returns
         -------
@@ -446,6 +740,7 @@ class Simulator(object):
 
         body_id = self._num_bodies
         self._num_bodies += 1
+        self._add_body_bounds(x, y, z, 2 * radius)
 
         self._send('Sphere',
                    body_id,
@@ -454,7 +749,8 @@ class Simulator(object):
                    radius,
                    mass,
                    group_id,
-                   r, g, b)
+                   r, g, b,
+                   self._add_static_body(body_id, static))
 
         return body_id
 
@@ -465,7 +761,7 @@ class Simulator(object):
                       mass=1.0,
                       collision_group='default',
                       r=1, g=1, b=1,
-                      capped=True):
+                      capped=True, static=False):
         """Send cylinder body to the simulator
 
         Parameters
@@ -509,6 +805,11 @@ class Simulator(object):
                 Use a hemisphere cap at the end of the cylinder or not.
                 Collision detection in flat-ended cylinders usually takes
                 more effort.
+        static  : bool, optional
+                Make the cylinder immovable scenery: a geom without a body that
+                collides and is drawn but adds nothing to the solver. Its
+                mass is ignored and it cannot be jointed, pushed or carry
+                a thruster (default is False)
 
         Returns
         -------
@@ -530,8 +831,11 @@ class Simulator(object):
 
         if capped:
             name = 'Capsule'
+            self._add_body_bounds(x, y, z, math.hypot(length + 2 * radius,
+                                                      2 * radius))
         else:
             name = 'Cylinder'
+            self._add_body_bounds(x, y, z, math.hypot(length, 2 * radius))
 
         self._send(name,
                    body_id,
@@ -540,7 +844,8 @@ class Simulator(object):
                    length, radius,
                    mass,
                    group_id,
-                   r, g, b)
+                   r, g, b,
+                   self._add_static_body(body_id, static))
 
         return body_id
 
@@ -641,6 +946,7 @@ class Simulator(object):
                              'than or equal to zero')
         assert (first_body_id >= 0 or
                 second_body_id >= 0), ('Both objects cannot be the world')
+        self._assert_not_static('Joint', first_body_id, second_body_id)
 
         self._assert_non_zero('Hinge Joint', n1, n2, n3)
 
@@ -722,6 +1028,7 @@ class Simulator(object):
                                'than or equal to zero')
         assert (first_body_id >= 0 or
                 second_body_id >= 0), ('Both objects cannot be the world')
+        self._assert_not_static('Joint', first_body_id, second_body_id)
 
         joint_id = self._num_joints
         self._num_joints += 1
@@ -770,6 +1077,7 @@ class Simulator(object):
         self._assert_non_zero('Jet', x, y, z)
         assert hi >= lo, 'Hi parameter must be geq to lo parameter'
         assert body_id < self._num_bodies, 'Body must exist'
+        self._assert_not_static('Thruster', body_id)
 
         joint_id = self._num_joints
         self._num_joints += 1
@@ -890,34 +1198,28 @@ class Simulator(object):
 
         Parameters
         ----------
-        in_values : list of floats or float, optional
+        in_values : numpy array, list of floats or float, optional
                 The user specified values for the neuron. If length of 
                 values < the number of time steps, the values are 
                 continually looped through until every time step
-                has a corresponding value
+                has a corresponding value. Values past the last time
+                step are ignored.
 
         Returns
         -------
         int
                 The id tag of the neuron.
         """
-        try:
-            iter(in_values)
-        except TypeError:
-            in_values = [in_values]*self.eval_time
+        in_values = np.asarray(in_values, dtype='f8').ravel()
+        assert in_values.size > 0, 'User input neuron needs values'
 
         # if values is shorter than eval_time repeat until sufficient
-        if len(in_values) < self.eval_time:
-            out_values = [0]*self.eval_time
-            for i in range(self.eval_time):
-                out_values[i] = in_values[i % len(in_values)]
-        else:
-            out_values = in_values
+        out_values = np.resize(in_values, self.eval_time)
 
         neuron_id = self._num_neurons
         self._num_neurons += 1
 
-        self._send('FunctionNeuron', neuron_id, *out_values)
+        self._send('FunctionNeuron', neuron_id, out_values)
 
         return neuron_id
 
@@ -929,11 +1231,15 @@ class Simulator(object):
         For example if evalTime=100 and dt=0.05 the function will be evaluated 
         at [0,0.05,...,5]
 
+        Vectorized functions such as numpy ufuncs are called once with the
+        array of all times, other functions once per time step.
+
         Parameters
         ----------
         function : function, optional
                 The function which defines the neuron value. Valid functions 
-                return a single float value over the time domain.
+                return a single float value over the time domain, or an
+                array of values when given an array of times.
 
         Returns
         -------
@@ -945,7 +1251,13 @@ class Simulator(object):
 
         end_time = self.eval_time*self.dt
         time_vals = np.arange(0, end_time, self.dt)
-        output_vals = list(map(function, time_vals))
+        try:
+            output_vals = np.asarray(function(time_vals), dtype='f8')
+        except (TypeError, ValueError):
+            # not vectorized, e.g. math.sin
+            output_vals = None
+        if output_vals is None or output_vals.shape != time_vals.shape:
+            output_vals = list(map(function, time_vals))
 
         return self.send_user_input_neuron(output_vals)
 
@@ -1006,6 +1318,7 @@ class Simulator(object):
         assert time >= 0 and time <= self.eval_time, (
             'Time step must be within eval time')
         self._assert_non_zero('Force', x, y, z)
+        self._assert_not_static('Force', body_id)
 
         self._send('ExternalForce', body_id, x, y, z, time)
 
@@ -1033,13 +1346,21 @@ class Simulator(object):
         return body_id
 
 # ----------Sensors----------------------
-    def send_is_seen_sensor(self, body_id):
+    def send_is_seen_sensor(self, body_id,
+                            record=True, record_every=1):
         """Attaches a sensor which detects when a body is being hit by a ray sensor
 
         Parameters
         ----------
         body_id : int
             The body id to connect the sensor to
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1051,18 +1372,36 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(1)
 
-        self._send('IsSeenSensor', sensor_id, body_id)
+        self._send('IsSeenSensor', sensor_id, body_id, record_mode)
 
         return sensor_id
 
-    def send_light_sensor(self, body_id):
+    def send_light_sensor(self, body_id,
+                          record=True, record_every=1, sum_sources=False):
         """Attaches a light sensor to a body in simulation
 
+        The sensor measures the light of the nearest light source, which
+        decays with the inverse of the square of its distance.
+
         Parameters
         ----------
         body_id : int, optional
                 The body id of the body to connect the sensor to
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
+        sum_sources : bool, optional
+                If True the sensor measures the light of all light
+                sources together instead of only the nearest
+                (default is False)
 
         Returns
         -------
@@ -1074,19 +1413,30 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(1)
 
         self._send('LightSensor',
-                   sensor_id, body_id)
+                   sensor_id, body_id, record_mode, int(sum_sources))
 
         return sensor_id
 
-    def send_position_sensor(self, body_id=0):
+    def send_position_sensor(self, body_id=0,
+                             record=True, record_every=1):
         """Attaches a position sensor to a body in simulation
 
         Parameters
         ----------
         body_id : int, optional
                 The body id of the body to connect the sensor to
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1098,13 +1448,17 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(3)
 
         self._send('PositionSensor',
-                   sensor_id, body_id)
+                   sensor_id, body_id, record_mode)
 
         return sensor_id
 
-    def send_proprioceptive_sensor(self, joint_id=0):
+    def send_proprioceptive_sensor(self, joint_id=0,
+                                   record=True, record_every=1):
         """Attaches a proprioceptive sensor to a joint in simulation
 
         Proprioceptive sensors returns the angle of the joint at 
@@ -1114,6 +1468,13 @@ class Simulator(object):
         ----------
         joint_id : int, optional
                 The joint id of the joint to connect the sensor to
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1125,16 +1486,20 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(1)
 
         self._send('ProprioceptiveSensor',
-                   sensor_id, joint_id)
+                   sensor_id, joint_id, record_mode)
 
         return sensor_id
 
     def send_ray_sensor(self, body_id=0,
                         x=0, y=0, z=0,
                         r1=0, r2=0, r3=1,
-                        max_distance=10):
+                        max_distance=10,
+                        record=True, record_every=1):
         """Sends a ray sensor to the simulator connected to a body
 
         Ray sensors return four values each time step, the distance and 
@@ -1163,6 +1528,13 @@ class Simulator(object):
         max_distance: float, optional
                 The maximum distance away the ray can sense in simulator
                 units. (default is 10.0)
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1175,22 +1547,33 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(4)
 
         self._send('RaySensor',
                    sensor_id, body_id,
                    x, y, z,
                    r1, r2, r3,
-                   max_distance)
+                   max_distance, record_mode)
 
         return sensor_id
 
-    def send_touch_sensor(self, body_id=0):
+    def send_touch_sensor(self, body_id=0,
+                          record=True, record_every=1):
         """Send touch sensor to a body in the simulator
 
         Parameters
         ----------
         body_id : int, optional
                 The body id of the associated body 
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1202,13 +1585,17 @@ class Simulator(object):
                                             )
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(1)
 
         self._send('TouchSensor',
-                   sensor_id, body_id)
+                   sensor_id, body_id, record_mode)
 
         return sensor_id
 
-    def send_vestibular_sensor(self, body_id=0):
+    def send_vestibular_sensor(self, body_id=0,
+                               record=True, record_every=1):
         """Connects a vestibular sensor to a body
 
         Vestibular sensors return a bodies orrientation in space
@@ -1217,6 +1604,13 @@ class Simulator(object):
         ----------
         body_id : int, optional
                 The body id of the associated body 
+        record   : bool or str, optional
+                If False the sensor values are not sent back. If 'last'
+                only the value at the final time step is sent back.
+                (default is True)
+        record_every : int, optional
+                Record the sensor values every record_every time steps
+                (default is 1)
 
         Returns
         -------
@@ -1229,9 +1623,12 @@ class Simulator(object):
 
         sensor_id = self._num_sensors
         self._num_sensors += 1
+        record_mode = self._recording_mode(record, record_every)
+        self._sensor_recording.append(record_mode)
+        self._sensor_values.append(1)
 
         self._send('VestibularSensor',
-                   sensor_id, body_id)
+                   sensor_id, body_id, record_mode)
 
         return sensor_id
 
@@ -1316,6 +1713,8 @@ class Simulator(object):
         start_time = int(start_time * (self.eval_time-1))
         end_time = int(end_time * (self.eval_time-1))
 
+        self._num_synapses += 1
+
         self._send('Synapse',
                    source_neuron_id, target_neuron_id,
                    start_weight, end_weight,
@@ -1323,12 +1722,66 @@ class Simulator(object):
 
         return True
 
+# ------StopConditions------------------------
+    def add_stop_condition(self, sensor_id, svi=0, below=None, above=None,
+                           start=0):
+        """Ends the simulation early once a sensor value crosses a threshold
+
+        The simulator tests the condition every time step and stops
+        after the first step it holds on. The sensor data then only
+        covers the steps that were run, see get_stop_step.
+
+        Parameters
+        ----------
+        sensor_id : int
+                The id of the sensor to watch
+        svi       : int, optional
+                The sensor value index to watch (the default is 0)
+        below     : float, optional
+                Stop once the value is below this
+        above     : float, optional
+                Stop once the value is above this, e.g. 0.5 to stop
+                when a touch sensor fires
+        start     : int, optional
+                The first time step the condition is tested on
+                (the default is 0)
+
+        Returns
+        -------
+        bool
+                True if successful
+
+        Examples
+        --------
+        >>> height = sim.send_position_sensor(body_id=torso)
+        >>> sim.add_stop_condition(height, svi=2, below=0.05)
+        """
+        assert sensor_id < self._num_sensors, 'Sensor with id ' + \
+            str(sensor_id)+' has not been sent'
+        num_values = self._sensor_values[sensor_id]
+        assert 0 <= svi < num_values, (
+            'SVI must be in [0,' + str(num_values - 1) + '] for sensor ' +
+            str(sensor_id))
+        assert below is not None or above is not None, (
+            'Stop condition needs a threshold below or above')
+        assert start >= 0, 'Start must be non-negative'
+
+        if below is not None:
+            self._send('StopCondition', sensor_id, svi, 0, below, start)
+        if above is not None:
+            self._send('StopCondition', sensor_id, svi, 1, above, start)
+
+        return True
+
 # -----I/OCommands----------------------------
     def make_movie(self,  movie_name=''):
         """Takes captured image files and converts them into a movie
 
         Uses ffmpeg to convert images. ffmpeg needs to be installed
-        for this command to work. Takes images from 'frame' directory
+        for this command to work. Takes images from 'frame' directory.
+        If the frames were piped into the movie while the simulation
+        ran, this waits for the encoder and moves the movie to
+        movie_name if one is given.
 
         Parameters
         ----------
@@ -1342,9 +1795,17 @@ class Simulator(object):
         bool
             True if successful, False otherwise
         """
-        assert self.capture == True, (
+        assert self.capture, (
             'No frames captured, set capture to true')
 
+        if self.movie is not None:
+            if self._encoder is not None and self._encoder.wait() != 0:
+                return False
+            if movie_name != '' and movie_name != self.movie:
+                shutil.move(self.movie, movie_name)
+                self.movie = movie_name
+            return True
+
         if movie_name == '':
             time_stamp = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
             movie_name = time_stamp + '_movie.mp4'
@@ -1353,8 +1814,7 @@ class Simulator(object):
                         ' libx264 -pix_fmt yuv420p ' + movie_name
 
         try:
-            os.chdir('frame')
-            subprocess.call(movie_command, shell=True)
+            subprocess.call(movie_command, shell=True, cwd='frame')
 
         except Exception:
             print('Command sent was: ' + movie_command)
@@ -1363,32 +1823,81 @@ class Simulator(object):
 
         return True
 
-    def start(self):
-        """Starts the simulation"""
+    def to_template(self):
+        """Returns the scene as a template for many simulators
+
+        The scene is packed once. Each simulator made by the template
+        only differs in the values of the Parameter arguments the scene
+        was built with, so populations that share a morphology skip
+        rebuilding it for every individual.
 
+        Returns
+        -------
+        SceneTemplate
+                The template of this scene
+        """
+        assert self.binary, 'Templates need the binary scene upload'
         assert self.evaluated == False, (
             'Simulation has already been evaluated')
 
         if (not self.collision_matrix_sent and self.get_num_groups() != 0):
             self._send_collision_matrix()
 
+        return SceneTemplate(self)
+
+    def start(self):
+        """Starts the simulation"""
+
+        assert self.evaluated == False, (
+            'Simulation has already been evaluated')
+
         # build initial commands
         commands = [self.pyrosim_path + '/simulator']
-        if (self.play_blind == True):
-            commands.append('-blind')
+        if (self.play_blind == True and self.capture):
+            # the frames of blind runs are drawn without a window
+            commands = [self.pyrosim_path + '/simulator-offscreen']
+            assert os.path.exists(commands[0]), (
+                'Capturing blind runs needs the offscreen simulator, run'
+                ' make offscreen in ' + self.pyrosim_path)
+            if self.use_textures == False:
+                commands.append('-notex')
+        elif (self.play_blind == True):
+            commands = [blind_simulator(self.pyrosim_path), '-blind']
         else:
             if self.use_textures == False:
                 commands.append('-notex')
 
+        if self.replay is not None:
+            assert self._num_bodies == 0, (
+                'A replay draws the bodies of its pose log')
+            commands[1:1] = ['-replay', os.path.abspath(self.replay)]
+
         if (self.play_paused == True):
             commands.append('-pause')
 
-        self.pipe = Popen(commands, bufsize=0,stdout=PIPE, stdin=PIPE, stderr=PIPE, universal_newlines=True)
+        if self._stream_chunk == 0:
+            stderr = PIPE
+        elif self.debug:
+            stderr = None
+        else:
+            # nobody reads stderr while streaming
+            stderr = DEVNULL
+
+        pass_fds = {}
+        if self._capturing_movie():
+            self._encoder = self._start_encoder()
+            # the simulator writes the frames straight into the encoder
+            if sys.version_info[0] >= 3:
+                pass_fds['pass_fds'] = (self._encoder.stdin.fileno(),)
+
+        self.pipe = Popen(commands, bufsize=0, stdout=PIPE, stdin=PIPE,
+                          stderr=stderr, **pass_fds)
 
-        for string_to_send in self.strings_to_send:
-            self.pipe.stdin.write(string_to_send)
+        self._write_scene(self.pipe.stdin)
 
-        self.pipe.stdin.write('Done\n')
+        if self._encoder is not None:
+            # only the simulator holds the pipe now, the movie ends with it
+            self._encoder.stdin.close()
         if self.debug:
             print ('Done \n')
             print ('Pipe open with commands: ', commands)
@@ -1397,6 +1906,51 @@ class Simulator(object):
 
         return True
 
+    def stream(self, chunk=100):
+        """Starts the simulation and yields sensor data while it runs
+
+        Instead of holding the data of the whole run, the simulator
+        writes it back every chunk time steps, so memory use stays
+        bounded whatever the eval_time. Closing the generator early
+        stops the simulation. The data is not kept afterwards, so
+        get_data and get_sensor_data are not available after streaming.
+
+        Parameters
+        ----------
+        chunk : int, optional
+            The number of time steps in each block of data
+            (default is 100)
+
+        Yields
+        ------
+        numpy matrix
+            A (num_sensors, 4, chunk) matrix of the sensor values for the
+            next chunk time steps. The last block is shorter if eval_time
+            is not a multiple of chunk. Sensors that do not record every
+            time step fill the start of their rows.
+        """
+        assert chunk > 0, 'Chunk must be positive'
+
+        self._stream_chunk = chunk
+        self.start()
+        self.pipe.stdin.close()
+
+        try:
+            while True:
+                block = np.zeros([self._num_sensors, 4, chunk], dtype='f')
+                num_steps = self._read_sensor_block(self.pipe.stdout, block)
+                if num_steps is None:
+                    break
+                yield block[:, :, :num_steps]
+        finally:
+            if self.pipe.poll() is None:
+                self.pipe.kill()
+            self.pipe.wait()
+            self.pipe.stdout.close()
+            # the blocks were handed out, none are kept
+            self.data = None
+            self.evaluated = True
+
     def wait_to_finish(self):
         """Waits to for the simulation to finish and collects data
 
@@ -1409,6 +1963,9 @@ class Simulator(object):
 
         data_from_simulator = self.pipe.communicate()
 
+        if self._encoder is not None:
+            self._encoder.wait()
+
         if self.eval_time >= 0:
             self._collect_sensor_data(data_from_simulator)
             self.evaluated = True
@@ -1428,6 +1985,19 @@ class Simulator(object):
 
         return index
 
+    def _add_body_bounds(self, x, y, z, size):
+        """Notes where a body starts and the size of its bounding sphere"""
+
+        self._body_bounds.append((x, y, z, size))
+
+    def _add_static_body(self, body_id, static):
+        """Remembers static bodies, returns the flag to send"""
+
+        if static:
+            self._static_bodies.add(body_id)
+            return 1
+        return 0
+
     def _assert_color(self, name, r, g, b):
         """Error checks so color params are between [0,1]"""
 
@@ -1436,6 +2006,14 @@ class Simulator(object):
             assert color >= 0 and color <= 1, 'Color parameter of ' + \
                 name + ' must be in [0,1]'
 
+    def _assert_not_static(self, name, *body_ids):
+        """Error checks bodies so they are not static"""
+
+        for body_id in body_ids:
+            assert body_id not in self._static_bodies, (
+                name + ' cannot act on static body ' + str(body_id) +
+                ', use Simulator.WORLD to attach to the environment')
+
     def _assert_non_zero(self, name, *args):
         """Error checks vectors so they are not equal to zero"""
 
@@ -1447,13 +2025,93 @@ class Simulator(object):
         assert flag == True, ('Vector parameters of ' + name +
                               ' cannot be all zeros')
 
+    def _allocate_sensor_data(self):
+        """Makes room in self.data for the sensor values of a run"""
+
+        self.data = np.zeros([self._num_sensors, 4,
+                              self._data_length(self.eval_time)], dtype='f')
+        self._recorded_steps = np.zeros(self._num_sensors, dtype=int)
+        self._stop_step = self.eval_time
+
+    def _collision_space_fields(self):
+        """Returns the fields of the CollisionSpace command
+
+        The hash space levels span the sizes of the bodies. The
+        quadtree covers twice the area the bodies start in, as they
+        move, and is deep enough for its smallest blocks to hold about
+        two bodies of the median size. Sweep and prune sorts along the
+        axis the bodies are spread out the most on first.
+        """
+        if self._body_bounds:
+            bounds = np.array(self._body_bounds, dtype='f8')
+        else:
+            bounds = np.array([[0, 0, 0, 1]], dtype='f8')
+        sizes = bounds[:, 3]
+
+        min_level = math.frexp(sizes.min())[1]
+        max_level = math.frexp(sizes.max())[1]
+
+        low = (bounds[:, :3] - sizes[:, np.newaxis] / 2).min(axis=0)
+        high = (bounds[:, :3] + sizes[:, np.newaxis] / 2).max(axis=0)
+        center = (low + high) / 2
+        extents = np.maximum(high - low, 1.0)
+
+        median_size = max(np.median(sizes), 1e-3)
+        depth = int(math.log(extents[:2].max() / (2 * median_size), 2))
+        depth = min(max(depth, 1), 6)
+
+        axes = np.argsort(-(high - low), kind='mergesort')
+        axis_order = int(axes[0] | axes[1] << 2 | axes[2] << 4)
+
+        return ([COLLISION_SPACES.index(self.collision_space),
+                 min_level, max_level, depth, axis_order] +
+                center.tolist() + extents.tolist())
+
+    def _data_length(self, num_steps):
+        """Returns the columns of self.data needed for num_steps steps"""
+
+        recorded_lengths = [self._recorded_length(mode, num_steps)
+                            for mode in self._sensor_recording]
+        if recorded_lengths:
+            return max(recorded_lengths)
+        else:
+            return num_steps
+
+    def _end_sensor_data(self, num_steps):
+        """Cuts self.data to the num_steps time steps that were run"""
+
+        self._stop_step = num_steps
+        if num_steps < self.eval_time:
+            self.data = self.data[:, :, :self._data_length(num_steps)]
+
+    def _capturing_movie(self):
+        """Whether the captured frames go into a movie encoder"""
+
+        return bool(self.capture) and self.movie is not None
+
+    def _start_encoder(self):
+        """Starts ffmpeg reading raw frames of the scaled window size"""
+
+        width = self.window_size[0] // self.capture_scale
+        height = self.window_size[1] // self.capture_scale
+
+        encode_command = ['ffmpeg', '-y', '-loglevel', 'error',
+                          '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                          '-s', '%dx%d' % (width, height),
+                          '-r', '30', '-i', '-',
+                          # yuv420p needs an even width and height
+                          '-vf', 'crop=trunc(iw/2)*2:trunc(ih/2)*2',
+                          '-vcodec', 'libx264', '-pix_fmt', 'yuv420p',
+                          self.movie]
+
+        return Popen(encode_command, stdin=PIPE, stdout=DEVNULL)
+
     def _collect_sensor_data(self, data_from_simulator):
         """Get sensor data back from ODE and store it in numpy array"""
 
-        self.data = np.zeros([self._num_sensors, 4,
-                              self.eval_time], dtype='f')
+        self._allocate_sensor_data()
 
-        debug_output = data_from_simulator[1]
+        debug_output = data_from_simulator[1].decode('utf-8', 'replace')
 
         if self.debug:
             chop_start = debug_output.find('Simulation test environment')
@@ -1464,31 +2122,192 @@ class Simulator(object):
                 print (debug_output)
 
         data_from_simulator = data_from_simulator[0]
-        data_from_simulator = data_from_simulator.split()
 
-        if (data_from_simulator == []):
+        if (len(data_from_simulator) == 0):
             return
 
-        index = 0
-        while (data_from_simulator[index] != 'Done'):
-            sensor_id = int(data_from_simulator[index])
-            index = index + 1
+        try:
+            num_steps = self._read_sensor_block(
+                io.BytesIO(data_from_simulator), self.data,
+                self._recorded_steps)
+            self._end_sensor_data(num_steps)
+        except IOError:
+            print (debug_output)
+            raise
+
+    def _encode(self, command_string, *args):
+        """Returns a command as the simulator reads it"""
+
+        if self.binary:
+            return self._pack(command_string, *args)
+
+        return self._format(command_string, *args).encode()
 
-            num_sensor_vals = int(data_from_simulator[index])
-            index = index + 1
+    def _format(self, command_string, *args):
+        """Formats a command for the text scene upload"""
+
+        string_to_send = command_string
+        for arg in args:
+            if isinstance(arg, np.ndarray):
+                string_to_send += ' ' + ' '.join(map(str, arg.ravel().tolist()))
+            else:
+                string_to_send += ' ' + str(arg)
+        string_to_send += '\n'
 
-            for t in range(0, self.eval_time):  # time step
-                for s in range(0, num_sensor_vals):  # svi
-                    try:
-                        sensor_value = float(data_from_simulator[index])
-                    except IndexError:
-                        print (index, data_from_simulator)
-                        print (debug_output)
-                        raise IndexError
+        return string_to_send
 
+    def _pack(self, command_string, *args):
+        """Packs a command for the binary scene upload
 
-                    self.data[sensor_id, s, t] = sensor_value
-                    index = index + 1
+        The repeated fields of a command can be given as one numpy array
+        as its last argument, which is copied as a single block.
+        """
+
+        opcode, fields = COMMAND_OPCODES[command_string]
+
+        if fields.endswith('*') and isinstance(args[-1], np.ndarray):
+            head = self._pack(command_string, *args[:-1])
+            dtype = {'i': '<i4', 'd': '<f8'}[fields[-2]]
+            block = np.ascontiguousarray(args[-1], dtype=dtype).tobytes()
+            opcode, size = struct.unpack('<ii', head[:8])
+            return (struct.pack('<ii', opcode, size + len(block)) +
+                    head[8:] + block)
+
+        if command_string in COMMAND_STRUCTS:
+            packer = COMMAND_STRUCTS[command_string]
+            try:
+                return packer.pack(opcode, packer.size - 8, *args)
+            except struct.error:
+                # e.g. a float given for an integer field, convert below
+                pass
+
+        if fields.endswith('*'):
+            repeated = len(args) - len(fields) + 2
+            fields = fields[:-2] + fields[-2] * repeated
+        assert len(fields) == len(args), ('Wrong number of fields for ' +
+                                          command_string)
+
+        payload_format = '<'
+        values = []
+        for field, arg in zip(fields, args):
+            if field == 's':
+                arg = arg.encode()
+                payload_format += 'i' + str(len(arg)) + 's'
+                values += [len(arg), arg]
+            elif field == 'i':
+                payload_format += 'i'
+                values.append(int(arg))
+            else:
+                payload_format += 'd'
+                values.append(float(arg))
+
+        payload = struct.pack(payload_format, *values)
+
+        return struct.pack('<ii', opcode, len(payload)) + payload
+
+    def _read_exactly(self, stream, num_bytes):
+        """Reads num_bytes from stream, raising IOError if it runs dry"""
+
+        chunks = []
+        remaining = num_bytes
+        while remaining > 0:
+            chunk = stream.read(remaining)
+            if not chunk:
+                raise IOError('Simulator output ended after ' +
+                              str(num_bytes - remaining) + ' of ' +
+                              str(num_bytes) + ' expected bytes')
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        return b''.join(chunks)
+
+    def _read_sensor_block(self, stream, out, recorded_steps=None):
+        """Decodes one block of binary sensor records into out
+
+        Each record is a header of four int32 values (sensor id, number
+        of sensor values, number of time steps, data type) followed by
+        the raw values laid out as [sensor value][time step]. The block
+        ends with a record whose sensor id is END_OF_BLOCK. The number of
+        time steps of each sensor is stored in recorded_steps if given.
+
+        Returns
+        -------
+        int or None
+            The number of time steps the block covers, None if the stream
+            ended before the block started
+        """
+        header = stream.read(SENSOR_HEADER_SIZE)
+        if not header:
+            return None
+        header += self._read_exactly(stream, SENSOR_HEADER_SIZE - len(header))
+
+        while True:
+            sensor_id, num_values, num_steps, data_type = np.frombuffer(
+                header, dtype='<i4')
+
+            if sensor_id == END_OF_BLOCK:
+                return int(num_steps)
+
+            dtype = SENSOR_DATA_TYPES[int(data_type)]
+            count = int(num_values * num_steps)
+            values = np.frombuffer(
+                self._read_exactly(stream, count * dtype.itemsize),
+                dtype=dtype)
+
+            out[sensor_id, :num_values, :num_steps] = values.reshape(
+                num_values, num_steps)
+            if recorded_steps is not None:
+                recorded_steps[sensor_id] = num_steps
+
+            header = self._read_exactly(stream, SENSOR_HEADER_SIZE)
+
+    def _recorded_length(self, mode, num_steps):
+        """Returns how many of num_steps time steps a sensor records"""
+
+        if mode == RECORD_NOTHING:
+            return 0
+        elif mode == RECORD_LAST:
+            return 1
+        else:
+            return (num_steps + mode - 1) // mode
+
+    def _recording_mode(self, record, record_every):
+        """Returns the recording mode sent along with a sensor"""
+
+        assert record in (True, False, 'last'), ("record must be True, "
+                                                 "False or 'last'")
+        assert record_every >= 1, 'record_every must be at least 1'
+
+        if record == 'last':
+            return RECORD_LAST
+        elif record:
+            return int(record_every)
+        else:
+            return RECORD_NOTHING
+
+    def _record_parameters(self, command_string, *args):
+        """Notes where the parameters of a command land in the upload"""
+
+        fields = COMMAND_OPCODES[command_string][1]
+        if fields.endswith('*'):
+            repeated = len(args) - len(fields) + 2
+            fields = fields[:-2] + fields[-2] * repeated
+
+        # skip the opcode and payload size
+        offset = len(self._binary_commands) + 8
+        for field, arg in zip(fields, args):
+            if isinstance(arg, Parameter):
+                assert field == 'd', ('Parameter ' + arg.name + ' given for'
+                                      ' a field of ' + command_string +
+                                      ' that is not real valued')
+                self._parameter_offsets.append((offset, arg.name, arg.index))
+
+            if field == 's':
+                offset += 4 + len(arg.encode())
+            elif field == 'i':
+                offset += 4
+            else:
+                offset += 8
 
     def _send_collision_matrix(self):
         """sends the collision matrix"""
@@ -1499,26 +2318,61 @@ class Simulator(object):
             self.create_collision_matrix()
             self._matrix_created = True
 
-        send_string = []
-
         upper_tri = np.triu_indices(self.get_num_groups())
-        iterator = np.nditer(self._collision_matrix[upper_tri])
-
-        for element in iterator:
-            send_string.append(element)
 
-        self._send('CollisionMatrix', self.get_num_groups(), *send_string)
+        self._send('CollisionMatrix', self.get_num_groups(),
+                   self._collision_matrix[upper_tri])
         return True
 
+    def _write_scene(self, stream, batch_size=1):
+        """Writes every command of the scene to the simulator
+
+        A simulator server reads batch_size scenes, this one first, before
+        it runs them.
+        """
+
+        if (not self.collision_matrix_sent and self.get_num_groups() != 0):
+            self._send_collision_matrix()
+
+        if self.binary:
+            stream.write(b'Binary\n')
+
+        if self._encoder is not None:
+            stream.write(self._encode('CaptureStream',
+                                      self._encoder.stdin.fileno()))
+
+        if self._stream_chunk > 0:
+            # sensors size their storage on creation so this has to
+            # reach the simulator before any of them
+            stream.write(self._encode('StreamChunk', self._stream_chunk))
+
+        if batch_size > 1:
+            stream.write(self._encode('BatchSize', batch_size))
+
+        stream.write(self._encode('CollisionSpace',
+                                  *self._collision_space_fields()))
+
+        if self.binary:
+            stream.write(self._binary_commands)
+        else:
+            for string_to_send in self.strings_to_send:
+                stream.write(string_to_send.encode())
+
+        stream.write(self._encode('Done'))
+
     def _send(self, command_string, *args):
         """Send a command to the simulator"""
 
         # first argument should be a string
         assert isinstance(command_string, str), ('Command must be string')
-        string_to_send = command_string
-        for arg in args:
-            string_to_send += ' ' + str(arg)
-        string_to_send += '\n'
+
+        if self.binary:
+            if any(isinstance(arg, Parameter) for arg in args):
+                self._record_parameters(command_string, *args)
+            self._binary_commands += self._pack(command_string, *args)
+            return
+
+        string_to_send = self._format(command_string, *args)
 
         if self.debug:
             print (string_to_send,)
@@ -0,0 +1,153 @@
+from __future__ import division, print_function
+import os
+
+from subprocess import Popen, PIPE
+try:
+    from subprocess import DEVNULL
+except ImportError:
+    DEVNULL = open(os.devnull, 'wb')
+
+from .pyrosim import blind_simulator
+
+
+class SimulatorServer(object):
+    """Evaluates many scenes in one simulator process
+
+    Starting a simulator for every evaluation costs about as much as
+    simulating a few hundred time steps. The server starts the simulator
+    once and sends it one scene after the other, which it runs blind.
+
+    Attributes
+    ----------
+    pyrosim_path : str, optional
+            The directory of the simulator binary (the default is the
+            simulator directory of this package)
+    debug        : bool, optional
+            If True the simulator output on stderr is shown
+            (the default is False)
+
+    Examples
+    --------
+    >>> with SimulatorServer() as server:
+    ...     for sim in sims:
+    ...         data = server.evaluate(sim)
+    """
+
+    def __init__(self, pyrosim_path=None, debug=False):
+        if pyrosim_path is None:
+            pyrosim_path = os.path.dirname(
+                os.path.abspath(__file__))+'/simulator'
+
+        self.pyrosim_path = pyrosim_path
+        self.debug = debug
+        self.pipe = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stops the simulator process"""
+
+        if self.pipe is None:
+            return
+
+        self.pipe.stdin.close()
+        self.pipe.wait()
+        self.pipe.stdout.close()
+        self.pipe = None
+
+    def evaluate(self, sim):
+        """Runs the scene of a simulator and collects its sensor data
+
+        Parameters
+        ----------
+        sim : Simulator
+                A simulator that has not been started yet. It is not
+                started itself: afterwards its data is available through
+                get_data and get_sensor_data as if it had been.
+
+        Returns
+        -------
+        numpy matrix
+                A matrix of the sensor values for each time step of
+                the simulation
+        """
+        return self.evaluate_batch([sim])[0]
+
+    def evaluate_batch(self, sims):
+        """Runs the scenes of several simulators side by side
+
+        The simulator loads every scene into its own world and steps
+        them in turn, which saves the per scene overhead for populations
+        of small robots.
+
+        Parameters
+        ----------
+        sims : list of Simulator
+                Simulators that have not been started yet
+
+        Returns
+        -------
+        list of numpy matrix
+                The sensor data of each simulator, in the order of sims
+        """
+        for sim in sims:
+            assert sim.evaluated == False, (
+                'Simulation has already been evaluated')
+            assert sim._stream_chunk == 0, 'Cannot stream from a server'
+
+        if not sims:
+            return []
+
+        if self.pipe is None or self.pipe.poll() is not None:
+            self._start()
+
+        try:
+            sims[0]._write_scene(self.pipe.stdin, batch_size=len(sims))
+            for sim in sims[1:]:
+                sim._write_scene(self.pipe.stdin)
+            self.pipe.stdin.flush()
+
+            for sim in sims:
+                sim._allocate_sensor_data()
+                num_steps = sim._read_sensor_block(self.pipe.stdout,
+                                                   sim.data,
+                                                   sim._recorded_steps)
+                if num_steps is None:
+                    raise IOError('Simulator stopped before sending results')
+                sim._end_sensor_data(num_steps)
+        except (IOError, OSError):
+            # the simulator crashed on one of the scenes, start a fresh
+            # one for the next
+            self._kill()
+            raise
+
+        for sim in sims:
+            sim.evaluated = True
+
+        return [sim.data for sim in sims]
+
+    def _kill(self):
+        """Kills the simulator process"""
+
+        if self.pipe.poll() is None:
+            self.pipe.kill()
+        self.pipe.wait()
+        self.pipe.stdin.close()
+        self.pipe.stdout.close()
+        self.pipe = None
+
+    def _start(self):
+        """Starts the simulator process"""
+
+        if self.debug:
+            stderr = None
+        else:
+            # the simulator is quiet unless a scene is sent in debug mode
+            stderr = DEVNULL
+
+        self.pipe = Popen([blind_simulator(self.pyrosim_path), '-server'],
+                          bufsize=0, stdin=PIPE, stdout=PIPE, stderr=stderr)
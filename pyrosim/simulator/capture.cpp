@@ -0,0 +1,154 @@
+#ifndef _CAPTURE_CPP
+#define _CAPTURE_CPP
+
+#include "capture.h"
+
+#include <cstring>
+#include <csignal>
+#include <iostream>
+
+#ifdef __APPLE__
+#include <OpenGL/gl.h>
+#else
+#include <GL/gl.h>
+#endif
+
+FRAME_CAPTURE::FRAME_CAPTURE(int windowWidth, int windowHeight, int frameScale, int streamFD) {
+
+	width = windowWidth;
+
+	height = windowHeight;
+
+	scale = frameScale;
+
+	frameWidth = width / scale;
+
+	frameHeight = height / scale;
+
+	pixels.resize(width * height * 3);
+
+	frame.resize(frameWidth * frameHeight * 3);
+
+	sums.resize(frameWidth * 3);
+
+	stream = NULL;
+
+	stopped = false;
+
+	if ( streamFD >= 0 ) {
+
+		stream = fdopen(streamFD,"wb");
+
+		// A failed encoder should not take the sensor data down with it.
+
+		signal(SIGPIPE,SIG_IGN);
+	}
+}
+
+FRAME_CAPTURE::~FRAME_CAPTURE(void) {
+
+	// Closing the pipe ends the movie.
+
+	if ( stream )
+
+		fclose(stream);
+}
+
+void FRAME_CAPTURE::Capture(int num) {
+
+	if ( stopped )
+
+		return;
+
+	glPixelStorei(GL_PACK_ALIGNMENT,1);
+
+	glReadPixels(0,0,width,height,GL_RGB,GL_UNSIGNED_BYTE,&pixels[0]);
+
+	Scale_Pixels();
+
+	if ( stream == NULL ) {
+
+		Write_PPM(num);
+
+		return;
+	}
+
+	if ( fwrite(&frame[0],1,frame.size(),stream) != frame.size() ) {
+
+		std::cerr << "Frame capture: the encoder stopped taking frames" << std::endl;
+
+		stopped = true;
+	}
+}
+
+// ----------------------- Private methods ---------------------------
+
+void FRAME_CAPTURE::Scale_Pixels(void) {
+
+	int rowSize = width * 3;
+
+	int frameRowSize = frameWidth * 3;
+
+	for (int y = 0 ; y < frameHeight ; y++ ) {
+
+		unsigned char *frameRow = &frame[y * frameRowSize];
+
+		// GL rows start at the bottom
+
+		int firstRow = height - 1 - y * scale;
+
+		if ( scale == 1 ) {
+
+			memcpy(frameRow,&pixels[firstRow * rowSize],frameRowSize);
+
+			continue;
+		}
+
+		memset(&sums[0],0,frameRowSize * sizeof(int));
+
+		for (int r = 0 ; r < scale ; r++ ) {
+
+			unsigned char *row = &pixels[(firstRow - r) * rowSize];
+
+			for (int x = 0 ; x < frameWidth ; x++ )
+
+				for (int c = 0 ; c < scale ; c++ ) {
+
+					unsigned char *pixel = row + (x * scale + c) * 3;
+
+					sums[3*x]   += pixel[0];
+
+					sums[3*x+1] += pixel[1];
+
+					sums[3*x+2] += pixel[2];
+				}
+		}
+
+		int blockSize = scale * scale;
+
+		for (int i = 0 ; i < frameRowSize ; i++ )
+
+			frameRow[i] = sums[i] / blockSize;
+	}
+}
+
+void FRAME_CAPTURE::Write_PPM(int num) {
+
+	char fileName[200];
+
+	sprintf(fileName,"frame/%04d.ppm",num);
+
+	FILE *f = fopen(fileName,"wb");
+
+	if ( f == NULL )
+
+		return;
+
+	fprintf(f,"P6\n%d %d\n255\n",frameWidth,frameHeight);
+
+	fwrite(&frame[0],1,frame.size(),f);
+
+	fclose(f);
+}
+
+#endif
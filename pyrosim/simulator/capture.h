@@ -0,0 +1,49 @@
+#ifndef _CAPTURE_H
+#define _CAPTURE_H
+
+#include <cstdio>
+#include <vector>
+
+// Captures the frames drawn into the window. Each frame is read from GL
+// into one buffer that is kept for the whole run, shrunk by scale in each
+// direction by averaging blocks of pixels and flipped so the top row comes
+// first. The frame is then written whole, either as frame/NNNN.ppm or as
+// raw RGB24 to a stream, the pipe into the encoder python started.
+
+class FRAME_CAPTURE {
+
+private:
+	int width, height;
+
+	int scale;
+
+	int frameWidth, frameHeight;
+
+	// raw frames are written here; NULL writes ppm files
+	FILE *stream;
+
+	// set once the encoder stops taking frames
+	int stopped;
+
+	// as read from GL, bottom row first
+	std::vector<unsigned char> pixels;
+
+	// the scaled frame, top row first
+	std::vector<unsigned char> frame;
+
+	// the sums of the blocks of one row of the frame
+	std::vector<int> sums;
+
+	void Scale_Pixels(void);
+
+	void Write_PPM(int num);
+
+public:
+	FRAME_CAPTURE(int windowWidth, int windowHeight, int scale, int streamFD);
+
+	~FRAME_CAPTURE(void);
+
+	void Capture(int num);
+};
+
+#endif
@@ -1,10 +1,6 @@
 #ifndef _CONSTANTS_H
 #define _CONSTANTS_H
 
- int	MAX_OBJECTS	= 1000;
- int	MAX_JOINTS	= 1000;
- int	MAX_NEURONS	= 1000;
- int	MAX_SYNAPSES	= 1000000;
 
  int	SENSOR_NEURON	= 0;
  int	BIAS_NEURON	= 1;
@@ -18,6 +14,10 @@
  int SPHERE = 2;
  int CAPSULE = 3;
 
+ int HASH_SPACE = 0;
+ int QUADTREE_SPACE = 1;
+ int SAP_SPACE = 2;
+
  int HINGE = 0;
  int SLIDER = 1;
  int THRUSTER = 2;
@@ -0,0 +1,26 @@
+#ifndef _DATA_WRITER_CPP
+#define _DATA_WRITER_CPP
+
+#include "iostream"
+#include "dataWriter.h"
+
+void Write_End_Of_Block(int numSteps) {
+
+        Write_Sensor_Header(END_OF_BLOCK,0,numSteps,DATA_TYPE_DOUBLE);
+
+        std::cout.flush();
+}
+
+void Write_Sensor_Header(int ID, int numValues, int numSteps, int dataType) {
+
+        int header[4] = {ID, numValues, numSteps, dataType};
+
+        std::cout.write( (char *)header, sizeof(header) );
+}
+
+void Write_Sensor_Values(double *values, int numSteps) {
+
+        std::cout.write( (char *)values, sizeof(double) * numSteps );
+}
+
+#endif
@@ -0,0 +1,25 @@
+#ifndef _DATA_WRITER_H
+#define _DATA_WRITER_H
+
+// Sensor data is sent back to python as binary records on stdout.
+// Each record starts with a header of four int32 values
+//
+//      sensor ID, number of sensor values, number of time steps, data type
+//
+// followed by the raw little-endian values laid out as
+// [sensor value][time step]. A record whose sensor ID is END_OF_BLOCK
+// closes the block; its time step field holds the number of time steps
+// that were simulated.
+
+const int DATA_TYPE_DOUBLE = 0;
+const int DATA_TYPE_INT    = 1;
+
+const int END_OF_BLOCK = -1;
+
+void Write_End_Of_Block(int numSteps);
+
+void Write_Sensor_Header(int ID, int numValues, int numSteps, int dataType);
+
+void Write_Sensor_Values(double *values, int numSteps);
+
+#endif
@@ -1,28 +1,72 @@
 #ifndef DATASTRUCT_H
 #define DATASTRUCT_H
 
-const int MAX_GROUPS = 1000;
+#include <string>
+#include <vector>
+
+// solvers that step the world, see Simulate_For_One_Time_Step
+const int WORLD_SOLVER = 0;
+const int QUICKSTEP_SOLVER = 1;
+
 struct Data
 {
-  char texturePathStr[1000];
+  std::string texturePathStr;
   //simulator parameters
   int runBlind;
   float gravity;
   float dt;
+  //physics steps per time step of dt
+  int substeps = 1;
+  int solver = WORLD_SOLVER;
+  int solverIterations = 20;
+  double sor = 1.3;
+  //negative keeps the default of ODE
+  double erp = -1.0;
+  double cfm = -1.0;
   int evaluationTime;
   //user option
-  int debug;
+  int debug = 0;
   //camera parameters
   float xyz[3];
   float hpr[3];
   int trackBody;
   int followBody;
-  int collisionMatrix[MAX_GROUPS][MAX_GROUPS];
-  int numCollisionGroups;
+  //whether the bodies of two collision groups collide, one bit for each
+  //pair of the numCollisionGroups groups
+  std::vector<bool> collisionMatrix;
+  int numCollisionGroups = 0;
+  //broadphase of the collision groups, see Create_Collision_Space
+  int spaceType = 0;
+  int spaceMinLevel = -3;
+  int spaceMaxLevel = 10;
+  int spaceDepth = 4;
+  int spaceAxisOrder = 36; // dSAP_AXES_XYZ
+  double spaceCenter[3] = {0.0, 0.0, 0.0};
+  double spaceExtents[3] = {10.0, 10.0, 10.0};
+  //time steps taken per frame drawn, unless realTime paces them to the
+  //wall clock: realTime seconds simulated per second
+  int renderEvery = 1;
+  double realTime = 0.0;
   int capture;
+  //frames are shrunk by captureScale in each direction and piped into
+  //the file descriptor captureStream if python opened one
+  int captureScale = 1;
+  int captureStream = -1;
+  //the poses of the bodies are logged to poseLogFile every poseLogEvery
+  //time steps, or not at all for 0 (see poseLog.h)
+  int poseLogEvery = 0;
+  std::string poseLogFile;
+  int streamChunk = 0;
+  int batchSize = 1;
 
   int windowWidth = 750;
   int windowHeight = 450;
+
+  bool Groups_Collide(int i, int j) const {
+    if ( i >= numCollisionGroups || j >= numCollisionGroups )
+      return false;
+    return collisionMatrix[i * numCollisionGroups + j];
+  }
 };
 
 #endif
\ No newline at end of file
@@ -2,6 +2,8 @@
 #define _ENVIRONMENT_CPP
 
 #include "environment.h"
+#include "dataWriter.h"
+#include "pythonInput.h"
 #include "iostream"
 
 
@@ -14,23 +16,52 @@ extern int CYLINDER;
 extern int SPHERE;
 extern int CAPSULE;
 
-extern int MAX_OBJECTS;
-extern int MAX_JOINTS;
+extern int HASH_SPACE;
+extern int QUADTREE_SPACE;
+extern int SAP_SPACE;
 
 ENVIRONMENT::ENVIRONMENT(void) {
 
-	objects = new OBJECT * [MAX_OBJECTS];
-	joints  = new JOINT * [MAX_JOINTS];
-
 	numberOfBodies = 0;
 
 	numberOfJoints = 0;
 
 	neuralNetwork = NULL;
+
+	lightSources = NULL;
+
+	sensors = new SENSORS();
+
+	numberOfStopConditions = 0;
+
+	numberOfCollisionSpaces = 0;
+
+	sharedCollisionSpace = NULL;
 }
 
 ENVIRONMENT::~ENVIRONMENT(void) {
 
+	// The bodies, geoms and joints in ODE go with the world and space.
+
+	for (int i=0;i<numberOfBodies;i++)
+
+		delete objects[i];
+
+	for (int j=0;j<numberOfJoints;j++)
+
+		delete joints[j];
+
+	delete neuralNetwork;
+
+	delete lightSources;
+
+	delete sensors;
+
+	for (int s=0;s<numberOfStopConditions;s++)
+
+		delete stopConditions[s];
+
+	// The collision spaces go with the space they are nested in.
 }
 
 void ENVIRONMENT::Actuate_Joints(void) {
@@ -40,6 +71,27 @@ void ENVIRONMENT::Actuate_Joints(void) {
                 joints[j]->Actuate();
 }
 
+void ENVIRONMENT::Collide_Within_Groups(Data *data, void *callbackData, dNearCallback *callback) {
+
+        // Pairs from different groups are found by colliding the space
+        // the groups are nested in; here only the groups whose bodies
+        // collide with each other are searched for pairs of their own.
+
+        if ( sharedCollisionSpace ) {
+
+                dSpaceCollide(sharedCollisionSpace,callbackData,callback);
+
+                return;
+        }
+
+        for (int g=0;g<numberOfCollisionSpaces;g++)
+
+                if ( collisionSpaces[g] && data->Groups_Collide(g,g) )
+
+                        dSpaceCollide(collisionSpaces[g],callbackData,callback);
+}
+
+#ifndef HEADLESS
 void ENVIRONMENT::Draw(int debug) {
 
         for (int i=0;i<numberOfBodies;i++)
@@ -53,174 +105,299 @@ void ENVIRONMENT::Draw(int debug) {
         }
 
 }
+#endif
+
+int ENVIRONMENT::Get_Number_Of_Bodies(void) {
+
+        return numberOfBodies;
+}
 
 void ENVIRONMENT::Get_Object_Position(float *xyz, int bodyID){
-        const dReal *pos = dBodyGetPosition(objects[bodyID]->Get_Body());
+        const dReal *pos = dGeomGetPosition(objects[bodyID]->Get_Geom());
         xyz[0] = pos[0];
         xyz[1] = pos[1];
         xyz[2] = pos[2];
 }
 
-void ENVIRONMENT::Read_From_Python(dWorldID world, dSpaceID space, Data *data)
+void ENVIRONMENT::Get_Pose_Log_Bodies(POSE_LOG_BODY *logBodies) {
+
+        for (int i=0;i<numberOfBodies;i++)
+
+                objects[i]->Get_Pose_Log_Body(logBodies + i);
+}
+
+void ENVIRONMENT::Get_Poses(float *poses) {
+
+        for (int i=0;i<numberOfBodies;i++)
+
+                objects[i]->Get_Pose(poses + i * POSE_SIZE);
+}
+
+void ENVIRONMENT::Read_From_Pose_Log(dSpaceID space, POSE_LOG_READER *poseLog) {
+
+        // The bodies are drawn where the log puts them, nothing moves them.
+
+        for (int i=0;i<poseLog->Get_Number_Of_Bodies();i++) {
+
+                OBJECT *object = new OBJECT();
+
+                object->Read_From_Pose_Log(space,i,poseLog->Get_Body(i));
+
+                objects.push_back(object);
+
+                numberOfBodies++;
+        }
+}
+
+void ENVIRONMENT::Read_From_Python(dWorldID world, dSpaceID space, dSpaceID raySpace, Data *data)
 {
-       char incomingString[10000];
+        int command = pythonInput.Read_Command();
+
+        while ( command != DONE_COMMAND ) {
 
-        std::cin >> incomingString;
+                if ( data->debug )
+                        std::cerr << Command_Name(command) << "\n";
+
+                switch ( command ) {
 
-        while ( strcmp(incomingString,"Done") != 0 ) {
-                std::cerr << incomingString << "\n";
                 //Simulator options
-                if ( strcmp(incomingString,"EvaluationTime") == 0 )
-                        std::cin >> data->evaluationTime;
-
-                else if ( strcmp(incomingString,"TimeInterval") == 0)
-                        std::cin >> data->dt;
-                else if ( strcmp(incomingString,"Gravity") == 0)
-                        std::cin >> data->gravity;
-                else if ( strcmp(incomingString,"TexturePath") == 0)
-                        std::cin >> data->texturePathStr;
-                else if ( strcmp(incomingString,"Debug") == 0)
-                        std::cin >> data->debug;
-                else if ( strcmp(incomingString,"ExternalForce") == 0){
+                case EVALUATION_TIME_COMMAND:
+                        pythonInput >> data->evaluationTime;
+                        break;
+                case TIME_INTERVAL_COMMAND:
+                        pythonInput >> data->dt;
+                        break;
+                case SUBSTEPS_COMMAND:
+                        pythonInput >> data->substeps;
+                        break;
+                case GRAVITY_COMMAND:
+                        pythonInput >> data->gravity;
+                        break;
+                case SOLVER_COMMAND:
+                        pythonInput >> data->solver;
+                        pythonInput >> data->solverIterations;
+                        pythonInput >> data->sor;
+                        pythonInput >> data->erp;
+                        pythonInput >> data->cfm;
+                        break;
+                case TEXTURE_PATH_COMMAND:
+                        pythonInput >> data->texturePathStr;
+                        break;
+                case DEBUG_COMMAND:
+                        pythonInput >> data->debug;
+                        break;
+                case EXTERNAL_FORCE_COMMAND:
+                {
                         int bodyID;
-                        float x,y,z;
-                        int time;
-                        std::cin >> bodyID;
+                        pythonInput >> bodyID;
                         objects[bodyID]->Read_In_External_Force();
+                        break;
                 }
-                else if ( strcmp(incomingString,"WindowSize") == 0)
-                {
-                    std::cin >> data->windowWidth;
-                    std::cin >> data->windowHeight;
-                }
+                case WINDOW_SIZE_COMMAND:
+                        pythonInput >> data->windowWidth;
+                        pythonInput >> data->windowHeight;
+                        break;
 
                 //Camera
-                else if ( strcmp(incomingString,"Camera") == 0)
-                {
-                        std::cin >> data->xyz[0];
-                        std::cin >> data->xyz[1];
-                        std::cin >> data->xyz[2];
-
-                        std::cin >> data->hpr[0];
-                        std::cin >> data->hpr[1];
-                        std::cin >> data->hpr[2];
-                }
-
-                else if ( strcmp(incomingString,"FollowBody")==0)
-                        std::cin >> data->followBody;
-                else if ( strcmp(incomingString,"TrackBody")==0)
-                        std::cin >> data->trackBody;
-
-                else if ( strcmp(incomingString,"Capture")==0)
-                {
-                		std::cin >> data->capture;
-                }
+                case CAMERA_COMMAND:
+                        pythonInput >> data->xyz[0];
+                        pythonInput >> data->xyz[1];
+                        pythonInput >> data->xyz[2];
+
+                        pythonInput >> data->hpr[0];
+                        pythonInput >> data->hpr[1];
+                        pythonInput >> data->hpr[2];
+                        break;
+
+                case FOLLOW_BODY_COMMAND:
+                        pythonInput >> data->followBody;
+                        break;
+                case TRACK_BODY_COMMAND:
+                        pythonInput >> data->trackBody;
+                        break;
+
+                case RENDER_COMMAND:
+                        pythonInput >> data->renderEvery;
+                        pythonInput >> data->realTime;
+                        break;
+
+                case CAPTURE_COMMAND:
+                        pythonInput >> data->capture;
+                        pythonInput >> data->captureScale;
+                        break;
+
+                case CAPTURE_STREAM_COMMAND:
+                        pythonInput >> data->captureStream;
+                        break;
+
+                case POSE_LOG_COMMAND:
+                        pythonInput >> data->poseLogEvery;
+                        pythonInput >> data->poseLogFile;
+                        break;
+
+                case STREAM_CHUNK_COMMAND:
+                        pythonInput >> data->streamChunk;
+                        break;
+                case BATCH_SIZE_COMMAND:
+                        pythonInput >> data->batchSize;
+                        break;
 
                 //Collision data
-                else if ( strcmp(incomingString,"CollisionMatrix")==0){
-                        std::cin >> data->numCollisionGroups;
+                case COLLISION_SPACE_COMMAND:
+                        pythonInput >> data->spaceType;
+                        pythonInput >> data->spaceMinLevel;
+                        pythonInput >> data->spaceMaxLevel;
+                        pythonInput >> data->spaceDepth;
+                        pythonInput >> data->spaceAxisOrder;
+                        for (int i=0;i<3;i++)
+                                pythonInput >> data->spaceCenter[i];
+                        for (int i=0;i<3;i++)
+                                pythonInput >> data->spaceExtents[i];
+                        break;
+                case COLLISION_MATRIX_COMMAND:
+                        pythonInput >> data->numCollisionGroups;
+                        data->collisionMatrix.assign(data->numCollisionGroups * data->numCollisionGroups, false);
                         for(int i=0;i<data->numCollisionGroups;i++){
                           for(int j=i;j<data->numCollisionGroups;j++){
-                                data->collisionMatrix[i][j]=0;
-                                data->collisionMatrix[j][i]=0;
-                                std::cin >> data->collisionMatrix[i][j];
-                                data->collisionMatrix[j][i] = data->collisionMatrix[i][j];
+                                int collide;
+                                pythonInput >> collide;
+                                data->collisionMatrix[i * data->numCollisionGroups + j] = collide;
+                                data->collisionMatrix[j * data->numCollisionGroups + i] = collide;
                          }
                         }
-                }
-                //Bodies
-                else if ( strcmp(incomingString,"Box") == 0 )
+                        break;
 
+                //Bodies
+                case BOX_COMMAND:
                         Create_Object(world,space,numberOfBodies,BOX);
-
-                else if ( strcmp(incomingString,"Cylinder") == 0 )
-
+                        break;
+                case CYLINDER_COMMAND:
                         Create_Object(world,space,numberOfBodies,CYLINDER);
-                else if ( strcmp(incomingString,"Capsule") == 0)
+                        break;
+                case CAPSULE_COMMAND:
                         Create_Object(world,space,numberOfBodies,CAPSULE);
-                else if ( strcmp(incomingString,"Sphere") == 0)
+                        break;
+                case SPHERE_COMMAND:
                         Create_Object(world,space,numberOfBodies, SPHERE);
+                        break;
 
                 //Joints
-                else if ( strcmp(incomingString,"HingeJoint") == 0 )
+                case HINGE_JOINT_COMMAND:
                         Create_Joint(world,space,numberOfJoints,HINGE);
-
-                else if ( strcmp(incomingString,"SliderJoint") == 0)
+                        break;
+                case SLIDER_JOINT_COMMAND:
                         Create_Joint(world,space,numberOfJoints,SLIDER);
-                else if ( strcmp(incomingString,"Thruster") == 0)
+                        break;
+                case THRUSTER_COMMAND:
                         Create_Joint(world,space,numberOfJoints,THRUSTER);
-                //Sensors
-                else if ( strcmp(incomingString,"IsSeenSensor") == 0)
-                        Create_IsSeen_Sensor(data->evaluationTime);
-
-                else if ( strcmp(incomingString,"PositionSensor") == 0 )
-
-                        Create_Position_Sensor(data->evaluationTime);
-
-                else if ( strcmp(incomingString,"TouchSensor") == 0 )
+                        break;
 
-                        Create_Touch_Sensor(data->evaluationTime);
-
-                else if ( strcmp(incomingString,"RaySensor") == 0 )
+                //Sensors
+                case IS_SEEN_SENSOR_COMMAND:
+                        Create_IsSeen_Sensor(Recording_Period(data));
+                        break;
+                case POSITION_SENSOR_COMMAND:
+                        Create_Position_Sensor(Recording_Period(data));
+                        break;
+                case TOUCH_SENSOR_COMMAND:
+                        Create_Touch_Sensor(Recording_Period(data));
+                        break;
+                case RAY_SENSOR_COMMAND:
+                        Create_Ray_Sensor(raySpace,Recording_Period(data));
+                        break;
+                case PROPRIOCEPTIVE_SENSOR_COMMAND:
+                        Create_Proprioceptive_Sensor(Recording_Period(data));
+                        break;
+                case LIGHT_SENSOR_COMMAND:
+                        Create_Light_Sensor(Recording_Period(data));
+                        break;
+                case VESTIBULAR_SENSOR_COMMAND:
+                        Create_Vestibular_Sensor(Recording_Period(data));
+                        break;
+                case LIGHT_SOURCE_COMMAND:
+                        Create_Light_Source();
+                        break;
 
-                        Create_Ray_Sensor(space,data->evaluationTime);
+                //Neurons
+                case BIAS_NEURON_COMMAND:
+                        Create_Bias_Neuron();
+                        break;
+                case SENSOR_NEURON_COMMAND:
+                        Create_Sensor_Neuron();
+                        break;
+                case HIDDEN_NEURON_COMMAND:
+                        Create_Hidden_Neuron();
+                        break;
+                case MOTOR_NEURON_COMMAND:
+                        Create_Motor_Neuron();
+                        break;
+                case FUNCTION_NEURON_COMMAND:
+                        Create_Function_Neuron(data->evaluationTime);
+                        break;
 
-                else if ( strcmp(incomingString,"ProprioceptiveSensor") == 0 )
+                //Synapse
+                case SYNAPSE_COMMAND:
+                        Create_Synapse();
+                        break;
 
-                        Create_Proprioceptive_Sensor(data->evaluationTime);
+                case STOP_CONDITION_COMMAND:
+                        Create_Stop_Condition();
+                        break;
 
-                else if ( strcmp(incomingString,"LightSensor") == 0 )
+                default:
+                        std::cerr << "Unknown command from python: "
+                                  << Command_Name(command) << std::endl;
+                        exit(1);
+                }
 
-                        Create_Light_Sensor(data->evaluationTime);
+                command = pythonInput.Read_Command();
+        }
 
-                else if ( strcmp(incomingString,"VestibularSensor") == 0 )
+        Create_Collision_Groups(space,data);
 
-                        Create_Vestibular_Sensor(data->evaluationTime);
+        lightSources = new LIGHT_SOURCES(numberOfBodies,objects.data());
 
-                else if ( strcmp(incomingString,"LightSource") == 0 )
+        sensors->Allocate_Recordings();
 
-                        Create_Light_Source();
+        if ( neuralNetwork )
 
-                //Neurons
-                else if ( strcmp(incomingString,"BiasNeuron") == 0 )
+                neuralNetwork->Compile();
+}
 
-                        Create_Bias_Neuron();
-                else if ( strcmp(incomingString,"SensorNeuron") == 0 )
+void ENVIRONMENT::Poll_Sensors(int timeStep) {
 
-                        Create_Sensor_Neuron();
+        lightSources->Update();
 
-                else if ( strcmp(incomingString,"HiddenNeuron") == 0 )
+        sensors->Poll(lightSources);
+}
 
-                        Create_Hidden_Neuron();
+void ENVIRONMENT::Record_Sensors(int timeStep) {
 
-                else if ( strcmp(incomingString,"MotorNeuron") == 0 )
+        sensors->Record(timeStep);
+}
 
-                        Create_Motor_Neuron();
+void ENVIRONMENT::Set_Poses(const float *poses) {
 
-                else if ( strcmp(incomingString,"FunctionNeuron") == 0)
-                        Create_Function_Neuron(data->evaluationTime);
-                //Synapse
-                else
-                        Create_Synapse();
+        for (int i=0;i<numberOfBodies;i++)
 
-                std::cin >> incomingString;
-        }
+                objects[i]->Set_Pose(poses + i * POSE_SIZE);
 }
 
-void ENVIRONMENT::Poll_Sensors(int timeStep) {
+int ENVIRONMENT::Stop_Condition_Met(int timeStep) {
 
-        for (int i=0;i<numberOfBodies;i++)
+        for (int s=0;s<numberOfStopConditions;s++)
 
-                objects[i]->Poll_Sensors(numberOfBodies,objects,timeStep);
+                if ( stopConditions[s]->Is_Met(timeStep) )
 
-        for (int j=0;j<numberOfJoints;j++)
+                        return true;
 
-                joints[j]->Poll_Sensors(timeStep);
+        return false;
 }
 
 void ENVIRONMENT::Update_Neural_Network(int timeStep) {
 
-	Update_Sensor_Neurons(timeStep);
+	sensors->Update_Sensor_Neurons();
+
 	if ( neuralNetwork )
 
 		neuralNetwork->Update(timeStep);
@@ -231,15 +408,11 @@ void ENVIRONMENT::Update_Forces(int timeStep){
         objects[i]->Apply_Stored_Forces(timeStep);
     }
 }
-void ENVIRONMENT::Write_Sensor_Data(int evalPeriod) {
+void ENVIRONMENT::Write_Sensor_Data(int numSteps) {
 
-    std::cerr << "finishing" << std::endl;
-	for (int i=0;i<numberOfBodies;i++)
-		objects[i]->Write_To_Python(evalPeriod);
-    for (int j=0;j<numberOfJoints;j++)
-    	joints[j]->Write_To_Python(evalPeriod);
+	sensors->Write_To_Python();
 
-	std::cout << "Done\n";
+	Write_End_Of_Block(numSteps);
 }
 
 // ----------------------- Private methods ---------------------------
@@ -262,7 +435,7 @@ void ENVIRONMENT::Create_Bias_Neuron(void) {
 
         int ID;
 
-        std::cin >> ID;
+        pythonInput >> ID;
 
         if ( neuralNetwork == NULL )
 
@@ -273,16 +446,13 @@ void ENVIRONMENT::Create_Bias_Neuron(void) {
 
 void ENVIRONMENT::Create_Function_Neuron(int evalPeriod){
         int ID;
-        std::cin >> ID;
+        pythonInput >> ID;
 
         if( neuralNetwork == NULL)
                 Create_Neural_Network();
         double *timeValues = new double[evalPeriod];
 
-        for(int i=0; i<evalPeriod; i++)
-        {
-                std::cin >> timeValues[i];
-        }
+        pythonInput.Read_Values(timeValues, evalPeriod);
 
         neuralNetwork->Add_Function_Neuron(ID, timeValues);
 }
@@ -290,13 +460,13 @@ void ENVIRONMENT::Create_Hidden_Neuron(void)
 {
 
     int ID;
-    std::cin >> ID;
+    pythonInput >> ID;
 
 	double tau;
-	std::cin >> tau;
+	pythonInput >> tau;
 
     double alpha;
-    std::cin >> alpha;
+    pythonInput >> alpha;
 
     if ( neuralNetwork == NULL )
         Create_Neural_Network();
@@ -306,7 +476,7 @@ void ENVIRONMENT::Create_Hidden_Neuron(void)
 
 void ENVIRONMENT::Create_Joint( dWorldID world, dSpaceID space, int index, int jointType) {
 
-	joints[index] = new JOINT(jointType);
+	joints.push_back(new JOINT(jointType));
 
 	joints[index]->Read_From_Python();
 	int firstObjectID = joints[index]->Get_First_Object_Index();
@@ -328,24 +498,33 @@ void ENVIRONMENT::Create_Joint( dWorldID world, dSpaceID space, int index, int j
 	numberOfJoints++;
 }
 
-void ENVIRONMENT::Create_Light_Sensor(int evalPeriod) {
+void ENVIRONMENT::Create_Light_Sensor(int recordingPeriod) {
 
         int objectIndex;
 
         int ID;
 
-        std::cin >> ID;
+        pythonInput >> ID;
+
+        pythonInput >> objectIndex;
 
-        std::cin >> objectIndex;
+        int recordEvery;
 
-        objects[objectIndex]->Create_Light_Sensor(ID,evalPeriod);
+        pythonInput >> recordEvery;
+
+        int sumSources;
+
+        pythonInput >> sumSources;
+
+        sensors->Add_Light_Sensor(
+                objects[objectIndex]->Create_Light_Sensor(ID,recordingPeriod,recordEvery,sumSources));
 }
 
 void ENVIRONMENT::Create_Light_Source(void) {
 
 	int objectIndex;
 
-	std::cin >> objectIndex;
+	pythonInput >> objectIndex;
 
 	objects[objectIndex]->Create_Light_Source();
 }
@@ -354,20 +533,20 @@ void ENVIRONMENT::Create_Motor_Neuron(void) {
 
     int ID;
 
-    std::cin >> ID;
+    pythonInput >> ID;
 
     int jointID;
 
-    std::cin >> jointID;
+    pythonInput >> jointID;
 
     double tau;
-    std::cin >> tau;
+    pythonInput >> tau;
 
     double alpha;
-    std::cin >> alpha;
+    pythonInput >> alpha;
 
     double start;
-    std::cin >> start;
+    pythonInput >> start;
 
     if ( neuralNetwork == NULL )
         Create_Neural_Network();
@@ -382,60 +561,74 @@ void ENVIRONMENT::Create_Neural_Network(void) {
 
 void ENVIRONMENT::Create_Object(dWorldID world, dSpaceID space, int index, int shape) {
 
-    objects[index] = new OBJECT();
+    objects.push_back(new OBJECT());
 
 	objects[index]->Read_From_Python(world,space,shape);
 
 	numberOfBodies++;
 }
 
-void ENVIRONMENT::Create_Ray_Sensor(dSpaceID space, int evalPeriod) {
+void ENVIRONMENT::Create_Ray_Sensor(dSpaceID space, int recordingPeriod) {
 
     int objectIndex;
 
     int ID;
 
-    std::cin >> ID;
+    pythonInput >> ID;
 
-    std::cin >> objectIndex;
+    pythonInput >> objectIndex;
 
-    objects[objectIndex]->Create_Ray_Sensor(space,ID,evalPeriod);
+    sensors->Add_Ray_Sensor(
+        objects[objectIndex]->Create_Ray_Sensor(space,ID,recordingPeriod));
 }
 
-void ENVIRONMENT::Create_IsSeen_Sensor(int evalPeriod){
+void ENVIRONMENT::Create_IsSeen_Sensor(int recordingPeriod){
     int objectIndex;
     int ID;
 
-    std::cin >> ID;
-    std::cin >> objectIndex;
+    pythonInput >> ID;
+    pythonInput >> objectIndex;
+    int recordEvery;
+    pythonInput >> recordEvery;
     std::cerr << "Creating is seen " << ID << std::endl;
-    objects[objectIndex]->Create_IsSeen_Sensor(ID, evalPeriod);
+    sensors->Add_IsSeen_Sensor(
+        objects[objectIndex]->Create_IsSeen_Sensor(ID, recordingPeriod,recordEvery));
 }
 
-void ENVIRONMENT::Create_Position_Sensor(int evalPeriod) {
+void ENVIRONMENT::Create_Position_Sensor(int recordingPeriod) {
 
     int objectIndex;
 
     int ID;
 
-    std::cin >> ID;
+    pythonInput >> ID;
 
-    std::cin >> objectIndex; 
+    pythonInput >> objectIndex; 
 
-    objects[objectIndex]->Create_Position_Sensor(ID,evalPeriod);	
+    int recordEvery;
+
+    pythonInput >> recordEvery;
+
+    sensors->Add_Position_Sensor(
+        objects[objectIndex]->Create_Position_Sensor(ID,recordingPeriod,recordEvery));
 }
 
-void ENVIRONMENT::Create_Proprioceptive_Sensor(int evalPeriod) {
+void ENVIRONMENT::Create_Proprioceptive_Sensor(int recordingPeriod) {
 
     int jointIndex;
 
     int ID;
 
-    std::cin >> ID;
+    pythonInput >> ID;
+
+    pythonInput >> jointIndex;
 
-    std::cin >> jointIndex;
+    int recordEvery;
 
-    joints[jointIndex]->Create_Proprioceptive_Sensor(ID,evalPeriod);
+    pythonInput >> recordEvery;
+
+    sensors->Add_Proprioceptive_Sensor(
+        joints[jointIndex]->Create_Proprioceptive_Sensor(ID,recordingPeriod,recordEvery));
 }
 
 void ENVIRONMENT::Connect_Motor_Neuron_to_Joint( int jointID, NEURON *motorNeuron ) {
@@ -470,15 +663,15 @@ void ENVIRONMENT::Create_Sensor_Neuron(void) {
 
 	int ID;
 
-	std::cin >> ID;
+	pythonInput >> ID;
 
 	int sensorID;
 
-        std::cin >> sensorID;
+        pythonInput >> sensorID;
 
 	int sensorValueIndex;
 
-        std::cin >> sensorValueIndex;
+        pythonInput >> sensorValueIndex;
 
 	if ( neuralNetwork == NULL )
 
@@ -487,6 +680,51 @@ void ENVIRONMENT::Create_Sensor_Neuron(void) {
 	Add_Sensor_Neuron(ID,sensorID,sensorValueIndex);
 }
 
+void ENVIRONMENT::Create_Stop_Condition(void) {
+
+        int sensorID;
+
+        pythonInput >> sensorID;
+
+        int sensorValueIndex;
+
+        pythonInput >> sensorValueIndex;
+
+        int above;
+
+        pythonInput >> above;
+
+        double threshold;
+
+        pythonInput >> threshold;
+
+        int start;
+
+        pythonInput >> start;
+
+        RECORDER *recorder = sensors->Get_Recorder(sensorID);
+
+        if ( recorder == NULL ) {
+
+                std::cerr << "Stop condition on unknown sensor "
+                          << sensorID << std::endl;
+                exit(1);
+        }
+
+        if ( sensorValueIndex < 0 ||
+             sensorValueIndex >= recorder->Get_Number_Of_Values() ) {
+
+                std::cerr << "Stop condition on sensor " << sensorID
+                          << " has no value " << sensorValueIndex << std::endl;
+                exit(1);
+        }
+
+        stopConditions.push_back(new STOP_CONDITION(
+                recorder,sensorValueIndex,above,threshold,start));
+
+        numberOfStopConditions++;
+}
+
 void ENVIRONMENT::Create_Synapse(void) {
 
         if ( neuralNetwork == NULL )
@@ -496,40 +734,149 @@ void ENVIRONMENT::Create_Synapse(void) {
         neuralNetwork->Add_Synapse();
 }
 
-void ENVIRONMENT::Create_Touch_Sensor(int evalPeriod) {
+void ENVIRONMENT::Create_Touch_Sensor(int recordingPeriod) {
 
     int objectIndex;
 
     int ID;
 
-    std::cin >> ID;
+    pythonInput >> ID;
+
+    pythonInput >> objectIndex;
+
+    int recordEvery;
 
-    std::cin >> objectIndex;
+    pythonInput >> recordEvery;
 
-    objects[objectIndex]->Create_Touch_Sensor(ID,evalPeriod);
+    sensors->Add_Touch_Sensor(
+        objects[objectIndex]->Create_Touch_Sensor(ID,recordingPeriod,recordEvery));
 }
 
-void ENVIRONMENT::Create_Vestibular_Sensor(int evalPeriod) {
+void ENVIRONMENT::Create_Vestibular_Sensor(int recordingPeriod) {
 
         int objectIndex;
 
         int ID;
 
-        std::cin >> ID;
+        pythonInput >> ID;
 
-        std::cin >> objectIndex;
+        pythonInput >> objectIndex;
 
-        objects[objectIndex]->Create_Vestibular_Sensor(ID,evalPeriod);
+        int recordEvery;
+
+        pythonInput >> recordEvery;
+
+        sensors->Add_Vestibular_Sensor(
+                objects[objectIndex]->Create_Vestibular_Sensor(ID,recordingPeriod,recordEvery));
 }
 
-void ENVIRONMENT::Update_Sensor_Neurons(int timeStep) {
+int ENVIRONMENT::Recording_Period(Data *data) {
 
-        for (int i=0;i<numberOfBodies;i++)
+        // When streaming, sensors only hold one chunk of time steps
+        // before they are written back to python.
 
-                objects[i]->Update_Sensor_Neurons(timeStep);
+        if ( (data->streamChunk > 0) && (data->streamChunk < data->evaluationTime) )
 
-        for (int j=0;j<numberOfJoints;j++)
+                return data->streamChunk;
 
-                joints[j]->Update_Sensor_Neurons(timeStep);
+        return data->evaluationTime;
 }
+
+void ENVIRONMENT::Create_Collision_Groups(dSpaceID space, Data *data) {
+
+        // With a hash space each collision group gets a space of its own
+        // nested in the scene's space, so ODE can discard pairs between
+        // groups that do not collide, and pairs within a group that does
+        // not collide with itself, before they reach the near callback.
+        // Quadtree and sweep and prune spaces cannot be collided with
+        // each other, so there all groups share one space and are told
+        // apart by their category bits only.
+
+        for (int i=0;i<numberOfBodies;i++) {
+
+                int group = objects[i]->Get_Group();
+
+                while ( numberOfCollisionSpaces <= group ) {
+
+                        collisionSpaces.push_back(NULL);
+
+                        numberOfCollisionSpaces++;
+                }
+
+                if ( collisionSpaces[group] == NULL ) {
+
+                        if ( data->spaceType == HASH_SPACE )
+
+                                collisionSpaces[group] = Create_Collision_Space(space,data);
+
+                        else {
+                                if ( sharedCollisionSpace == NULL )
+
+                                        sharedCollisionSpace = Create_Collision_Space(space,data);
+
+                                collisionSpaces[group] = sharedCollisionSpace;
+                        }
+                }
+
+                dSpaceRemove(space,objects[i]->Get_Geom());
+
+                dSpaceAdd(collisionSpaces[group],objects[i]->Get_Geom());
+        }
+
+        // Each group is one category bit. The ground and the ray sensors
+        // keep the default bits, so they are tested against every group.
+
+        if ( numberOfCollisionSpaces > (int)(sizeof(unsigned long) * 8) )
+
+                // too many groups for the bits, the near callback still
+                // checks the collision matrix
+                return;
+
+        for (int i=0;i<numberOfBodies;i++) {
+
+                int group = objects[i]->Get_Group();
+
+                unsigned long collideBits = 0;
+
+                for (int h=0;h<numberOfCollisionSpaces;h++)
+
+                        if ( data->Groups_Collide(group,h) )
+
+                                collideBits |= 1UL << h;
+
+                dGeomSetCategoryBits(objects[i]->Get_Geom(),1UL << group);
+
+                dGeomSetCollideBits(objects[i]->Get_Geom(),collideBits);
+
+                if ( sharedCollisionSpace == NULL ) {
+
+                        dGeomSetCategoryBits((dGeomID)collisionSpaces[group],1UL << group);
+
+                        dGeomSetCollideBits((dGeomID)collisionSpaces[group],collideBits);
+                }
+        }
+}
+
+dSpaceID ENVIRONMENT::Create_Collision_Space(dSpaceID space, Data *data) {
+
+        if ( data->spaceType == QUADTREE_SPACE ) {
+
+                dVector3 center = {data->spaceCenter[0],data->spaceCenter[1],data->spaceCenter[2]};
+
+                dVector3 extents = {data->spaceExtents[0],data->spaceExtents[1],data->spaceExtents[2]};
+
+                return dQuadTreeSpaceCreate(space,center,extents,data->spaceDepth);
+        }
+
+        if ( data->spaceType == SAP_SPACE )
+
+                return dSweepAndPruneSpaceCreate(space,data->spaceAxisOrder);
+
+        dSpaceID hashSpace = dHashSpaceCreate(space);
+
+        dHashSpaceSetLevels(hashSpace,data->spaceMinLevel,data->spaceMaxLevel);
+
+        return hashSpace;
+}
+
 #endif
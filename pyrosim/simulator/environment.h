@@ -2,10 +2,14 @@
 #define _ENVIRONMENT_H
 
 #include <ode/ode.h>
+#include <vector>
 #include "joint.h"
 #include "object.h"
 #include "neuralNetwork.h"
 #include "datastruct.h"
+#include "stopCondition.h"
+#include "lightSources.h"
+#include "sensors.h"
 
 class ENVIRONMENT {
  
@@ -16,12 +20,26 @@ private:
 	int numberOfJoints;
 	int type; 
 	
-	OBJECT **objects;
+	std::vector<OBJECT *> objects;
 
-	JOINT **joints;
+	std::vector<JOINT *> joints;
 
 	NEURAL_NETWORK *neuralNetwork;
 
+	LIGHT_SOURCES *lightSources;
+
+	SENSORS *sensors;
+
+	int numberOfStopConditions;
+
+	std::vector<STOP_CONDITION *> stopConditions;
+
+	int numberOfCollisionSpaces;
+
+	std::vector<dSpaceID> collisionSpaces;
+
+	dSpaceID sharedCollisionSpace;
+
 public:
 	ENVIRONMENT(void);
 
@@ -29,19 +47,37 @@ public:
 
 	void Actuate_Joints(void);
 
+	void Collide_Within_Groups(Data *data, void *callbackData, dNearCallback *callback);
+
+#ifndef HEADLESS
 	void Draw(int debug=0);
+#endif
+
+	int  Get_Number_Of_Bodies(void);
 
 	void Get_Object_Position(float *xyz, int bodyID);
 
+	void Get_Pose_Log_Bodies(POSE_LOG_BODY *logBodies);
+
+	void Get_Poses(float *poses);
+
         void Poll_Sensors(int timeStep);
 
-    void Read_From_Python(dWorldID world, dSpaceID space, Data *data);
+	void Read_From_Pose_Log(dSpaceID space, POSE_LOG_READER *poseLog);
+
+    void Read_From_Python(dWorldID world, dSpaceID space, dSpaceID raySpace, Data *data);
+
+	void Record_Sensors(int timeStep);
+
+	void Set_Poses(const float *poses);
+
+	int  Stop_Condition_Met(int timeStep);
 
 	void Update_Neural_Network(int timeStep);
 
 	void Update_Forces(int timeStep);
 
-	void Write_Sensor_Data(int evalPeriod);
+	void Write_Sensor_Data(int numSteps);
 
 private:
     void Add_Motor_Neuron(int ID, int jointID, double tau, double alpha, double start);
@@ -54,15 +90,19 @@ private:
 
 	void Create_Bias_Neuron( void );
 
+	void Create_Collision_Groups(dSpaceID space, Data *data);
+
+	dSpaceID Create_Collision_Space(dSpaceID space, Data *data);
+
 	void Create_Function_Neuron(int evalPeriod);
 	
 	void Create_Hidden_Neuron( void );
 
-	void Create_IsSeen_Sensor(int evalPeriod);
+	void Create_IsSeen_Sensor(int recordingPeriod);
 
 	void Create_Joint( dWorldID world, dSpaceID space, int index, int jointType);
 
-	void Create_Light_Sensor(int evalPeriod);
+	void Create_Light_Sensor(int recordingPeriod);
 
 	void Create_Light_Source(void);
 
@@ -72,21 +112,23 @@ private:
 
 	void Create_Object(dWorldID world, dSpaceID space, int index, int objType);
 
-	void Create_Ray_Sensor(dSpaceID space, int evalPeriod);
+	void Create_Ray_Sensor(dSpaceID space, int recordingPeriod);
 
-	void Create_Position_Sensor(int evalPeriod);
+	void Create_Position_Sensor(int recordingPeriod);
 
-	void Create_Proprioceptive_Sensor(int evalPeriod);
+	void Create_Proprioceptive_Sensor(int recordingPeriod);
 
 	void Create_Sensor_Neuron(void);
 
+	void Create_Stop_Condition(void);
+
 	void Create_Synapse(void);
 
-	void Create_Touch_Sensor(int evalPeriod);
+	void Create_Touch_Sensor(int recordingPeriod);
 
-	void Create_Vestibular_Sensor(int evalPeriod);
+	void Create_Vestibular_Sensor(int recordingPeriod);
 
-	void Update_Sensor_Neurons(int timeStep);
+	int  Recording_Period(Data *data);
 };
 
 #endif
@@ -5,26 +5,25 @@
 #include "isSeenSensor.h"
 #include "neuron.h"
 
-IS_SEEN_SENSOR::IS_SEEN_SENSOR(int myID, int evalPeriod){
+IS_SEEN_SENSOR::IS_SEEN_SENSOR(int myID, int recordingPeriod, int recordEvery){
     ID = myID;
-    values = new int[evalPeriod];
-
-    for (int t=0; t<evalPeriod; t++){
-        values[t] = 0;
-    }
+    value = 0;
+    recorder = new RECORDER(1,recordingPeriod,recordEvery);
 
     mySensorNeuron = NULL;
 }
 
-IS_SEEN_SENSOR::~IS_SEEN_SENSOR(void){}
+IS_SEEN_SENSOR::~IS_SEEN_SENSOR(void){
+    delete recorder;
+}
 
 void IS_SEEN_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron){
     mySensorNeuron = sensorNeuron;
 }
 
-void IS_SEEN_SENSOR::Fires(int t) {
+void IS_SEEN_SENSOR::Fires(void) {
 
-    values[t] = 1;
+    value = 1;
 }
 
 int  IS_SEEN_SENSOR::Get_ID(void) {
@@ -32,22 +31,19 @@ int  IS_SEEN_SENSOR::Get_ID(void) {
         return ID;
 }
 
-void IS_SEEN_SENSOR::Update_Sensor_Neurons(int t) {
-        if ( mySensorNeuron )
-                mySensorNeuron->Set( values[t] );
-}
-
-void IS_SEEN_SENSOR::Write_To_Python(int evalPeriod) {
+RECORDER *IS_SEEN_SENSOR::Get_Recorder(void) {
 
-        char outString[100000];
-        sprintf(outString,"%d %d ",ID,1);
+        return recorder;
+}
 
-        for ( int t=0; t < evalPeriod; t++ ){
-            sprintf(outString,"%s %d ",outString,values[t]);
-        }
+void IS_SEEN_SENSOR::Record(int t) {
+        recorder->Store(&value,t);
+        value = 0;
+}
 
-        sprintf(outString,"%s \n",outString);
-        std::cout << outString;
+void IS_SEEN_SENSOR::Update_Sensor_Neurons(void) {
+        if ( mySensorNeuron )
+                mySensorNeuron->Set( value );
 }
 
-#endif
\ No newline at end of file
+#endif
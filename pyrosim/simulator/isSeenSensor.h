@@ -2,27 +2,32 @@
 #define _IS_SEEN_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 class NEURON;
 
 class IS_SEEN_SENSOR {
 private:
     int ID;
-    int *values;
+    double value;
+    RECORDER *recorder;
     NEURON *mySensorNeuron;
 
 public:
-    IS_SEEN_SENSOR(int myID, int evalPeriod);
+    IS_SEEN_SENSOR(int myID, int recordingPeriod, int recordEvery);
     ~IS_SEEN_SENSOR();
 
     void Connect_To_Sensor_Neuron(NEURON *sensorNeuron);
 
-    void Fires(int t);
+    void Fires(void);
 
     int Get_ID(void);
 
-    void Update_Sensor_Neurons(int t);
+    RECORDER *Get_Recorder(void);
+
+    void Record(int t);
+
+    void Update_Sensor_Neurons(void);
 
-    void Write_To_Python(int evalPeriod);
 };
 
 #endif
\ No newline at end of file
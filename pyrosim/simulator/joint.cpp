@@ -4,12 +4,16 @@
 #include "iostream"
 
 #include "joint.h"
+#include "pythonInput.h"
 
+#ifndef HEADLESS
 #include <drawstuff/drawstuff.h>
 #include "texturepath.h"
+#endif
 #include <cmath>
 //#include "constants.h"
 
+#ifndef HEADLESS
 #ifdef dDOUBLE
 #define dsDrawLine dsDrawLineD
 #define dsDrawBox dsDrawBoxD
@@ -17,6 +21,7 @@
 #define dsDrawCylinder dsDrawCylinderD
 #define dsDrawCapsule dsDrawCapsuleD
 #endif
+#endif
 
 extern int HINGE;
 extern int SLIDER;
@@ -54,6 +59,7 @@ JOINT::JOINT(int jointType) {
 
 JOINT::~JOINT(void) {
 
+        delete proprioceptiveSensor;
 }
 
 void JOINT::Actuate(void) {
@@ -146,11 +152,14 @@ void JOINT::Create_In_Simulator(dWorldID world, OBJECT *firstObject, OBJECT *sec
         Create_Thruster_In_Simulator();
 }
 
-void JOINT::Create_Proprioceptive_Sensor(int myID, int evalPeriod) {
+PROPRIOCEPTIVE_SENSOR *JOINT::Create_Proprioceptive_Sensor(int myID, int recordingPeriod, int recordEvery) {
+
+        proprioceptiveSensor = new PROPRIOCEPTIVE_SENSOR(joint,type,myID,recordingPeriod,recordEvery);
 
-        proprioceptiveSensor = new PROPRIOCEPTIVE_SENSOR(myID,evalPeriod);
+        return proprioceptiveSensor;
 }
 
+#ifndef HEADLESS
 void JOINT::Draw(){
     dVector3 jointPosition;
     dVector3 jointAxis;
@@ -254,6 +263,7 @@ void JOINT::Draw(){
 
     }
 }
+#endif
 
 int JOINT::Get_First_Object_Index(void) {
 
@@ -265,70 +275,49 @@ int JOINT::Get_Second_Object_Index(void) {
         return secondObject;
 }
 
-void JOINT::Poll_Sensors(int t) {
-
-        if ( proprioceptiveSensor )
-
-                proprioceptiveSensor->Poll(joint, type, t);
-}
-
 void JOINT::Read_From_Python(void) {
 
-    std::cin >> ID;  
+    pythonInput >> ID;  
     if (type == HINGE)
     {
-        std::cin >> firstObject;
-        std::cin >> secondObject;
-        std::cin >> x;
-        std::cin >> y;
-        std::cin >> z;
-        std::cin >> normalX;
-        std::cin >> normalY;
-        std::cin >> normalZ;
-        std::cin >> lowStop;
-        std::cin >> highStop;
-        std::cin >> speed;
-        std::cin >> strength;
-        std::cin >> positionControl;
+        pythonInput >> firstObject;
+        pythonInput >> secondObject;
+        pythonInput >> x;
+        pythonInput >> y;
+        pythonInput >> z;
+        pythonInput >> normalX;
+        pythonInput >> normalY;
+        pythonInput >> normalZ;
+        pythonInput >> lowStop;
+        pythonInput >> highStop;
+        pythonInput >> speed;
+        pythonInput >> strength;
+        pythonInput >> positionControl;
     }
     else if (type == SLIDER)
     {
-        std::cin >> firstObject;
-        std::cin >> secondObject;
-        std::cin >> normalX;
-        std::cin >> normalY;
-        std::cin >> normalZ;
-        std::cin >> lowStop;
-        std::cin >> highStop;
-        std::cin >> speed;
-        std::cin >> strength;
-        std::cin >> positionControl;
+        pythonInput >> firstObject;
+        pythonInput >> secondObject;
+        pythonInput >> normalX;
+        pythonInput >> normalY;
+        pythonInput >> normalZ;
+        pythonInput >> lowStop;
+        pythonInput >> highStop;
+        pythonInput >> speed;
+        pythonInput >> strength;
+        pythonInput >> positionControl;
     }
     else if (type == THRUSTER)
     {
-        std::cin >> firstObject;
-        std::cin >> x;
-        std::cin >> y;
-        std::cin >> z;
-        std::cin >> lowStop;
-        std::cin >> highStop;
+        pythonInput >> firstObject;
+        pythonInput >> x;
+        pythonInput >> y;
+        pythonInput >> z;
+        pythonInput >> lowStop;
+        pythonInput >> highStop;
     }
 }
 
-void JOINT::Update_Sensor_Neurons(int t) {
-
-        if ( proprioceptiveSensor )
-
-                proprioceptiveSensor->Update_Sensor_Neurons(t);
-}
-
-void JOINT::Write_To_Python(int evalPeriod) {
-
-        if ( proprioceptiveSensor )
-
-                proprioceptiveSensor->Write_To_Python(evalPeriod);
-}
-
 // ------------------- Private methods --------------------------
 
 
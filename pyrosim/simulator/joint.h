@@ -46,16 +46,16 @@ public:
     int  Connect_To_Motor_Neuron(int jointID, NEURON *mNeuron);
 
 	void Create_In_Simulator(dWorldID world, OBJECT *first, OBJECT *second);
-    void Create_Proprioceptive_Sensor(int myID, int evalPeriod);
+    PROPRIOCEPTIVE_SENSOR *Create_Proprioceptive_Sensor(int myID, int recordingPeriod, int recordEvery);
         
+#ifndef HEADLESS
     void Draw();
+#endif
 
 	int  Get_First_Object_Index(void);
 
 	int  Get_Second_Object_Index(void);
 
-    void Poll_Sensors(int t);
-
 	void Read_From_Python(void);
 
     void Set_Position(double X, double Y, double Z){
@@ -94,9 +94,6 @@ public:
     void Set_Speed(double s){
         speed = s;
     }
-	void Update_Sensor_Neurons(int t);
-
-	void Write_To_Python(int evalPeriod);
 
 private:
 	//void Create_Fixed_Joint_In_Simulator(dWorldID world, OBJECT *firstObject, OBJECT *secondObject);
@@ -4,18 +4,26 @@
 #include "iostream"
 #include "lightSensor.h"
 #include "neuron.h"
+#include "lightSources.h"
 
-LIGHT_SENSOR::LIGHT_SENSOR(int myID, int evalPeriod) {
+LIGHT_SENSOR::LIGHT_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery, int sumAll) {
 
 	ID = myID;
 
-	values = new double[evalPeriod];
+	geom = myGeom;
+
+	value = 0.0;
+
+	sumSources = sumAll;
+
+	recorder = new RECORDER(1,recordingPeriod,recordEvery);
 
 	mySensorNeuron = NULL;
 }
 
 LIGHT_SENSOR::~LIGHT_SENSOR(void) {
 
+	delete recorder;
 }
 
 void LIGHT_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
@@ -28,45 +36,34 @@ int  LIGHT_SENSOR::Get_ID(void) {
 	return ID;
 }
 
-void LIGHT_SENSOR::Poll(dBodyID body, dBodyID lightSource, int t) {
-
-	const dReal *myPos = dBodyGetPosition(body);
+RECORDER *LIGHT_SENSOR::Get_Recorder(void) {
 
-	const dReal *lightPos = dBodyGetPosition(lightSource);
-
-	double xDiff = myPos[0] - lightPos[0];
+	return recorder;
+}
 
-        double yDiff = myPos[1] - lightPos[1];
+void LIGHT_SENSOR::Poll(LIGHT_SOURCES *lightSources) {
 
-        double zDiff = myPos[2] - lightPos[2];
+	const dReal *myPos = dGeomGetPosition(geom);
 
-	double distance = sqrt( pow(xDiff,2.0) + pow(yDiff,2.0) + pow(zDiff,2.0) );
+	// Either the light of the nearest source or of all of them together.
 
-	// Light decays with the inverse of the square of the distance...
+	if ( sumSources )
 
-	values[t] = 1.0 / pow(distance,2.0);
+		value = lightSources->Total_Intensity(myPos);
+	else
+		value = lightSources->Nearest_Intensity(myPos);
 }
 
-void LIGHT_SENSOR::Update_Sensor_Neurons(int t) {
+void LIGHT_SENSOR::Record(int t) {
 
-	if ( mySensorNeuron )
-
-		mySensorNeuron->Set( values[t] );
+	recorder->Store(&value,t);
 }
 
-void LIGHT_SENSOR::Write_To_Python(int evalPeriod) {
-
-        char outString[1000000];
-
-        sprintf(outString,"%d %d ",ID,1);
+void LIGHT_SENSOR::Update_Sensor_Neurons(void) {
 
-        for ( int  t = 0 ; t < evalPeriod ; t++ )
-
-                sprintf(outString,"%s %f ",outString,values[t]);
-
-        sprintf(outString,"%s \n",outString);
+	if ( mySensorNeuron )
 
-        std::cout << outString;
+		mySensorNeuron->Set( value );
 }
 
 #endif
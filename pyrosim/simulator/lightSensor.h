@@ -2,8 +2,10 @@
 #define _LIGHT_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class NEURON;
+class LIGHT_SOURCES;
 
 class LIGHT_SENSOR {
 
@@ -11,12 +13,18 @@ private:
 
 	int ID;
 
-	double *values; 
+	dGeomID geom;
+
+	double value; 
+
+	int sumSources;
+
+	RECORDER *recorder;
 
 	NEURON *mySensorNeuron;
 
 public:
-	LIGHT_SENSOR(int myID, int evalPeriod);
+	LIGHT_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery, int sumAll);
 
 	~LIGHT_SENSOR(void);
 
@@ -24,11 +32,14 @@ public:
 
 	int  Get_ID(void);
 
-	void Poll(dBodyID body, dBodyID lightSource, int t);
+	RECORDER *Get_Recorder(void);
+
+	void Poll(LIGHT_SOURCES *lightSources);
+
+	void Record(int t);
 
-	void Update_Sensor_Neurons(int t);
+	void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
@@ -0,0 +1,203 @@
+#ifndef _LIGHT_SOURCES_CPP
+#define _LIGHT_SOURCES_CPP
+
+#include "lightSources.h"
+#include "object.h"
+
+LIGHT_SOURCES::LIGHT_SOURCES(int numObjects, OBJECT **objects) {
+
+	numberOfSources = 0;
+
+	for (int i = 0 ; i < numObjects ; i++ )
+
+		if ( objects[i]->Contains_A_Light_Source() )
+
+			numberOfSources++;
+
+	geoms = new dGeomID[numberOfSources];
+
+	positions = new double[3 * numberOfSources];
+
+	int source = 0;
+
+	for (int i = 0 ; i < numObjects ; i++ )
+
+		if ( objects[i]->Contains_A_Light_Source() )
+
+			geoms[source++] = objects[i]->Get_Geom();
+}
+
+LIGHT_SOURCES::~LIGHT_SOURCES(void) {
+
+	delete [] geoms;
+
+	delete [] positions;
+}
+
+double LIGHT_SOURCES::Nearest_Intensity(const dReal *pos) {
+
+	if ( numberOfSources == 0 )
+
+		return 0.0;
+
+	// Light decays with the inverse of the square of the distance...
+
+	return 1.0 / Nearest_Squared_Distance(pos);
+}
+
+double LIGHT_SOURCES::Total_Intensity(const dReal *pos) {
+
+	double intensity = 0.0;
+
+	for (int s = 0 ; s < numberOfSources ; s++ )
+
+		intensity += 1.0 / Squared_Distance(s,pos);
+
+	return intensity;
+}
+
+void LIGHT_SOURCES::Update(void) {
+
+	for (int s = 0 ; s < numberOfSources ; s++ ) {
+
+		const dReal *pos = dGeomGetPosition(geoms[s]);
+
+		positions[3*s]   = pos[0];
+
+		positions[3*s+1] = pos[1];
+
+		positions[3*s+2] = pos[2];
+	}
+
+	if ( numberOfSources > LIGHT_INDEX_THRESHOLD )
+
+		Sort_Along_X();
+}
+
+// ----------------------- Private methods ---------------------------
+
+int LIGHT_SOURCES::First_At_Or_After(double x) {
+
+	int low = 0;
+
+	int high = numberOfSources;
+
+	while ( low < high ) {
+
+		int middle = (low + high) / 2;
+
+		if ( positions[3*middle] < x )
+
+			low = middle + 1;
+		else
+			high = middle;
+	}
+
+	return low;
+}
+
+double LIGHT_SOURCES::Nearest_Squared_Distance(const dReal *pos) {
+
+	double nearest = dInfinity;
+
+	if ( numberOfSources <= LIGHT_INDEX_THRESHOLD ) {
+
+		for (int s = 0 ; s < numberOfSources ; s++ ) {
+
+			double distance = Squared_Distance(s,pos);
+
+			if ( distance < nearest )
+
+				nearest = distance;
+		}
+
+		return nearest;
+	}
+
+	int start = First_At_Or_After(pos[0]);
+
+	for (int s = start ; s < numberOfSources ; s++ ) {
+
+		double xDiff = positions[3*s] - pos[0];
+
+		if ( xDiff * xDiff >= nearest )
+
+			break;
+
+		double distance = Squared_Distance(s,pos);
+
+		if ( distance < nearest )
+
+			nearest = distance;
+	}
+
+	for (int s = start - 1 ; s >= 0 ; s-- ) {
+
+		double xDiff = pos[0] - positions[3*s];
+
+		if ( xDiff * xDiff >= nearest )
+
+			break;
+
+		double distance = Squared_Distance(s,pos);
+
+		if ( distance < nearest )
+
+			nearest = distance;
+	}
+
+	return nearest;
+}
+
+double LIGHT_SOURCES::Squared_Distance(int source, const dReal *pos) {
+
+	double xDiff = pos[0] - positions[3*source];
+
+	double yDiff = pos[1] - positions[3*source+1];
+
+	double zDiff = pos[2] - positions[3*source+2];
+
+	return xDiff * xDiff + yDiff * yDiff + zDiff * zDiff;
+}
+
+void LIGHT_SOURCES::Sort_Along_X(void) {
+
+	// The sources move little between time steps, so the order of the
+	// last step is nearly sorted and insertion sort takes about one pass.
+
+	for (int s = 1 ; s < numberOfSources ; s++ ) {
+
+		dGeomID geom = geoms[s];
+
+		double x = positions[3*s];
+
+		double y = positions[3*s+1];
+
+		double z = positions[3*s+2];
+
+		int t = s - 1;
+
+		while ( t >= 0 && positions[3*t] > x ) {
+
+			geoms[t+1] = geoms[t];
+
+			positions[3*(t+1)]   = positions[3*t];
+
+			positions[3*(t+1)+1] = positions[3*t+1];
+
+			positions[3*(t+1)+2] = positions[3*t+2];
+
+			t--;
+		}
+
+		geoms[t+1] = geom;
+
+		positions[3*(t+1)]   = x;
+
+		positions[3*(t+1)+1] = y;
+
+		positions[3*(t+1)+2] = z;
+	}
+}
+
+#endif
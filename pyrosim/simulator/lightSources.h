@@ -0,0 +1,45 @@
+#ifndef _LIGHT_SOURCES_H
+#define _LIGHT_SOURCES_H
+
+#include <ode/ode.h>
+
+class OBJECT;
+
+// The bodies that carry a light source, gathered once the scene is read.
+// Their positions are copied into one array every time step, so light
+// sensors scan that instead of every body. When there are many sources
+// they are also kept sorted along x, and the nearest one is found by
+// scanning outwards from the sensor until no closer source can follow.
+
+const int LIGHT_INDEX_THRESHOLD = 16;
+
+class LIGHT_SOURCES {
+
+private:
+	int numberOfSources;
+
+	dGeomID *geoms;
+
+	double *positions;
+
+	int First_At_Or_After(double x);
+
+	double Nearest_Squared_Distance(const dReal *pos);
+
+	double Squared_Distance(int source, const dReal *pos);
+
+	void Sort_Along_X(void);
+
+public:
+	LIGHT_SOURCES(int numObjects, OBJECT **objects);
+
+	~LIGHT_SOURCES(void);
+
+	double Nearest_Intensity(const dReal *pos);
+
+	double Total_Intensity(const dReal *pos);
+
+	void Update(void);
+};
+
+#endif
@@ -7,47 +7,116 @@
 
 #include "math.h"
 
-extern int MAX_NEURONS;
-extern int MAX_SYNAPSES;
+#include <algorithm>
+
 extern int SENSOR_NEURON;
 extern int BIAS_NEURON;
 extern int HIDDEN_NEURON;
 extern int MOTOR_NEURON;
 extern int FUNCTION_NEURON;
 
+// Sorts synapses by the compiled index of their target, keeping the order
+// they were sent in among those with the same target.
+struct BY_TARGET {
+
+	int *compiledIndex;
+
+	BY_TARGET(int *index) : compiledIndex(index) {}
+
+	bool operator()(SYNAPSE *a, SYNAPSE *b) const {
+
+		return compiledIndex[ a->Get_Target_Neuron_Index() ] <
+		       compiledIndex[ b->Get_Target_Neuron_Index() ];
+	}
+};
+
 NEURAL_NETWORK::NEURAL_NETWORK(void) {
 
-	Initialize_Neurons();
+	numNeurons = 0;
+
+	order = NULL;
+
+	values = NULL;
+
+	previousValues = NULL;
+
+	taus = NULL;
+
+	alphas = NULL;
+
+	rowStarts = NULL;
+
+	sources = NULL;
+
+	weights = NULL;
+
+	numDeveloping = 0;
+
+	developing = NULL;
+
+	developingPositions = NULL;
+
+	useDense = false;
+
+	numDenseRows = 0;
+
+	denseRows = NULL;
 
-	Initialize_Synapses();
+	denseWeights = NULL;
 }
 
 NEURAL_NETWORK::~NEURAL_NETWORK(void) {
 
+	for (size_t n = 0 ; n < neurons.size() ; n++ )
+
+		delete neurons[n];
+
+	for (size_t s = 0 ; s < synapses.size() ; s++ )
+
+		delete synapses[s];
+
+	delete [] order;
+
+	delete [] values;
+
+	delete [] previousValues;
+
+	delete [] taus;
+
+	delete [] alphas;
+
+	delete [] rowStarts;
+
+	delete [] sources;
+
+	delete [] weights;
+
+	delete [] developing;
+
+	delete [] developingPositions;
+
+	delete [] denseRows;
+
+	delete [] denseWeights;
 }
 
 void NEURAL_NETWORK::Add_Bias_Neuron(int ID) {
-        neurons[numNeurons] = new NEURON(ID,BIAS_NEURON, 1.0, 1.0);
-        numNeurons++;
+        neurons.push_back(new NEURON(ID,BIAS_NEURON, 1.0, 1.0));
 }
 
 void NEURAL_NETWORK::Add_Function_Neuron(int ID, double *timeValues){
-	neurons[numNeurons] = new NEURON(ID, timeValues);
-	numNeurons++;
+	neurons.push_back(new NEURON(ID, timeValues));
 }
 
 void NEURAL_NETWORK::Add_Hidden_Neuron(int ID, double tau, double alpha) {
-	neurons[numNeurons] = new NEURON(ID,HIDDEN_NEURON,tau, alpha);
-	numNeurons++;
+	neurons.push_back(new NEURON(ID,HIDDEN_NEURON,tau, alpha));
 }
 
 NEURON *NEURAL_NETWORK::Add_Motor_Neuron(int ID, double tau, double alpha, double start) {
-    
+
     NEURON *newNeuron = new NEURON(ID,MOTOR_NEURON,tau, alpha);
     newNeuron->Set(start);
-    neurons[numNeurons] = newNeuron;
-
-	numNeurons++;
+    neurons.push_back(newNeuron);
 
     return newNeuron;
 }
@@ -55,91 +124,329 @@ NEURON *NEURAL_NETWORK::Add_Motor_Neuron(int ID, double tau, double alpha, doubl
 NEURON *NEURAL_NETWORK::Add_Sensor_Neuron(int ID, int svIndex) {
 
 	NEURON *newNeuron = new NEURON(ID,SENSOR_NEURON,svIndex,1.0,1.0);
-	neurons[numNeurons] = newNeuron;
-	numNeurons++;
+	neurons.push_back(newNeuron);
 
 	return newNeuron;
 }
 
 void NEURAL_NETWORK::Add_Synapse(void) {
-    synapses[numSynapses] = new SYNAPSE();
-    synapses[numSynapses]-> Read_From_Python();
-    numSynapses ++; 
+    SYNAPSE *newSynapse = new SYNAPSE();
+    newSynapse->Read_From_Python();
+    synapses.push_back(newSynapse);
+}
+
+void NEURAL_NETWORK::Compile(void) {
+
+	numNeurons = neurons.size();
+
+	// Synapses refer to neurons by the order they were sent in.
+
+	int *compiledIndex = new int[numNeurons];
+
+	Compile_Neurons(compiledIndex);
+
+	int numTargets = 0;
+
+	int numStatic = 0;
+
+	std::vector<int> isTarget(firstBias, false);
+
+	for (size_t s = 0 ; s < synapses.size() ; s++ ) {
+
+		int target = compiledIndex[ synapses[s]->Get_Target_Neuron_Index() ];
+
+		// Bias and function neurons ignore their input.
+
+		if ( target >= firstBias )
+
+			continue;
+
+		if ( !isTarget[target] ) {
+
+			isTarget[target] = true;
+
+			numTargets++;
+		}
+
+		if ( !synapses[s]->Is_Developing() )
+
+			numStatic++;
+	}
+
+	useDense = (numStatic > 0) &&
+	           (numStatic >= DENSE_NETWORK_FILL * numTargets * numNeurons);
+
+	if ( useDense )
+
+		Compile_Dense_Synapses(compiledIndex);
+
+	Compile_Sparse_Synapses(compiledIndex, !useDense);
+
+	delete [] compiledIndex;
 }
 
 void NEURAL_NETWORK::Update(int timeStep) {
 
-	Push_Current_Values_To_Previous_Values();
+	Read_Sensor_Neurons();
+
+	for (int n = 0 ; n < numNeurons ; n++ )
+
+		previousValues[n] = values[n];
 
 	Reset_Neuron_Values(timeStep);
 	Update_Synapses(timeStep);
 
 	Update_Neurons();
 	Threshold_Neurons();
+
+	Write_Back_Neurons();
 }
 
 // ------------------------- Private methods -----------------------------
 
-void NEURAL_NETWORK::Initialize_Neurons(void) {
+void NEURAL_NETWORK::Compile_Dense_Synapses(int *compiledIndex) {
+
+	std::vector<int> row(firstBias, -1);
+
+	numDenseRows = 0;
+
+	for (size_t s = 0 ; s < synapses.size() ; s++ ) {
+
+		int target = compiledIndex[ synapses[s]->Get_Target_Neuron_Index() ];
+
+		if ( (target < firstBias) && (row[target] < 0) && !synapses[s]->Is_Developing() )
+
+			row[target] = numDenseRows++;
+	}
+
+	denseRows = new int[numDenseRows];
+
+	for (int n = 0 ; n < firstBias ; n++ )
+
+		if ( row[n] >= 0 )
+
+			denseRows[ row[n] ] = n;
+
+	denseWeights = new double[numDenseRows * numNeurons];
+
+	for (int i = 0 ; i < numDenseRows * numNeurons ; i++ )
+
+		denseWeights[i] = 0.0;
+
+	for (size_t s = 0 ; s < synapses.size() ; s++ ) {
 
-        neurons = new NEURON * [MAX_NEURONS];
+		int target = compiledIndex[ synapses[s]->Get_Target_Neuron_Index() ];
 
-        for (int n = 0 ; n < MAX_NEURONS ; n++ )
+		if ( (target >= firstBias) || synapses[s]->Is_Developing() )
 
-                neurons[n] = NULL;
+			continue;
 
-        numNeurons = 0;
+		int source = compiledIndex[ synapses[s]->Get_Source_Neuron_Index() ];
+
+		denseWeights[ row[target] * numNeurons + source ] += synapses[s]->Get_Weight();
+	}
+}
+
+void NEURAL_NETWORK::Compile_Neurons(int *compiledIndex) {
+
+	int groups[5] = {SENSOR_NEURON, HIDDEN_NEURON, MOTOR_NEURON, BIAS_NEURON, FUNCTION_NEURON};
+
+	int groupStarts[5];
+
+	order = new NEURON * [numNeurons];
+
+	int next = 0;
+
+	for (int g = 0 ; g < 5 ; g++ ) {
+
+		groupStarts[g] = next;
+
+		for (int n = 0 ; n < numNeurons ; n++ )
+
+			if ( neurons[n]->Get_Type() == groups[g] ) {
+
+				compiledIndex[n] = next;
+
+				order[next++] = neurons[n];
+			}
+	}
+
+	firstHidden = groupStarts[1];
+
+	firstMotor = groupStarts[2];
+
+	firstBias = groupStarts[3];
+
+	firstFunction = groupStarts[4];
+
+	values = new double[numNeurons];
+
+	previousValues = new double[numNeurons];
+
+	taus = new double[numNeurons];
+
+	alphas = new double[numNeurons];
+
+	for (int n = 0 ; n < numNeurons ; n++ ) {
+
+		values[n] = order[n]->Get_Value();
+
+		previousValues[n] = order[n]->Get_Previous_Value();
+
+		taus[n] = order[n]->Get_Tau();
+
+		alphas[n] = order[n]->Get_Alpha();
+	}
 }
 
-void NEURAL_NETWORK::Initialize_Synapses(void) {
+void NEURAL_NETWORK::Compile_Sparse_Synapses(int *compiledIndex, int withStatic) {
+
+	std::vector<SYNAPSE *> sorted;
+
+	for (size_t s = 0 ; s < synapses.size() ; s++ ) {
+
+		int target = compiledIndex[ synapses[s]->Get_Target_Neuron_Index() ];
+
+		if ( (target < firstBias) && (withStatic || synapses[s]->Is_Developing()) )
+
+			sorted.push_back(synapses[s]);
+	}
+
+	std::stable_sort(sorted.begin(), sorted.end(), BY_TARGET(compiledIndex));
+
+	int numSparse = sorted.size();
+
+	rowStarts = new int[firstBias + 1];
+
+	sources = new int[numSparse];
+
+	weights = new double[numSparse];
 
-        synapses = new SYNAPSE * [MAX_SYNAPSES];
+	numDeveloping = 0;
 
-        for (int s = 0 ; s < MAX_SYNAPSES ; s++ )
+	for (int k = 0 ; k < numSparse ; k++ )
 
-                synapses[s] = NULL;
+		if ( sorted[k]->Is_Developing() )
 
-        numSynapses = 0;
+			numDeveloping++;
+
+	developing = new SYNAPSE * [numDeveloping];
+
+	developingPositions = new int[numDeveloping];
+
+	int d = 0;
+
+	int k = 0;
+
+	for (int n = 0 ; n < firstBias ; n++ ) {
+
+		rowStarts[n] = k;
+
+		while ( (k < numSparse) &&
+		        (compiledIndex[ sorted[k]->Get_Target_Neuron_Index() ] == n) ) {
+
+			sources[k] = compiledIndex[ sorted[k]->Get_Source_Neuron_Index() ];
+
+			weights[k] = sorted[k]->Get_Weight();
+
+			if ( sorted[k]->Is_Developing() ) {
+
+				developing[d] = sorted[k];
+
+				developingPositions[d++] = k;
+			}
+
+			k++;
+		}
+	}
+
+	rowStarts[firstBias] = k;
 }
 
-void NEURAL_NETWORK::Push_Current_Values_To_Previous_Values(void) {
+void NEURAL_NETWORK::Read_Sensor_Neurons(void) {
 
-        for (int n = 0 ; n < numNeurons ; n++ )
+	// The sensors set their sensor neurons before the network updates.
 
-		neurons[n]->Push_Current_Value_To_Previous_Value();
+	for (int n = 0 ; n < firstHidden ; n++ )
+
+		values[n] = order[n]->Get_Value();
 }
 
 void NEURAL_NETWORK::Reset_Neuron_Values(int timeStep) {
 
-	for ( int n = 0 ; n < numNeurons ; n++ )
+	if ( timeStep > 0 )
+
+		for (int n = 0 ; n < firstBias ; n++ )
+
+			values[n] = 0.0;
+
+	// Bias neurons stay at one.
+
+	for (int n = firstFunction ; n < numNeurons ; n++ )
 
-		neurons[n]->Reset(timeStep);
+		values[n] = order[n]->Get_Time_Values()[timeStep];
 }
 
 void NEURAL_NETWORK::Threshold_Neurons(void) {
 
-        for ( int n = 0 ; n < numNeurons ; n++ )
+	// Only hidden and motor neurons integrate their input.
 
-		neurons[n]->Threshold();	
+	for (int n = firstHidden ; n < firstBias ; n++ )
+
+		values[n] = tanh( alphas[n] * previousValues[n] + taus[n] * values[n] );
 }
 
 void NEURAL_NETWORK::Update_Synapses(int timeStep){
-	for (int s=0; s<numSynapses; s++){
-		synapses[s]->Update_Weight(timeStep);
+
+	for (int d = 0 ; d < numDeveloping ; d++ ) {
+
+		developing[d]->Update_Weight(timeStep);
+
+		weights[ developingPositions[d] ] = developing[d]->Get_Weight();
 	}
 }
 
 void NEURAL_NETWORK::Update_Neurons(void) {
 
-	for ( int s = 0 ; s < numSynapses ; s++ ) {
+	if ( useDense )
+
+		for (int r = 0 ; r < numDenseRows ; r++ ) {
+
+			double *row = denseWeights + r * numNeurons;
+
+			double input = 0.0;
+
+			for (int n = 0 ; n < numNeurons ; n++ )
+
+				input += row[n] * previousValues[n];
+
+			values[ denseRows[r] ] += input;
+		}
 
-		int sni = synapses[s]->Get_Source_Neuron_Index();
-		int tni = synapses[s]->Get_Target_Neuron_Index();
-		double w = synapses[s]->Get_Weight();
-		double influence = w * neurons[sni]->Get_Previous_Value();
-		neurons[tni]->Set( neurons[tni]->Get_Value() + influence );
+	for (int n = 0 ; n < firstBias ; n++ ) {
+
+		double value = values[n];
+
+		for (int k = rowStarts[n] ; k < rowStarts[n+1] ; k++ )
+
+			value += weights[k] * previousValues[ sources[k] ];
+
+		values[n] = value;
 	}
+}
+
+void NEURAL_NETWORK::Write_Back_Neurons(void) {
+
+	// Joints read the motor neurons; sensor neurons without a sensor keep
+	// their input until the next time step.
+
+	for (int n = 0 ; n < firstHidden ; n++ )
+
+		order[n]->Set( values[n] );
+
+	for (int n = firstMotor ; n < firstBias ; n++ )
 
+		order[n]->Set( values[n] );
 }
 
 #endif
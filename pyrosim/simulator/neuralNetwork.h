@@ -1,20 +1,81 @@
 #ifndef _NEURAL_NETWORK_H
 #define _NEURAL_NETWORK_H
 
+#include <vector>
+
 #include "neuron.h"
 
 #include "synapse.h"
 
+// The neurons and synapses are gathered while the scene is read and
+// compiled once it is complete. The compiled network keeps the values of
+// the neurons in contiguous arrays grouped by type
+//
+//      sensor | hidden | motor | bias | function
+//
+// and the synapses in compressed sparse rows sorted by target, so a time
+// step is a few tight loops over arrays. Only the weights of developing
+// synapses are recomputed every time step. When at least
+// DENSE_NETWORK_FILL of the possible synapses into the neurons that have
+// any exist, the static synapses are multiplied as a dense matrix
+// instead. The NEURON objects stay the interface to the sensors and
+// joints: sensor neurons are read from them and the sensor and motor
+// neurons written back to them every time step.
+
+const double DENSE_NETWORK_FILL = 0.5;
+
 class NEURAL_NETWORK {
 
 private:
-	NEURON **neurons;
+	std::vector<NEURON *> neurons;
+
+	std::vector<SYNAPSE *> synapses;
+
+	int numNeurons;
+
+	// where each group starts in the compiled arrays
+	int firstHidden;
+
+	int firstMotor;
+
+	int firstBias;
+
+	int firstFunction;
+
+	// the neuron of each compiled index
+	NEURON **order;
+
+	double *values;
+
+	double *previousValues;
+
+	double *taus;
 
-	int    numNeurons;
+	double *alphas;
 
-        SYNAPSE **synapses;
+	// the synapses into the neurons before firstBias, by target; only
+	// the developing ones when the static ones are dense
+	int *rowStarts;
 
-        int    numSynapses;
+	int *sources;
+
+	double *weights;
+
+	int numDeveloping;
+
+	// the synapse and position in weights of each developing synapse
+	SYNAPSE **developing;
+
+	int *developingPositions;
+
+	int useDense;
+
+	int numDenseRows;
+
+	int *denseRows;
+
+	// [dense row][source], the static synapses summed up
+	double *denseWeights;
 
 public:
 	NEURAL_NETWORK(void);
@@ -33,14 +94,18 @@ public:
 
 	void   Add_Synapse(void);
 
+	void Compile(void);
+
 	void Update(int timeStep);
 
 private:
-	void Initialize_Neurons(void);
+	void Compile_Dense_Synapses(int *compiledIndex);
 
-	void Initialize_Synapses(void);
+	void Compile_Neurons(int *compiledIndex);
 
-	void Push_Current_Values_To_Previous_Values(void);
+	void Compile_Sparse_Synapses(int *compiledIndex, int withStatic);
+
+	void Read_Sensor_Neurons(void);
 
 	void Reset_Neuron_Values(int timeStep);
 
@@ -49,6 +114,8 @@ private:
 	void Update_Synapses(int timeStep);
 
 	void Update_Neurons(void);
+
+	void Write_Back_Neurons(void);
 };
 
 #endif
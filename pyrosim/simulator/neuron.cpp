@@ -36,6 +36,12 @@ NEURON::NEURON(int myID, double *tv){
 
 NEURON::~NEURON(void) {
 
+	delete [] timeValues;
+}
+
+double NEURON::Get_Alpha(void) {
+
+	return alpha;
 }
 
 int  NEURON::Get_ID(void) {
@@ -68,6 +74,11 @@ double NEURON::Get_Tau(void) {
 	return tau;
 }
 
+double *NEURON::Get_Time_Values(void) {
+
+	return timeValues;
+}
+
 double NEURON::Get_Value(void) {
 
 	return value;
@@ -138,7 +149,7 @@ void NEURON::Initialize(int myID, int neuronType, double t, double a) {
 
 	previousValue = 0.0;
 
-	//timeValues = NULL;
+	timeValues = NULL;
 
 }
 
@@ -29,12 +29,16 @@ public:
 
 	~NEURON(void);
 
+	double Get_Alpha(void);
+
 	int Get_ID(void);
 
 	double Get_Previous_Value(void);
 
 	double Get_Tau(void);
 
+	double *Get_Time_Values(void);
+
 	double Get_Value(void);
 
 	int Get_Sensor_Value_Index(void);
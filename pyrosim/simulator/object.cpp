@@ -3,7 +3,9 @@
 
 #include "constants.h"
 #include "object.h"
+#include "pythonInput.h"
 #include "iostream"
+#ifndef HEADLESS
 #include <drawstuff/drawstuff.h>
 #include "texturepath.h"
 
@@ -15,12 +17,16 @@
 #define dsDrawCylinder dsDrawCylinderD
 #define dsDrawCapsule dsDrawCapsuleD
 #endif
+#endif
 
 
 OBJECT::OBJECT(void) {
 
 	ID = 0;
 
+	body = NULL;
+	isStatic = false;
+
 	raySensor = NULL;
 	lightSensor = NULL;
 	positionSensor = NULL;
@@ -32,6 +38,12 @@ OBJECT::OBJECT(void) {
 
 OBJECT::~OBJECT(void) {
 
+	delete raySensor;
+	delete lightSensor;
+	delete positionSensor;
+	delete touchSensor;
+	delete vestibularSensor;
+	delete isSeenSensor;
 }
 
 void OBJECT::Add_External_Force(float x, float y, float z, int timeStep){
@@ -42,10 +54,10 @@ void OBJECT::Add_External_Force(float x, float y, float z, int timeStep){
 
 void OBJECT::Read_In_External_Force(void){
     int xPos,yPos,zPos,time;
-    std::cin >> x;
-    std::cin >> y;
-    std::cin >> z;
-    std::cin >> time;
+    pythonInput >> x;
+    pythonInput >> y;
+    pythonInput >> z;
+    pythonInput >> time;
     Add_External_Force(x,y,z,time);
 }
 void OBJECT::Apply_Stored_Forces(int timeStep){
@@ -90,39 +102,46 @@ int OBJECT::Connect_Sensor_To_Sensor_Neuron(int sensorID , NEURON *sensorNeuron)
     return false;
  }
 
-void OBJECT::Create_IsSeen_Sensor(int myID, int evalPeriod){
-    isSeenSensor = new IS_SEEN_SENSOR(myID, evalPeriod);
+IS_SEEN_SENSOR *OBJECT::Create_IsSeen_Sensor(int myID, int recordingPeriod, int recordEvery){
+    isSeenSensor = new IS_SEEN_SENSOR(myID, recordingPeriod,recordEvery);
+    return isSeenSensor;
 }
 
-void OBJECT::Create_Ray_Sensor(dSpaceID space, int myID, int evalPeriod) {
-	raySensor = new RAY_SENSOR(space,this,myID,evalPeriod);
+RAY_SENSOR *OBJECT::Create_Ray_Sensor(dSpaceID space, int myID, int recordingPeriod) {
+	raySensor = new RAY_SENSOR(space,this,myID,recordingPeriod);
+	return raySensor;
 }
 
-void OBJECT::Create_Light_Sensor(int myID, int evalPeriod) {
-    lightSensor = new LIGHT_SENSOR(myID,evalPeriod);
+LIGHT_SENSOR *OBJECT::Create_Light_Sensor(int myID, int recordingPeriod, int recordEvery, int sumSources) {
+    lightSensor = new LIGHT_SENSOR(geom,myID,recordingPeriod,recordEvery,sumSources);
+    return lightSensor;
 }
 
 void OBJECT::Create_Light_Source(void) {
 	containsLightSource = true;
 }
 
-void OBJECT::Create_Position_Sensor(int myID, int evalPeriod) {
-	positionSensor = new POSITION_SENSOR(myID,evalPeriod);
+POSITION_SENSOR *OBJECT::Create_Position_Sensor(int myID, int recordingPeriod, int recordEvery) {
+	positionSensor = new POSITION_SENSOR(geom,myID,recordingPeriod,recordEvery);
+	return positionSensor;
 }
 
-void OBJECT::Create_Touch_Sensor(int myID, int evalPeriod) {
-	touchSensor = new TOUCH_SENSOR(myID,evalPeriod);
+TOUCH_SENSOR *OBJECT::Create_Touch_Sensor(int myID, int recordingPeriod, int recordEvery) {
+	touchSensor = new TOUCH_SENSOR(myID,recordingPeriod,recordEvery);
+	return touchSensor;
 }
 
-void OBJECT::Create_Vestibular_Sensor(int myID, int evalPeriod) {
-    vestibularSensor = new VESTIBULAR_SENSOR(myID,evalPeriod);
+VESTIBULAR_SENSOR *OBJECT::Create_Vestibular_Sensor(int myID, int recordingPeriod, int recordEvery) {
+    vestibularSensor = new VESTIBULAR_SENSOR(geom,myID,recordingPeriod,recordEvery);
+    return vestibularSensor;
 }
 
+#ifndef HEADLESS
 void OBJECT::Draw(void) {
 
     dsSetColor(r,g,b);
-    const dReal *pos = dBodyGetPosition(body);
-    const dReal *rot = dBodyGetRotation(body);
+    const dReal *pos = dGeomGetPosition(geom);
+    const dReal *rot = dGeomGetRotation(geom);
 
     // dsSetTexture (DS_WOOD);
     if (myShape == BOX){
@@ -137,10 +156,11 @@ void OBJECT::Draw(void) {
         dsDrawSphere(pos,rot,radius);
 }
 
-void OBJECT::Draw_Ray_Sensor(double x, double y, double z, int t) {
+void OBJECT::Draw_Ray_Sensor(double x, double y, double z) {
 	if ( raySensor )
-		raySensor->Draw(x,y,z,t);
+		raySensor->Draw(x,y,z);
 }
+#endif
 
 double OBJECT::Get_Blue_Component(void) {
     return b;
@@ -157,6 +177,9 @@ double OBJECT::Get_Green_Component(void) {
     return g;
 }
 
+dGeomID OBJECT::Get_Geom(void){
+    return geom;
+}
 int OBJECT::Get_Group(void){
     return collisionGroup;
 }
@@ -164,6 +187,43 @@ double OBJECT::Get_Length(void) {
 	return length;
 }
 
+void OBJECT::Get_Pose(float *pose) {
+
+	const dReal *pos = dGeomGetPosition(geom);
+
+	dQuaternion q;
+	dGeomGetQuaternion(geom,q);
+
+	for (int i=0;i<3;i++)
+		pose[i] = pos[i];
+
+	for (int i=0;i<4;i++)
+		pose[3+i] = q[i];
+}
+
+void OBJECT::Get_Pose_Log_Body(POSE_LOG_BODY *logBody) {
+
+	logBody->shape = myShape;
+
+	logBody->color[0] = r;
+	logBody->color[1] = g;
+	logBody->color[2] = b;
+
+	logBody->size[0] = logBody->size[1] = logBody->size[2] = 0.0;
+
+	if ( myShape == BOX ) {
+		logBody->size[0] = length;
+		logBody->size[1] = width;
+		logBody->size[2] = height;
+	}
+	else if ( myShape == CYLINDER or myShape == CAPSULE ) {
+		logBody->size[0] = length;
+		logBody->size[1] = radius;
+	}
+	else
+		logBody->size[0] = radius;
+}
+
 double OBJECT::Get_Radius(void) {
 	return radius;
 }
@@ -172,113 +232,97 @@ double OBJECT::Get_Red_Component(void) {
 	return r;
 }
 
-void OBJECT::Poll_Sensors(int numObjects, OBJECT **objects, int t) {
-	if ( lightSensor ) {
-		OBJECT *closestLightSource = Find_Closest_Light_Source(numObjects,objects);
-		lightSensor->Poll(body,closestLightSource->Get_Body(),t);
+void OBJECT::Read_From_Pose_Log(dSpaceID space, int myID, const POSE_LOG_BODY *logBody) {
+
+	// A replayed object only shows where the logged one was.
+
+	ID = myID;
+
+	myShape = logBody->shape;
+
+	if ( myShape == BOX ) {
+		length = logBody->size[0];
+		width = logBody->size[1];
+		height = logBody->size[2];
+	}
+	else if ( myShape == CYLINDER or myShape == CAPSULE ) {
+		length = logBody->size[0];
+		radius = logBody->size[1];
 	}
+	else
+		radius = logBody->size[0];
 
-    if ( positionSensor )
-        positionSensor->Poll(body,t);
+	r = logBody->color[0];
+	g = logBody->color[1];
+	b = logBody->color[2];
+
+	x = y = z = 0.0;
+	collisionGroup = 0;
+	isStatic = true;
 
-	if ( vestibularSensor )
-		vestibularSensor->Poll(body,t);
+	dMatrix3 R;
+	dRSetIdentity(R);
+
+	CreateStaticGeom(space, R);
 }
 
 void OBJECT::Read_From_Python(dWorldID world, dSpaceID space, int shape) {
 
 	myShape = shape;
 
-	std::cin >> ID;
+	pythonInput >> ID;
 
-	std::cin >> x;
-	std::cin >> y;
-	std::cin >> z;
-    std::cin >> r1;
-    std::cin >> r2;
-    std::cin >> r3;
+	pythonInput >> x;
+	pythonInput >> y;
+	pythonInput >> z;
+    pythonInput >> r1;
+    pythonInput >> r2;
+    pythonInput >> r3;
 	
 	if ( myShape == BOX ) {
-		std::cin >> length;
-		std::cin >> width;
-		std::cin >> height;
+		pythonInput >> length;
+		pythonInput >> width;
+		pythonInput >> height;
 	}
 	else if (myShape == CYLINDER or myShape == CAPSULE) { //cylinder specific
-		std::cin >> length; 
-        std::cin >> radius;
+		pythonInput >> length; 
+        pythonInput >> radius;
 	}
 	else { //sphere specific
-		std::cin >> radius;
+		pythonInput >> radius;
 	}
-    std::cin >> mass;
-    std::cin >> collisionGroup;
-    std::cin >> r;
-    std::cin >> g;
-    std::cin >> b;
+    pythonInput >> mass;
+    pythonInput >> collisionGroup;
+    pythonInput >> r;
+    pythonInput >> g;
+    pythonInput >> b;
+    pythonInput >> isStatic;
 
     CreateBody(world, space);
 
 }
 
-void OBJECT::Set_Ray_Sensor(double distance, OBJECT *objectThatWasHit, int t) {
-	if ( raySensor )
-		raySensor->Set(distance,objectThatWasHit,t);
-}
+void OBJECT::Set_Pose(const float *pose) {
 
-void OBJECT::Touch_Sensor_Fires(int t) {
-	if ( touchSensor )
-		touchSensor->Fires(t);
-}
+	dGeomSetPosition(geom,pose[0],pose[1],pose[2]);
 
-void OBJECT::IsSeen_Sensor_Fires(int t){
-    if ( isSeenSensor )
-        isSeenSensor->Fires(t);
+	dQuaternion q = {pose[3],pose[4],pose[5],pose[6]};
+	dGeomSetQuaternion(geom,q);
 }
 
-void OBJECT::Update_Sensor_Neurons(int t) {
-    if ( raySensor )
-        raySensor->Update_Sensor_Neurons(t);
-
-    if ( lightSensor )
-        lightSensor->Update_Sensor_Neurons(t);
-
-    if ( positionSensor )
-        positionSensor->Update_Sensor_Neurons(t);
-
-    if ( touchSensor )
-        touchSensor->Update_Sensor_Neurons(t);
-
-    if ( vestibularSensor )
-        vestibularSensor->Update_Sensor_Neurons(t);
+void OBJECT::Set_Ray_Sensor(double distance, OBJECT *objectThatWasHit) {
+	if ( raySensor )
+		raySensor->Set(distance,objectThatWasHit);
 }
 
-void OBJECT::Write_To_Python(int evalPeriod) {
-    std::cerr << "writing sensors in body " << this->Get_ID() << " to python " << std::endl;
-	if ( raySensor ){
-        std::cerr << "  writing ray sensor to python "  << std::endl;
-		raySensor->Write_To_Python(evalPeriod);
-    }
+void OBJECT::Touch_Sensor_Fires(void) {
+	if ( touchSensor )
+		touchSensor->Fires();
+}
 
-	if ( lightSensor ){
-		lightSensor->Write_To_Python(evalPeriod);
-        std::cerr << "  writing light sensor to python "  << std::endl;
-    }
-	if ( positionSensor ){
-        std::cerr << "  writing position sensor to python "  << std::endl;
-		positionSensor->Write_To_Python(evalPeriod);
-    }
-	if ( touchSensor ){
-        std::cerr << "  writing touch sensor to python "  << std::endl;
-		touchSensor->Write_To_Python(evalPeriod);
-    }
-    if ( vestibularSensor ){
-        std::cerr << "  writing vestib sensor to python "  << std::endl;
-        vestibularSensor->Write_To_Python(evalPeriod);
-    }
-    if ( isSeenSensor ){
-        std::cerr << "  writing is seen sensor to python "  << std::endl;
-        isSeenSensor->Write_To_Python(evalPeriod);
-    }
+void OBJECT::IsSeen_Sensor_Fires(void){
+    if ( isSeenSensor )
+        isSeenSensor->Fires();
 }
 
 // ------------------------------- Private methods ------------------------------
@@ -292,11 +336,17 @@ void OBJECT::CreateBody(dWorldID world, dSpaceID space){
 
     dMass m;
 
+    dMatrix3 R;
+    dRFromZAxis(R,r1,r2,r3);
+
+    if ( isStatic ) {
+        CreateStaticGeom(space, R);
+        return;
+    }
+
     body = dBodyCreate (world);
     dBodySetPosition (body,x,y,z);
 
-    dMatrix3 R;
-    dRFromZAxis(R,r1,r2,r3);
     dBodySetRotation(body,R);
 
     if(myShape == BOX){
@@ -324,34 +374,25 @@ void OBJECT::CreateBody(dWorldID world, dSpaceID space){
 
 }
 
-double OBJECT::Distance_To(OBJECT *otherObject) {
-	const dReal *myPos = dBodyGetPosition( body );
-	const dReal *hisPos = dBodyGetPosition( otherObject->Get_Body() );
-
-	double xDiff = myPos[0] - hisPos[0];
-    double yDiff = myPos[1] - hisPos[1];
-    double zDiff = myPos[2] - hisPos[2];
-
-	return sqrt( pow(xDiff,2.0) + pow(yDiff,2.0) + pow(zDiff,2.0) );
-}
+void OBJECT::CreateStaticGeom(dSpaceID space, dMatrix3 R){
 
+    // Without a body the geom adds nothing to the solver; contacts
+    // with it attach to the static environment.
 
-OBJECT* OBJECT::Find_Closest_Light_Source(int numObjects, OBJECT **objects) {
+    if(myShape == BOX)
+        geom = dCreateBox(space,length,width,height);
+    else if(myShape == CAPSULE)
+        geom = dCreateCapsule(space,radius,length);
+    else if(myShape == CYLINDER)
+        geom = dCreateCylinder(space,radius,length);
+    else if(myShape == SPHERE)
+        geom = dCreateSphere(space,radius);
 
-	double distance = 10000.0;
-	int    closestLightSource = 0;
+    dGeomSetPosition(geom,x,y,z);
 
-	for (int i=0;i<numObjects;i++){
-		if ( objects[i]->Contains_A_Light_Source() ) {
-			double distanceToObject = Distance_To(objects[i]);
-			if ( distanceToObject < distance ) {
-				distance = distanceToObject;
-				closestLightSource = i;
-			}
-		}
-    }
+    dGeomSetRotation(geom,R);
 
-	return objects[closestLightSource];
+    dGeomSetData(geom,this);
 }
 
 #endif
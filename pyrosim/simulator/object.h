@@ -8,6 +8,7 @@
 #include "touchSensor.h"
 #include "vestibularSensor.h"
 #include "isSeenSensor.h"
+#include "poseLog.h"
 #include <map>
 #include <utility>
 #include <array>
@@ -41,6 +42,9 @@ private:
 
 	double r,g,b;
 
+	// a static object is a geom without a body: it collides but does not move
+	int isStatic;
+
 	LIGHT_SENSOR *lightSensor;
 	POSITION_SENSOR *positionSensor;
 	RAY_SENSOR *raySensor;
@@ -62,54 +66,61 @@ public:
 
 	int  Connect_Sensor_To_Sensor_Neuron(int sensorID , NEURON *sensorNeuron);
 
-	void Create_IsSeen_Sensor(int myID, int evalPeriod);
+	int  Contains_A_Light_Source(void);
+
+	IS_SEEN_SENSOR *Create_IsSeen_Sensor(int myID, int recordingPeriod, int recordEvery);
 
-	void Create_Ray_Sensor(dSpaceID space, int myID, int evalPeriod);
+	RAY_SENSOR *Create_Ray_Sensor(dSpaceID space, int myID, int recordingPeriod);
 
-	void Create_Light_Sensor(int myID, int evalPeriod);
+	LIGHT_SENSOR *Create_Light_Sensor(int myID, int recordingPeriod, int recordEvery, int sumSources);
 
 	void Create_Light_Source(void);
 
-	void Create_Position_Sensor(int myID, int evalPeriod);
+	POSITION_SENSOR *Create_Position_Sensor(int myID, int recordingPeriod, int recordEvery);
 
-	void Create_Touch_Sensor(int myID, int evalPeriod);
+	TOUCH_SENSOR *Create_Touch_Sensor(int myID, int recordingPeriod, int recordEvery);
 
-    void Create_Vestibular_Sensor(int myID, int evalPeriod);
+    VESTIBULAR_SENSOR *Create_Vestibular_Sensor(int myID, int recordingPeriod, int recordEvery);
 
+#ifndef HEADLESS
 	void Draw(void);
-	void Draw_Ray_Sensor(double x, double y, double z, int t);
+	void Draw_Ray_Sensor(double x, double y, double z);
+#endif
 
 	double Get_Blue_Component(void);
 	dBodyID Get_Body(void);
 	double Get_Green_Component(void);
 
+    dGeomID Get_Geom(void);
     int Get_Group(void);
     int Get_ID(void);
     
 	double Get_Length(void);
+
+	void Get_Pose(float *pose);
+	void Get_Pose_Log_Body(POSE_LOG_BODY *logBody);
+
 	double Get_Radius(void);
 
 	double Get_Red_Component(void);
 
-    void Poll_Sensors(int numObjects, OBJECT **objects, int t);
-
     void Read_In_External_Force(void);
+	void Read_From_Pose_Log(dSpaceID space, int myID, const POSE_LOG_BODY *logBody);
 	void Read_From_Python(dWorldID world, dSpaceID space, int shape);
-	void Set_Ray_Sensor(double distance,OBJECT *objectThatWasHit, int t);
 
-	void Touch_Sensor_Fires(int t);
+	void Set_Pose(const float *pose);
+
+	void Set_Ray_Sensor(double distance,OBJECT *objectThatWasHit);
 
-	void IsSeen_Sensor_Fires(int t);
-	void Update_Sensor_Neurons(int t);
+	void Touch_Sensor_Fires(void);
 
-	void Write_To_Python(int evalPeriod);
+	void IsSeen_Sensor_Fires(void);
 
 private:
-	int  Contains_A_Light_Source(void);
-	double Distance_To(OBJECT *otherObject);
 	void CreateBody(dWorldID world, dSpaceID space);
 
-	OBJECT *Find_Closest_Light_Source(int numObjects, OBJECT **objects);
+	void CreateStaticGeom(dSpaceID space, dMatrix3 R);
+
 
 };
 
@@ -0,0 +1,192 @@
+#ifndef _OFFSCREEN_CPP
+#define _OFFSCREEN_CPP
+
+// An offscreen platform for drawstuff, built into simulator-offscreen
+// instead of drawstuff's X11 window (make offscreen). It draws into an
+// EGL pbuffer, so scenes can be drawn and captured on nodes without a
+// display; without a GPU, Mesa renders with llvmpipe. The simulation
+// loop draws frame after frame until the simulator terminates.
+
+#include <cstdio>
+#include <cstdlib>
+#include <cstdarg>
+#include <cstring>
+#include <sys/time.h>
+
+#include <EGL/egl.h>
+#include <EGL/eglext.h>
+
+#include <drawstuff/drawstuff.h>
+
+// supplied by drawstuff, see ode-0.12/drawstuff/src/internal.h
+void dsStartGraphics (int width, int height, dsFunctions *fn);
+void dsDrawFrame (int width, int height, dsFunctions *fn, int pause);
+void dsStopGraphics();
+
+static int running = 1;
+
+static void Print_Message(const char *kind, const char *msg, va_list ap) {
+
+	fprintf(stderr,"%s: ",kind);
+
+	vfprintf(stderr,msg,ap);
+
+	fprintf(stderr,"\n");
+
+	fflush(stderr);
+}
+
+extern "C" void dsError(const char *msg, ...) {
+
+	va_list ap;
+
+	va_start(ap,msg);
+
+	Print_Message("Error",msg,ap);
+
+	va_end(ap);
+
+	exit(1);
+}
+
+extern "C" void dsDebug(const char *msg, ...) {
+
+	va_list ap;
+
+	va_start(ap,msg);
+
+	Print_Message("INTERNAL ERROR",msg,ap);
+
+	va_end(ap);
+
+	abort();
+}
+
+extern "C" void dsPrint(const char *msg, ...) {
+
+	va_list ap;
+
+	va_start(ap,msg);
+
+	vfprintf(stderr,msg,ap);
+
+	va_end(ap);
+}
+
+extern "C" void dsStop(void) {
+
+	running = 0;
+}
+
+extern "C" double dsElapsedTime(void) {
+
+	static double previous = -1;
+
+	struct timeval now;
+
+	gettimeofday(&now,NULL);
+
+	double current = now.tv_sec + now.tv_usec * 1e-6;
+
+	double elapsed = (previous < 0) ? 0.0 : current - previous;
+
+	previous = current;
+
+	return elapsed;
+}
+
+static EGLDisplay Open_Display(void) {
+
+	// Mesa's surfaceless platform needs neither a display nor a GPU.
+
+#ifdef EGL_PLATFORM_SURFACELESS_MESA
+	PFNEGLGETPLATFORMDISPLAYEXTPROC getPlatformDisplay =
+		(PFNEGLGETPLATFORMDISPLAYEXTPROC)eglGetProcAddress("eglGetPlatformDisplayEXT");
+
+	if ( getPlatformDisplay ) {
+
+		EGLDisplay display = getPlatformDisplay(EGL_PLATFORM_SURFACELESS_MESA,EGL_DEFAULT_DISPLAY,NULL);
+
+		if ( display != EGL_NO_DISPLAY && eglInitialize(display,NULL,NULL) )
+
+			return display;
+	}
+#endif
+
+	EGLDisplay display = eglGetDisplay(EGL_DEFAULT_DISPLAY);
+
+	if ( display == EGL_NO_DISPLAY || !eglInitialize(display,NULL,NULL) )
+
+		dsError("can not open an EGL display");
+
+	return display;
+}
+
+void dsPlatformSimLoop(int window_width, int window_height, dsFunctions *fn, int initial_pause) {
+
+	EGLDisplay display = Open_Display();
+
+	EGLint configAttributes[] = {
+		EGL_SURFACE_TYPE, EGL_PBUFFER_BIT,
+		EGL_RED_SIZE, 8, EGL_GREEN_SIZE, 8, EGL_BLUE_SIZE, 8,
+		EGL_DEPTH_SIZE, 16,
+		EGL_RENDERABLE_TYPE, EGL_OPENGL_BIT,
+		EGL_NONE };
+
+	EGLConfig config;
+
+	EGLint numConfigs = 0;
+
+	if ( !eglChooseConfig(display,configAttributes,&config,1,&numConfigs) || numConfigs == 0 )
+
+		dsError("no EGL config for offscreen OpenGL");
+
+	EGLint surfaceAttributes[] = {
+		EGL_WIDTH, window_width,
+		EGL_HEIGHT, window_height,
+		EGL_NONE };
+
+	EGLSurface surface = eglCreatePbufferSurface(display,config,surfaceAttributes);
+
+	if ( surface == EGL_NO_SURFACE )
+
+		dsError("can not create an offscreen surface of %dx%d",window_width,window_height);
+
+	// drawstuff draws with the fixed function pipeline of desktop GL
+
+	eglBindAPI(EGL_OPENGL_API);
+
+	EGLContext context = eglCreateContext(display,config,EGL_NO_CONTEXT,NULL);
+
+	if ( context == EGL_NO_CONTEXT || !eglMakeCurrent(display,surface,surface,context) )
+
+		dsError("can not create an offscreen OpenGL context");
+
+	dsStartGraphics(window_width,window_height,fn);
+
+	if ( fn->start )
+
+		fn->start();
+
+	// Nobody can unpause an offscreen run, so it never starts paused.
+
+	while ( running )
+
+		dsDrawFrame(window_width,window_height,fn,0);
+
+	if ( fn->stop )
+
+		fn->stop();
+
+	dsStopGraphics();
+
+	eglMakeCurrent(display,EGL_NO_SURFACE,EGL_NO_SURFACE,EGL_NO_CONTEXT);
+
+	eglDestroyContext(display,context);
+
+	eglDestroySurface(display,surface);
+
+	eglTerminate(display);
+}
+
+#endif
@@ -0,0 +1,179 @@
+#ifndef _POSE_LOG_CPP
+#define _POSE_LOG_CPP
+
+#include "poseLog.h"
+
+#include <cstdlib>
+#include <cstring>
+#include <iostream>
+
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#include "environment.h"
+
+POSE_LOG_WRITER::POSE_LOG_WRITER(const char *fileName, ENVIRONMENT *environment, double dt, int every) {
+
+	logEvery = every;
+
+	file = fopen(fileName,"wb");
+
+	if ( file == NULL ) {
+
+		std::cerr << "Can not write the pose log " << fileName << std::endl;
+
+		exit(1);
+	}
+
+	int numBodies = environment->Get_Number_Of_Bodies();
+
+	POSE_LOG_HEADER header;
+
+	memset(&header,0,sizeof(header));
+
+	memcpy(header.magic,POSE_LOG_MAGIC,sizeof(header.magic));
+
+	header.version = POSE_LOG_VERSION;
+
+	header.numBodies = numBodies;
+
+	header.logEvery = logEvery;
+
+	header.dt = dt;
+
+	fwrite(&header,sizeof(header),1,file);
+
+	std::vector<POSE_LOG_BODY> bodies(numBodies);
+
+	environment->Get_Pose_Log_Bodies(bodies.data());
+
+	fwrite(bodies.data(),sizeof(POSE_LOG_BODY),numBodies,file);
+
+	frame.resize(numBodies * POSE_SIZE);
+
+	// where the bodies start
+
+	Write_Frame(environment);
+}
+
+POSE_LOG_WRITER::~POSE_LOG_WRITER(void) {
+
+	fclose(file);
+}
+
+void POSE_LOG_WRITER::Record(ENVIRONMENT *environment, int timeStep) {
+
+	if ( timeStep % logEvery == 0 )
+
+		Write_Frame(environment);
+}
+
+// ----------------------- Private methods ---------------------------
+
+void POSE_LOG_WRITER::Write_Frame(ENVIRONMENT *environment) {
+
+	environment->Get_Poses(frame.data());
+
+	fwrite(frame.data(),sizeof(float),frame.size(),file);
+}
+
+// -------------------------------------------------------------------
+
+POSE_LOG_READER::POSE_LOG_READER(const char *fileName) {
+
+	int fd = open(fileName,O_RDONLY);
+
+	struct stat status;
+
+	if ( fd < 0 || fstat(fd,&status) != 0 ) {
+
+		std::cerr << "Can not read the pose log " << fileName << std::endl;
+
+		exit(1);
+	}
+
+	fileSize = status.st_size;
+
+	if ( fileSize < sizeof(POSE_LOG_HEADER) ) {
+
+		std::cerr << fileName << " is not a pose log" << std::endl;
+
+		exit(1);
+	}
+
+	void *mapped = mmap(NULL,fileSize,PROT_READ,MAP_PRIVATE,fd,0);
+
+	// the mapping stays valid without the file descriptor
+
+	close(fd);
+
+	if ( mapped == MAP_FAILED ) {
+
+		std::cerr << "Can not map the pose log " << fileName << std::endl;
+
+		exit(1);
+	}
+
+	contents = (const char *)mapped;
+
+	header = (const POSE_LOG_HEADER *)contents;
+
+	size_t framesStart = sizeof(POSE_LOG_HEADER) + header->numBodies * sizeof(POSE_LOG_BODY);
+
+	if ( memcmp(header->magic,POSE_LOG_MAGIC,sizeof(header->magic)) != 0 ||
+	     header->version != POSE_LOG_VERSION ||
+	     header->numBodies < 0 || header->logEvery <= 0 ||
+	     framesStart > fileSize ) {
+
+		std::cerr << fileName << " is not a pose log" << std::endl;
+
+		exit(1);
+	}
+
+	bodies = (const POSE_LOG_BODY *)(contents + sizeof(POSE_LOG_HEADER));
+
+	frames = (const float *)(contents + framesStart);
+
+	size_t frameSize = header->numBodies * POSE_SIZE * sizeof(float);
+
+	numFrames = (frameSize > 0) ? (fileSize - framesStart) / frameSize : 0;
+}
+
+POSE_LOG_READER::~POSE_LOG_READER(void) {
+
+	munmap((void *)contents,fileSize);
+}
+
+const POSE_LOG_BODY *POSE_LOG_READER::Get_Body(int bodyID) {
+
+	return bodies + bodyID;
+}
+
+const float *POSE_LOG_READER::Get_Frame(int frameIndex) {
+
+	return frames + frameIndex * header->numBodies * POSE_SIZE;
+}
+
+int POSE_LOG_READER::Get_Log_Every(void) {
+
+	return header->logEvery;
+}
+
+int POSE_LOG_READER::Get_Number_Of_Bodies(void) {
+
+	return header->numBodies;
+}
+
+int POSE_LOG_READER::Get_Number_Of_Frames(void) {
+
+	return numFrames;
+}
+
+double POSE_LOG_READER::Get_Time_Interval(void) {
+
+	return header->dt;
+}
+
+#endif
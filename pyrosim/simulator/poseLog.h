@@ -0,0 +1,107 @@
+#ifndef _POSE_LOG_H
+#define _POSE_LOG_H
+
+#include <cstdio>
+#include <vector>
+
+// A pose log holds the position and orientation of every body of a run
+// every logEvery time steps, so the run can be drawn again without being
+// simulated. The file is little-endian and laid out to be memory mapped:
+// a POSE_LOG_HEADER, a POSE_LOG_BODY for each body and then one frame
+// per logged time step, the first holding the poses the bodies start in.
+// A frame is
+//
+//      [body][x, y, z, qw, qx, qy, qz]
+//
+// as float32. The number of frames follows from the size of the file, so
+// a run that stopped early leaves a log of the steps it took.
+
+const char POSE_LOG_MAGIC[8] = {'P','Y','R','O','P','O','S','E'};
+
+const int POSE_LOG_VERSION = 1;
+
+const int POSE_SIZE = 7;
+
+struct POSE_LOG_HEADER {
+
+	char magic[8];
+
+	int version;
+
+	int numBodies;
+
+	int logEvery;
+
+	int unused;
+
+	double dt;
+};
+
+// size holds length, width and height of a box, length and radius of a
+// cylinder or capsule and the radius of a sphere; the rest is zero
+struct POSE_LOG_BODY {
+
+	int shape;
+
+	float color[3];
+
+	double size[3];
+};
+
+class ENVIRONMENT;
+
+class POSE_LOG_WRITER {
+
+private:
+	FILE *file;
+
+	int logEvery;
+
+	std::vector<float> frame;
+
+public:
+	POSE_LOG_WRITER(const char *fileName, ENVIRONMENT *environment, double dt, int every);
+
+	~POSE_LOG_WRITER(void);
+
+	void Record(ENVIRONMENT *environment, int timeStep);
+
+private:
+	void Write_Frame(ENVIRONMENT *environment);
+};
+
+class POSE_LOG_READER {
+
+private:
+	// the whole file, mapped
+	const char *contents;
+
+	size_t fileSize;
+
+	const POSE_LOG_HEADER *header;
+
+	const POSE_LOG_BODY *bodies;
+
+	const float *frames;
+
+	int numFrames;
+
+public:
+	POSE_LOG_READER(const char *fileName);
+
+	~POSE_LOG_READER(void);
+
+	const POSE_LOG_BODY *Get_Body(int bodyID);
+
+	const float *Get_Frame(int frameIndex);
+
+	int Get_Log_Every(void);
+
+	int Get_Number_Of_Bodies(void);
+
+	int Get_Number_Of_Frames(void);
+
+	double Get_Time_Interval(void);
+};
+
+#endif
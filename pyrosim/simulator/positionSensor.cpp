@@ -5,15 +5,17 @@
 #include "positionSensor.h"
 #include "neuron.h"
 
-POSITION_SENSOR::POSITION_SENSOR(int myID, int evalPeriod) {
+POSITION_SENSOR::POSITION_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery) {
 
 	ID = myID;
 
-	x = new double[evalPeriod];
+	geom = myGeom;
 
-	y = new double[evalPeriod];
+	for ( int i = 0 ; i < 3 ; i++)
+
+		position[i] = 0.0;
 
-	z = new double[evalPeriod];
+	recorder = new RECORDER(3,recordingPeriod,recordEvery);
 
 	for ( int i = 0 ; i < 3 ; i++)
 
@@ -22,6 +24,7 @@ POSITION_SENSOR::POSITION_SENSOR(int myID, int evalPeriod) {
 
 POSITION_SENSOR::~POSITION_SENSOR(void) {
 
+	delete recorder;
 }
 
 void POSITION_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
@@ -34,49 +37,37 @@ int  POSITION_SENSOR::Get_ID(void) {
         return ID;
 }
 
-void POSITION_SENSOR::Poll(dBodyID body, int t) {
-
-        const dReal *pos;
-
-        pos = dBodyGetPosition(body);
+RECORDER *POSITION_SENSOR::Get_Recorder(void) {
 
-
-	x[t] = pos[0];
-
-	y[t] = pos[1];
-
-	z[t] = pos[2];
+        return recorder;
 }
 
-void POSITION_SENSOR::Update_Sensor_Neurons(int t) {
+void POSITION_SENSOR::Poll(void) {
 
-        if ( mySensorNeurons[0] )
+        const dReal *pos;
 
-                mySensorNeurons[0]->Set( x[t] );
+        pos = dGeomGetPosition(geom);
 
-        if ( mySensorNeurons[1] )
 
-                mySensorNeurons[1]->Set( y[t] );
+	position[0] = pos[0];
 
-        if ( mySensorNeurons[2] )
+	position[1] = pos[1];
 
-                mySensorNeurons[2]->Set( z[t] );
+	position[2] = pos[2];
 }
 
-void POSITION_SENSOR::Write_To_Python(int evalPeriod) {
+void POSITION_SENSOR::Record(int t) {
 
-        char outString[1000000];
+        recorder->Store(position,t);
+}
 
-        sprintf(outString,"%d %d ",ID,3);
+void POSITION_SENSOR::Update_Sensor_Neurons(void) {
 
-        for ( int  t = 0 ; t < evalPeriod ; t++ ) {
-                sprintf(outString,"%s %f %f %f ",outString,x[t],y[t],z[t]);
-        }
+        for ( int i = 0 ; i < 3 ; i++ )
 
-        sprintf(outString,"%s \n",outString);
+                if ( mySensorNeurons[i] )
 
-        std::cout << outString;
-        
+                        mySensorNeurons[i]->Set( position[i] );
 }
 
 #endif
@@ -2,6 +2,7 @@
 #define _POSITION_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class NEURON;
 
@@ -11,12 +12,16 @@ private:
 
 	int ID;
 
-	double *x, *y, *z;
+	dGeomID geom;
+
+	double position[3];
+
+	RECORDER *recorder;
 
         NEURON* mySensorNeurons[3];
 
 public:
-	POSITION_SENSOR(int myID, int evalPeriod);
+	POSITION_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery);
 
 	~POSITION_SENSOR(void);
 
@@ -24,11 +29,14 @@ public:
 
         int  Get_ID(void);
 
-	void Poll(dBodyID body, int t);
+        RECORDER *Get_Recorder(void);
+
+	void Poll(void);
+
+        void Record(int t);
 
-        void Update_Sensor_Neurons(int t);
+        void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
@@ -11,17 +11,24 @@ extern int HINGE;
 extern int SLIDER;
 extern int THRUSTER;
 
-PROPRIOCEPTIVE_SENSOR::PROPRIOCEPTIVE_SENSOR(int myID, int evalPeriod) {
+PROPRIOCEPTIVE_SENSOR::PROPRIOCEPTIVE_SENSOR(dJointID myJoint, int jointType, int myID, int recordingPeriod, int recordEvery) {
 
 	ID = myID;
 
-	angles = new double[evalPeriod];
+	joint = myJoint;
+
+	type = jointType;
+
+	angle = 0.0;
+
+	recorder = new RECORDER(1,recordingPeriod,recordEvery);
 
         mySensorNeuron = NULL;
 }
 
 PROPRIOCEPTIVE_SENSOR::~PROPRIOCEPTIVE_SENSOR(void) {
 
+	delete recorder;
 }
 
 void PROPRIOCEPTIVE_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
@@ -34,36 +41,29 @@ int  PROPRIOCEPTIVE_SENSOR::Get_ID(void) {
         return ID;
 }
 
-void PROPRIOCEPTIVE_SENSOR::Poll(dJointID joint, int type, int t) {
+RECORDER *PROPRIOCEPTIVE_SENSOR::Get_Recorder(void) {
 
-        const dReal *pos;
+        return recorder;
+}
+
+void PROPRIOCEPTIVE_SENSOR::Poll(void) {
 
         if(type==HINGE)
-                angles[t] = dJointGetHingeAngle(joint);
+                angle = dJointGetHingeAngle(joint);
         else if(type==SLIDER)
-                angles[t] = dJointGetSliderPosition(joint);
+                angle = dJointGetSliderPosition(joint);
 
 }
 
-void PROPRIOCEPTIVE_SENSOR::Update_Sensor_Neurons(int t) {
+void PROPRIOCEPTIVE_SENSOR::Record(int t) {
 
-        if ( mySensorNeuron )
-                mySensorNeuron->Set( angles[t] );
+        recorder->Store(&angle,t);
 }
 
-void PROPRIOCEPTIVE_SENSOR::Write_To_Python(int evalPeriod) {
+void PROPRIOCEPTIVE_SENSOR::Update_Sensor_Neurons(void) {
 
-        char outString[1000000];
-
-        sprintf(outString,"%d %d ",ID,1);
-
-        for ( int  t = 0 ; t < evalPeriod ; t++ ) 
-
-                sprintf(outString,"%s %f ",outString,angles[t]);
-
-        sprintf(outString,"%s \n",outString);
-
-        std::cout << outString;
+        if ( mySensorNeuron )
+                mySensorNeuron->Set( angle );
 }
 
 #endif
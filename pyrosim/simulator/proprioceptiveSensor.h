@@ -2,6 +2,7 @@
 #define _PROPRIOCEPTIVE_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class NEURON;
 
@@ -11,12 +12,18 @@ private:
 
 	int ID;
 
-	double *angles; 
+	dJointID joint;
+
+	int type;
+
+	double angle; 
+
+	RECORDER *recorder;
 
         NEURON *mySensorNeuron;
 
 public:
-	PROPRIOCEPTIVE_SENSOR(int myID, int evalPeriod);
+	PROPRIOCEPTIVE_SENSOR(dJointID myJoint, int jointType, int myID, int recordingPeriod, int recordEvery);
 
 	~PROPRIOCEPTIVE_SENSOR(void);
 
@@ -24,11 +31,14 @@ public:
 
         int  Get_ID(void);
 
-	void Poll(dJointID joint, int type, int t);
+        RECORDER *Get_Recorder(void);
+
+	void Poll(void);
+
+        void Record(int t);
 
-        void Update_Sensor_Neurons(int t);
+        void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
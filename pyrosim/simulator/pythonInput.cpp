@@ -0,0 +1,261 @@
+#ifndef _PYTHON_INPUT_CPP
+#define _PYTHON_INPUT_CPP
+
+#include "iostream"
+#include "stdlib.h"
+#include "string.h"
+#include "pythonInput.h"
+
+const char *COMMAND_NAMES[NUMBER_OF_COMMANDS] = {
+
+	"Done",
+	"Binary",
+
+	"EvaluationTime",
+	"TimeInterval",
+	"Substeps",
+	"Gravity",
+	"Solver",
+	"TexturePath",
+	"Debug",
+	"WindowSize",
+	"Camera",
+	"FollowBody",
+	"TrackBody",
+	"Render",
+	"Capture",
+	"CaptureStream",
+	"PoseLog",
+	"StreamChunk",
+	"BatchSize",
+	"CollisionSpace",
+	"CollisionMatrix",
+
+	"ExternalForce",
+
+	"Box",
+	"Cylinder",
+	"Capsule",
+	"Sphere",
+
+	"HingeJoint",
+	"SliderJoint",
+	"Thruster",
+
+	"IsSeenSensor",
+	"PositionSensor",
+	"TouchSensor",
+	"RaySensor",
+	"ProprioceptiveSensor",
+	"LightSensor",
+	"VestibularSensor",
+	"LightSource",
+
+	"BiasNeuron",
+	"SensorNeuron",
+	"HiddenNeuron",
+	"MotorNeuron",
+	"FunctionNeuron",
+
+	"Synapse",
+
+	"StopCondition"
+};
+
+const char *Command_Name(int command) {
+
+	if ( (command < 0) || (command >= NUMBER_OF_COMMANDS) )
+
+		return "Unknown";
+
+	return COMMAND_NAMES[command];
+}
+
+PYTHON_INPUT::PYTHON_INPUT(void) {
+
+	binary = false;
+
+	payload = NULL;
+
+	payloadSize = 0;
+
+	payloadCapacity = 0;
+
+	position = 0;
+}
+
+PYTHON_INPUT::~PYTHON_INPUT(void) {
+
+	delete [] payload;
+}
+
+int PYTHON_INPUT::End_Of_Input(void) {
+
+	return !std::cin.good();
+}
+
+int PYTHON_INPUT::Read_Command(void) {
+
+	if ( binary ) {
+
+		int header[2];
+
+		if ( !std::cin.read( (char *)header, sizeof(header) ) )
+
+			return DONE_COMMAND;
+
+		Read_Payload(header[1]);
+
+		if ( header[0] == DONE_COMMAND )
+
+			binary = false;
+
+		return header[0];
+	}
+
+	char incomingString[10000];
+
+	if ( !(std::cin >> incomingString) )
+
+		return DONE_COMMAND;
+
+	int command = Find_Command(incomingString);
+
+	if ( command == BINARY_COMMAND ) {
+
+		// Skip the newline, the packed commands start right after it.
+
+		std::cin.get();
+
+		binary = true;
+
+		return Read_Command();
+	}
+
+	return command;
+}
+
+PYTHON_INPUT& PYTHON_INPUT::operator>>(int &value) {
+
+	if ( binary )
+
+		Take_From_Payload(&value, sizeof(int));
+	else
+		std::cin >> value;
+
+	return *this;
+}
+
+PYTHON_INPUT& PYTHON_INPUT::operator>>(double &value) {
+
+	if ( binary )
+
+		Take_From_Payload(&value, sizeof(double));
+	else
+		std::cin >> value;
+
+	return *this;
+}
+
+PYTHON_INPUT& PYTHON_INPUT::operator>>(float &value) {
+
+	if ( binary ) {
+
+		double packedValue;
+
+		Take_From_Payload(&packedValue, sizeof(double));
+
+		value = packedValue;
+	}
+	else
+		std::cin >> value;
+
+	return *this;
+}
+
+PYTHON_INPUT& PYTHON_INPUT::operator>>(std::string &value) {
+
+	if ( binary ) {
+
+		int length;
+
+		Take_From_Payload(&length, sizeof(int));
+
+		if ( length < 0 ) {
+
+			std::cerr << "Command from python has a string of negative length" << std::endl;
+
+			exit(1);
+		}
+
+		value.resize(length);
+
+		if ( length > 0 )
+
+			Take_From_Payload(&value[0], length);
+	}
+	else
+		std::cin >> value;
+
+	return *this;
+}
+
+void PYTHON_INPUT::Read_Values(double *values, int numValues) {
+
+	if ( binary )
+
+		// The values are packed back to back, copy them in one go.
+
+		Take_From_Payload(values, sizeof(double) * numValues);
+	else
+		for (int i = 0 ; i < numValues ; i++ )
+
+			std::cin >> values[i];
+}
+
+// ------------------------------- Private methods ------------------------
+
+int PYTHON_INPUT::Find_Command(char *name) {
+
+	for (int c = 0 ; c < NUMBER_OF_COMMANDS ; c++ )
+
+		if ( strcmp(name,COMMAND_NAMES[c]) == 0 )
+
+			return c;
+
+	return UNKNOWN_COMMAND;
+}
+
+void PYTHON_INPUT::Read_Payload(int numBytes) {
+
+	if ( numBytes > payloadCapacity ) {
+
+		delete [] payload;
+
+		payload = new char[numBytes];
+
+		payloadCapacity = numBytes;
+	}
+
+	std::cin.read(payload, numBytes);
+
+	payloadSize = std::cin.gcount();
+
+	position = 0;
+}
+
+void PYTHON_INPUT::Take_From_Payload(void *destination, int numBytes) {
+
+	if ( position + numBytes > payloadSize ) {
+
+		std::cerr << "Command from python is missing fields" << std::endl;
+
+		exit(1);
+	}
+
+	memcpy(destination, payload + position, numBytes);
+
+	position += numBytes;
+}
+
+#endif
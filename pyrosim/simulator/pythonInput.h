@@ -0,0 +1,125 @@
+#ifndef _PYTHON_INPUT_H
+#define _PYTHON_INPUT_H
+
+#include <string>
+
+// Reads the scene python sends on stdin. By default the scene is text:
+// each command is its name followed by its fields separated by
+// whitespace. After the "Binary" command each command is an int32
+// opcode and the int32 size of its payload, followed by the payload
+// with the fields packed little-endian: int32 for integer fields,
+// float64 for real valued fields and an int32 length followed by the
+// characters for strings. "Done" ends the scene and switches back to
+// text for the next one.
+
+// Opcodes, in the same order as COMMAND_NAMES in pythonInput.cpp and
+// COMMANDS in pyrosim.py.
+
+enum COMMAND {
+
+	DONE_COMMAND,
+	BINARY_COMMAND,
+
+	EVALUATION_TIME_COMMAND,
+	TIME_INTERVAL_COMMAND,
+	SUBSTEPS_COMMAND,
+	GRAVITY_COMMAND,
+	SOLVER_COMMAND,
+	TEXTURE_PATH_COMMAND,
+	DEBUG_COMMAND,
+	WINDOW_SIZE_COMMAND,
+	CAMERA_COMMAND,
+	FOLLOW_BODY_COMMAND,
+	TRACK_BODY_COMMAND,
+	RENDER_COMMAND,
+	CAPTURE_COMMAND,
+	CAPTURE_STREAM_COMMAND,
+	POSE_LOG_COMMAND,
+	STREAM_CHUNK_COMMAND,
+	BATCH_SIZE_COMMAND,
+	COLLISION_SPACE_COMMAND,
+	COLLISION_MATRIX_COMMAND,
+
+	EXTERNAL_FORCE_COMMAND,
+
+	BOX_COMMAND,
+	CYLINDER_COMMAND,
+	CAPSULE_COMMAND,
+	SPHERE_COMMAND,
+
+	HINGE_JOINT_COMMAND,
+	SLIDER_JOINT_COMMAND,
+	THRUSTER_COMMAND,
+
+	IS_SEEN_SENSOR_COMMAND,
+	POSITION_SENSOR_COMMAND,
+	TOUCH_SENSOR_COMMAND,
+	RAY_SENSOR_COMMAND,
+	PROPRIOCEPTIVE_SENSOR_COMMAND,
+	LIGHT_SENSOR_COMMAND,
+	VESTIBULAR_SENSOR_COMMAND,
+	LIGHT_SOURCE_COMMAND,
+
+	BIAS_NEURON_COMMAND,
+	SENSOR_NEURON_COMMAND,
+	HIDDEN_NEURON_COMMAND,
+	MOTOR_NEURON_COMMAND,
+	FUNCTION_NEURON_COMMAND,
+
+	SYNAPSE_COMMAND,
+
+	STOP_CONDITION_COMMAND,
+
+	NUMBER_OF_COMMANDS
+};
+
+extern const char *COMMAND_NAMES[NUMBER_OF_COMMANDS];
+
+const int UNKNOWN_COMMAND = -1;
+
+const char *Command_Name(int command);
+
+class PYTHON_INPUT {
+
+private:
+
+	int binary;
+
+	char *payload;
+
+	int payloadSize;
+
+	int payloadCapacity;
+
+	int position;
+
+public:
+	PYTHON_INPUT(void);
+
+	~PYTHON_INPUT(void);
+
+	int  End_Of_Input(void);
+
+	int  Read_Command(void);
+
+	PYTHON_INPUT& operator>>(int &value);
+
+	PYTHON_INPUT& operator>>(double &value);
+
+	PYTHON_INPUT& operator>>(float &value);
+
+	PYTHON_INPUT& operator>>(std::string &value);
+
+	void Read_Values(double *values, int numValues);
+
+private:
+	int  Find_Command(char *name);
+
+	void Read_Payload(int numBytes);
+
+	void Take_From_Payload(void *destination, int numBytes);
+};
+
+extern PYTHON_INPUT pythonInput;
+
+#endif
@@ -3,35 +3,45 @@
 
 #include "iostream"
 #include "raySensor.h"
+#include "pythonInput.h"
 #include "object.h"
-#include <drawstuff/drawstuff.h>
 #include "neuron.h"
 
+#ifndef HEADLESS
+#include <drawstuff/drawstuff.h>
+
 #ifdef dDOUBLE
 #define dsDrawLine dsDrawLineD
 #endif
+#endif
 
-RAY_SENSOR::RAY_SENSOR(dSpaceID space, OBJECT *myObj, int myID, int evalPeriod) {
+RAY_SENSOR::RAY_SENSOR(dSpaceID space, OBJECT *myObj, int myID, int recordingPeriod) {
 
 	ID = myID;
 
 	obj = myObj;
 
-        std::cin >> x;
+        pythonInput >> x;
 
-        std::cin >> y;
+        pythonInput >> y;
 
-        std::cin >> z;
+        pythonInput >> z;
 
-        std::cin >> r1;
+        pythonInput >> r1;
 
-        std::cin >> r2;
+        pythonInput >> r2;
 
-        std::cin >> r3;
+        pythonInput >> r3;
 
-        std::cin >> maxDistance;
+        pythonInput >> maxDistance;
 
-	Initialize(evalPeriod);
+        int recordEvery;
+
+        pythonInput >> recordEvery;
+
+	recorder = new RECORDER(4,recordingPeriod,recordEvery);
+
+	Reset();
 
         ray = dCreateRay(space,maxDistance);
 
@@ -44,19 +54,30 @@ RAY_SENSOR::RAY_SENSOR(dSpaceID space, OBJECT *myObj, int myID, int evalPeriod)
 
 RAY_SENSOR::~RAY_SENSOR(void) {
 
+	delete recorder;
 }
 
 void RAY_SENSOR::Add_To_Object(void) {
 
-        dGeomSetBody(ray,obj->Get_Body());
-
-        dGeomSetOffsetWorldPosition(ray,x,y,z);
-
 	dMatrix3 R;
 
 	dRFromZAxis(R,r1,r2,r3);
 
-	dGeomSetOffsetWorldRotation(ray,R);
+	if ( obj->Get_Body() ) {
+
+		dGeomSetBody(ray,obj->Get_Body());
+
+		dGeomSetOffsetWorldPosition(ray,x,y,z);
+
+		dGeomSetOffsetWorldRotation(ray,R);
+	}
+	else {
+		// a static object never moves, so neither does its ray
+
+		dGeomSetPosition(ray,x,y,z);
+
+		dGeomSetRotation(ray,R);
+	}
 
 	dGeomSetData(ray,obj);
 
@@ -68,98 +89,76 @@ void RAY_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
         mySensorNeurons[ sensorNeuron->Get_Sensor_Value_Index() ] = sensorNeuron;
 }
 
-void RAY_SENSOR::Draw(double endX, double endY, double endZ, int t) {
+#ifndef HEADLESS
+void RAY_SENSOR::Draw(double endX, double endY, double endZ) {
 
         const dReal *start = dGeomGetPosition( ray );
 
 	double end[3] = {endX,endY,endZ};
 
-        dsSetColor(r[t],g[t],b[t]);
+        dsSetColor(values[1],values[2],values[3]);
 
         dsDrawLine( start , end );
 }
+#endif
 
 int  RAY_SENSOR::Get_ID(void) {
 
         return ID;
 }
 
-void RAY_SENSOR::Initialize(int evalPeriod) {
+RECORDER *RAY_SENSOR::Get_Recorder(void) {
 
-        distances = new double[evalPeriod];
+        return recorder;
+}
 
-        r = new double[evalPeriod];
+void RAY_SENSOR::Record(int t) {
 
-        g = new double[evalPeriod];
+        recorder->Store(values,t);
 
-        b = new double[evalPeriod];
+        Reset();
+}
 
-        for (int t=0;t<evalPeriod;t++) {
+void RAY_SENSOR::Reset(void) {
 
-                distances[t] = maxDistance;
+        values[0] = maxDistance;
 
-                r[t] = 0.0;
+        values[1] = 0.0;
 
-                g[t] = 0.0;
+        values[2] = 0.0;
 
-                b[t] = 0.0;
-        }
+        values[3] = 0.0;
 }
 
-void RAY_SENSOR::Set(double dist, OBJECT *objectThatWasHit,int t) {
+void RAY_SENSOR::Set(double dist, OBJECT *objectThatWasHit) {
 
-	if ( dist > distances[t] )
+	if ( dist > values[0] )
 	
 	// The ray sensor stops when it hits its first object.
 
 		return;
 
-	distances[t] = dist;
+	values[0] = dist;
 
 	if ( objectThatWasHit ) {
 
-		r[t] = objectThatWasHit->Get_Red_Component();
+		values[1] = objectThatWasHit->Get_Red_Component();
 
-                g[t] = objectThatWasHit->Get_Green_Component();
+                values[2] = objectThatWasHit->Get_Green_Component();
 
-                b[t] = objectThatWasHit->Get_Blue_Component();
+                values[3] = objectThatWasHit->Get_Blue_Component();
 	       
-               objectThatWasHit->IsSeen_Sensor_Fires(t);
+               objectThatWasHit->IsSeen_Sensor_Fires();
         }
 }
 
-void RAY_SENSOR::Update_Sensor_Neurons(int t) {
-
-        if ( mySensorNeurons[0] )
-
-                mySensorNeurons[0]->Set( distances[t] );
-
-        if ( mySensorNeurons[1] )
-
-                mySensorNeurons[1]->Set( r[t] );
-
-        if ( mySensorNeurons[2] )
-
-                mySensorNeurons[2]->Set( g[t] );
-
-        if ( mySensorNeurons[3] )
-
-                mySensorNeurons[3]->Set( b[t] );
-}
-
-void RAY_SENSOR::Write_To_Python(int evalPeriod) {
-
-	char outString[100000];
+void RAY_SENSOR::Update_Sensor_Neurons(void) {
 
-	sprintf(outString,"%d %d ",ID,4);
+        for (int i = 0 ; i < 4 ; i++ )
 
-	for ( int  t = 0 ; t < evalPeriod ; t++ ){
-	   sprintf(outString,"%s %f %f %f %f ",outString,distances[t],r[t],g[t],b[t]);
-       
-    }
+                if ( mySensorNeurons[i] )
 
-	sprintf(outString,"%s \n",outString);
-    std::cout << outString;
+                        mySensorNeurons[i]->Set( values[i] );
 }
 
 #endif
@@ -2,6 +2,7 @@
 #define _RAY_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class OBJECT;
 
@@ -12,7 +13,11 @@ class RAY_SENSOR {
 private:
 	int ID;
 
-	double *distances;
+	// distance and the r, g, b color of the object that was hit
+
+	double values[4];
+
+	RECORDER *recorder;
 
 	OBJECT *obj;
 
@@ -22,14 +27,12 @@ private:
 
 	double r1,r2,r3;
 
-	double *r, *g, *b;
-
     double maxDistance;
 
     NEURON *mySensorNeurons[4];
 
 public:
-	RAY_SENSOR(dSpaceID space, OBJECT *myObj, int myID, int evalPeriod);
+	RAY_SENSOR(dSpaceID space, OBJECT *myObj, int myID, int recordingPeriod);
 
 	~RAY_SENSOR(void);
 
@@ -37,19 +40,22 @@ public:
 
     void Connect_To_Sensor_Neuron(NEURON *sensorNeuron);
 
-	void Draw(double endX, double endY, double endZ, int t);
+#ifndef HEADLESS
+	void Draw(double endX, double endY, double endZ);
+#endif
 
         int  Get_ID(void);
 
-	void Initialize(int evalPeriod);
+        RECORDER *Get_Recorder(void);
+
+	void Record(int t);
 
 	void Reset(void);
 
-	void Set(double distance, OBJECT *objectThatWasHit, int t);
+	void Set(double distance, OBJECT *objectThatWasHit);
 
-        void Update_Sensor_Neurons(int t);
+        void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
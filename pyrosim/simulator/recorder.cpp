@@ -0,0 +1,107 @@
+#ifndef _RECORDER_CPP
+#define _RECORDER_CPP
+
+#include <cstddef>
+#include "recorder.h"
+#include "dataWriter.h"
+
+RECORDER::RECORDER(int numSensorValues, int recordingPeriod, int every) {
+
+	numValues = numSensorValues;
+
+	recordEvery = every;
+
+	if ( recordEvery == RECORD_NOTHING )
+
+		capacity = 0;
+
+	else if ( recordEvery == RECORD_LAST )
+
+		capacity = 1;
+	else
+		capacity = (recordingPeriod + recordEvery - 1) / recordEvery;
+
+	buffer = NULL;
+
+	latest = new double[numValues];
+
+	for (int v = 0 ; v < numValues ; v++ )
+
+		latest[v] = 0.0;
+
+	numStored = 0;
+}
+
+RECORDER::~RECORDER(void) {
+
+	delete [] latest;
+}
+
+void RECORDER::Clear(void) {
+
+	numStored = 0;
+}
+
+double RECORDER::Get_Latest(int valueIndex) {
+
+	return latest[valueIndex];
+}
+
+int RECORDER::Get_Number_Of_Values(void) {
+
+	return numValues;
+}
+
+int RECORDER::Get_Size(void) {
+
+	return numValues * capacity;
+}
+
+void RECORDER::Set_Buffer(double *storage) {
+
+	buffer = storage;
+}
+
+void RECORDER::Store(double *values, int t) {
+
+	for (int v = 0 ; v < numValues ; v++ )
+
+		latest[v] = values[v];
+
+	if ( recordEvery == RECORD_NOTHING )
+
+		return;
+
+	if ( recordEvery == RECORD_LAST )
+
+		// Keep overwriting the only slot.
+
+		numStored = 0;
+
+	else if ( (t % recordEvery != 0) || (numStored == capacity) )
+
+		return;
+
+	for (int v = 0 ; v < numValues ; v++ )
+
+		buffer[ v * capacity + numStored ] = values[v];
+
+	numStored++;
+}
+
+void RECORDER::Write_To_Python(int ID) {
+
+	if ( recordEvery == RECORD_NOTHING )
+
+		return;
+
+	Write_Sensor_Header(ID,numValues,numStored,DATA_TYPE_DOUBLE);
+
+	for (int v = 0 ; v < numValues ; v++ )
+
+		Write_Sensor_Values(buffer + v * capacity, numStored);
+
+	Clear();
+}
+
+#endif
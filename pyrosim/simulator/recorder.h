@@ -0,0 +1,51 @@
+#ifndef _RECORDER_H
+#define _RECORDER_H
+
+// Holds the values a sensor records between two writes to python,
+// laid out as [sensor value][time step] so they can be written
+// back in one piece. The storage is a slice of the block SENSORS
+// allocates for all recorders once the scene is read. A recorder
+// either keeps every recordEvery-th time step, only the last time
+// step (RECORD_LAST) or nothing at all (RECORD_NOTHING). Whatever it
+// keeps, it holds on to the latest values so stop conditions can
+// test them.
+
+const int RECORD_NOTHING = 0;
+const int RECORD_LAST    = -1;
+
+class RECORDER {
+
+private:
+	int numValues;
+
+	int recordEvery;
+
+	int capacity;
+
+	int numStored;
+
+	double *buffer;
+
+	double *latest;
+
+public:
+	RECORDER(int numSensorValues, int recordingPeriod, int every);
+
+	~RECORDER(void);
+
+	void Clear(void);
+
+	double Get_Latest(int valueIndex);
+
+	int  Get_Number_Of_Values(void);
+
+	int  Get_Size(void);
+
+	void Set_Buffer(double *storage);
+
+	void Store(double *values, int t);
+
+	void Write_To_Python(int ID);
+};
+
+#endif
@@ -0,0 +1,29 @@
+#ifndef _SCENE_H
+#define _SCENE_H
+
+#include <ode/ode.h>
+#include "environment.h"
+#include "datastruct.h"
+#include "poseLog.h"
+
+// One simulation: its ODE world and the robot and settings python sent
+// for it. The simulator usually holds a single scene; in a server batch
+// it holds several and steps them in turn.
+
+struct SCENE {
+
+  dWorldID world;
+  dSpaceID space;
+  dSpaceID raySpace; // the ray sensors, cast against space once a step
+  dJointGroupID contactgroup;
+  dGeomID ground;
+
+  ENVIRONMENT *environment;
+  Data *data;
+
+  POSE_LOG_WRITER *poseLog; // if the poses are logged
+
+  int timer;
+};
+
+#endif
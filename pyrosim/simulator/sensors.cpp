@@ -0,0 +1,189 @@
+#ifndef _SENSORS_CPP
+#define _SENSORS_CPP
+
+#include "sensors.h"
+
+template <class SENSOR_TYPE>
+static void Record_All(std::vector<SENSOR_TYPE *> &sensors, int t) {
+
+	for (size_t s = 0 ; s < sensors.size() ; s++ )
+
+		sensors[s]->Record(t);
+}
+
+template <class SENSOR_TYPE>
+static void Update_All(std::vector<SENSOR_TYPE *> &sensors) {
+
+	for (size_t s = 0 ; s < sensors.size() ; s++ )
+
+		sensors[s]->Update_Sensor_Neurons();
+}
+
+SENSORS::SENSORS(void) {
+
+	recordings = NULL;
+}
+
+SENSORS::~SENSORS(void) {
+
+	delete [] recordings;
+}
+
+void SENSORS::Add_IsSeen_Sensor(IS_SEEN_SENSOR *sensor) {
+
+	isSeenSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Light_Sensor(LIGHT_SENSOR *sensor) {
+
+	lightSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Position_Sensor(POSITION_SENSOR *sensor) {
+
+	positionSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Proprioceptive_Sensor(PROPRIOCEPTIVE_SENSOR *sensor) {
+
+	proprioceptiveSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Ray_Sensor(RAY_SENSOR *sensor) {
+
+	raySensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Touch_Sensor(TOUCH_SENSOR *sensor) {
+
+	touchSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Add_Vestibular_Sensor(VESTIBULAR_SENSOR *sensor) {
+
+	vestibularSensors.push_back(sensor);
+
+	Add_Recorder(sensor->Get_ID(),sensor->Get_Recorder());
+}
+
+void SENSORS::Allocate_Recordings(void) {
+
+	int size = 0;
+
+	for (size_t s = 0 ; s < recorders.size() ; s++ )
+
+		if ( recorders[s] )
+
+			size += recorders[s]->Get_Size();
+
+	recordings = new double[size];
+
+	double *next = recordings;
+
+	for (size_t s = 0 ; s < recorders.size() ; s++ )
+
+		if ( recorders[s] ) {
+
+			recorders[s]->Set_Buffer(next);
+
+			next += recorders[s]->Get_Size();
+		}
+}
+
+RECORDER *SENSORS::Get_Recorder(int sensorID) {
+
+	if ( sensorID < 0 || sensorID >= (int)recorders.size() )
+
+		return NULL;
+
+	return recorders[sensorID];
+}
+
+void SENSORS::Poll(LIGHT_SOURCES *lightSources) {
+
+	// Touch, ray and is seen sensors are set by the collisions instead.
+
+	for (size_t s = 0 ; s < lightSensors.size() ; s++ )
+
+		lightSensors[s]->Poll(lightSources);
+
+	for (size_t s = 0 ; s < positionSensors.size() ; s++ )
+
+		positionSensors[s]->Poll();
+
+	for (size_t s = 0 ; s < proprioceptiveSensors.size() ; s++ )
+
+		proprioceptiveSensors[s]->Poll();
+
+	for (size_t s = 0 ; s < vestibularSensors.size() ; s++ )
+
+		vestibularSensors[s]->Poll();
+}
+
+void SENSORS::Record(int t) {
+
+	Record_All(lightSensors,t);
+
+	Record_All(isSeenSensors,t);
+
+	Record_All(positionSensors,t);
+
+	Record_All(proprioceptiveSensors,t);
+
+	Record_All(raySensors,t);
+
+	Record_All(touchSensors,t);
+
+	Record_All(vestibularSensors,t);
+}
+
+void SENSORS::Update_Sensor_Neurons(void) {
+
+	Update_All(lightSensors);
+
+	Update_All(isSeenSensors);
+
+	Update_All(positionSensors);
+
+	Update_All(proprioceptiveSensors);
+
+	Update_All(raySensors);
+
+	Update_All(touchSensors);
+
+	Update_All(vestibularSensors);
+}
+
+void SENSORS::Write_To_Python(void) {
+
+	for (size_t s = 0 ; s < recorders.size() ; s++ )
+
+		if ( recorders[s] )
+
+			recorders[s]->Write_To_Python(s);
+}
+
+// ----------------------- Private methods ---------------------------
+
+void SENSORS::Add_Recorder(int sensorID, RECORDER *recorder) {
+
+	if ( sensorID >= (int)recorders.size() )
+
+		recorders.resize(sensorID + 1, NULL);
+
+	recorders[sensorID] = recorder;
+}
+
+#endif
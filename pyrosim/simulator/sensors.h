@@ -0,0 +1,75 @@
+#ifndef _SENSORS_H
+#define _SENSORS_H
+
+#include <vector>
+#include "lightSensor.h"
+#include "isSeenSensor.h"
+#include "positionSensor.h"
+#include "proprioceptiveSensor.h"
+#include "raySensor.h"
+#include "touchSensor.h"
+#include "vestibularSensor.h"
+
+// Every sensor of the scene, kept in one list per type so each time
+// step only the sensors that exist are polled, recorded and passed on
+// to their sensor neurons. The bodies and joints still own their
+// sensors. Once the scene is read, the recordings of all sensors are
+// placed in one block laid out as [sensor][sensor value][time step].
+
+class SENSORS {
+
+private:
+	std::vector<LIGHT_SENSOR *> lightSensors;
+
+	std::vector<IS_SEEN_SENSOR *> isSeenSensors;
+
+	std::vector<POSITION_SENSOR *> positionSensors;
+
+	std::vector<PROPRIOCEPTIVE_SENSOR *> proprioceptiveSensors;
+
+	std::vector<RAY_SENSOR *> raySensors;
+
+	std::vector<TOUCH_SENSOR *> touchSensors;
+
+	std::vector<VESTIBULAR_SENSOR *> vestibularSensors;
+
+	// indexed by sensor ID
+	std::vector<RECORDER *> recorders;
+
+	double *recordings;
+
+	void Add_Recorder(int sensorID, RECORDER *recorder);
+
+public:
+	SENSORS(void);
+
+	~SENSORS(void);
+
+	void Add_IsSeen_Sensor(IS_SEEN_SENSOR *sensor);
+
+	void Add_Light_Sensor(LIGHT_SENSOR *sensor);
+
+	void Add_Position_Sensor(POSITION_SENSOR *sensor);
+
+	void Add_Proprioceptive_Sensor(PROPRIOCEPTIVE_SENSOR *sensor);
+
+	void Add_Ray_Sensor(RAY_SENSOR *sensor);
+
+	void Add_Touch_Sensor(TOUCH_SENSOR *sensor);
+
+	void Add_Vestibular_Sensor(VESTIBULAR_SENSOR *sensor);
+
+	void Allocate_Recordings(void);
+
+	RECORDER *Get_Recorder(int sensorID);
+
+	void Poll(LIGHT_SOURCES *lightSources);
+
+	void Record(int t);
+
+	void Update_Sensor_Neurons(void);
+
+	void Write_To_Python(void);
+};
+
+#endif
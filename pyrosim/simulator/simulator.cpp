@@ -2,6 +2,10 @@
 
 //ode headers
 #include <ode/ode.h>
+
+// HEADLESS builds (make headless) leave out everything that draws, so
+// they need neither drawstuff nor GL and can only run blind.
+#ifndef HEADLESS
 #include <drawstuff/drawstuff.h>
 
 // glut 
@@ -10,17 +14,24 @@
 #else
 #include <GL/glut.h>
 #endif
+#endif
 
 //custom headers
 #include "texturepath.h"
 #include "environment.h"
 #include "datastruct.h"
+#include "pythonInput.h"
+#include "scene.h"
+#include "poseLog.h"
+#ifndef HEADLESS
+#include "capture.h"
+#endif
 
 #ifdef _MSC_VER
 #pragma warning(disable:4244 4305)  // for VC++, no precision loss complaints
 #endif
 
-#ifdef dDOUBLE
+#if defined(dDOUBLE) && !defined(HEADLESS)
 #define dsDrawLine dsDrawLineD
 #define dsDrawBox dsDrawBoxD
 #define dsDrawSphere dsDrawSphereD
@@ -28,38 +39,47 @@
 #define dsDrawCapsule dsDrawCapsuleD
 #endif
 
-static dWorldID world;
-static dSpaceID space;
-static dJointGroupID contactgroup;
+#ifndef HEADLESS
 dsFunctions fn;
+#endif
 
-int timer;
+SCENE *mainScene; // the scene of a normal run, drawn unless run blind
 
-ENVIRONMENT *environment;
+PYTHON_INPUT pythonInput;
+#ifndef HEADLESS
+FRAME_CAPTURE *frameCapture = NULL; // while frames of the main scene are captured
+#endif
 int numberOfBodies = 0;
-bool initialized = false;
-static dGeomID ground;
 
-
-Data *data = new Data;//struct which keeps all user input values for various parameterss. see datastruct.h
+#ifndef HEADLESS
 static float updated_xyz[3];
 int LAGSIZE = 20;
 static float average_z[20];
 
-const float FPS = 300.0;
-const float baseDT = 1.0/FPS;
-float framestart;
-float accumulator = 0.0;
+// simulated time owed to the wall clock when pacing to real time
+double accumulator = 0.0;
+// a frame catches up on no more than this many seconds of wall clock, so
+// a scene too heavy for real time slows down instead of falling behind
+const double MAX_FRAME_TIME = 0.25;
+int framesCaptured = 0;
+
+POSE_LOG_READER *replayLog = NULL; // when a pose log is replayed
+#endif
 
 void Draw_Distance_Sensor(dGeomID myGeom, dGeomID thisGeom);
 
-void Read_From_Python(void);
+void Read_From_Python(SCENE *scene);
 
 void Set_Distance_Sensor(dGeomID o);
 
 void Terminate(void);
 
-void Handle_Ray_Sensor(dGeomID o1, dGeomID o2) {
+void Handle_Ray_Sensor(dGeomID o1, dGeomID o2, int runBlind) {
+
+    // ODE leaves out the geoms of the ray's own body, but a static
+    // object has none.
+    if ( dGeomGetData(o1) == dGeomGetData(o2) )
+        return;
 
     if ( dGeomGetClass(o1) == dRayClass ) {
 
@@ -72,30 +92,50 @@ void Handle_Ray_Sensor(dGeomID o1, dGeomID o2) {
             OBJECT *obj = (OBJECT *)dGeomGetData(o1);
             OBJECT *obj2 = (OBJECT *)dGeomGetData(o2);
 
-            obj->Set_Ray_Sensor(contact.geom.depth,obj2,timer);
+            obj->Set_Ray_Sensor(contact.geom.depth,obj2);
 
-            if ( data->runBlind == false )
-                obj->Draw_Ray_Sensor(contact.geom.pos[0],contact.geom.pos[1],contact.geom.pos[2],timer);
+#ifndef HEADLESS
+            if ( runBlind == false )
+                obj->Draw_Ray_Sensor(contact.geom.pos[0],contact.geom.pos[1],contact.geom.pos[2]);
+#endif
 
         }
     }
 }
 
-void Handle_Ray_Sensors(dGeomID o1, dGeomID o2) {
+static void rayCallback (void *callbackData, dGeomID o1, dGeomID o2)
+{
+  SCENE *scene = (SCENE *)callbackData;
 
-    Handle_Ray_Sensor(o1,o2);
+  // The ray meets the space of a collision group: cast it at the
+  // bodies in there.
+  if ( dGeomIsSpace(o1) || dGeomIsSpace(o2) ) {
+    dSpaceCollide2(o1,o2,callbackData,&rayCallback);
+    return;
+  }
 
-    Handle_Ray_Sensor(o2,o1);
+  if ( dGeomGetClass(o1) == dRayClass )
+    Handle_Ray_Sensor(o1,o2,scene->data->runBlind);
+  else
+    Handle_Ray_Sensor(o2,o1,scene->data->runBlind);
 }
 
 static void nearCallback (void *callbackData, dGeomID o1, dGeomID o2)
 {
   int i,n;
 
-  Handle_Ray_Sensors(o1,o2);
-    // Cancel collisions between distance sensors and other objects.
-  if ( (dGeomGetClass(o1) == dRayClass) || (dGeomGetClass(o2) == dRayClass) ) return;
+  SCENE *scene = (SCENE *)callbackData;
+  Data *data = scene->data;
 
+  // One of them is the space of a collision group: look for the pairs
+  // between its bodies and the other geom or group.
+  if ( dGeomIsSpace(o1) || dGeomIsSpace(o2) ) {
+    dSpaceCollide2(o1,o2,callbackData,&nearCallback);
+    return;
+  }
+
+  // Static objects and the ground never push each other.
+  if ( !dGeomGetBody(o1) && !dGeomGetBody(o2) ) return;
 
   OBJECT *d1 = (OBJECT *)dGeomGetData(o1);
 
@@ -103,19 +143,19 @@ static void nearCallback (void *callbackData, dGeomID o1, dGeomID o2)
   // if (d1 && d2)
   //   return;
   if ( d1 && d2 ){
-        if (dAreConnected (d1->Get_Body(),d2->Get_Body())) return; //no collision between joint connected bodies
+        if (d1->Get_Body() && d2->Get_Body() && dAreConnected (d1->Get_Body(),d2->Get_Body())) return; //no collision between joint connected bodies
         int d1Group = d1->Get_Group();
         int d2Group = d2->Get_Group();
-        if(!data->collisionMatrix[d1Group][d2Group]) return; //no collision between groups where matrix[i][j]=0
+        if(!data->Groups_Collide(d1Group,d2Group)) return; //no collision between groups where matrix[i][j]=0
     }
 
     // std::cerr << "Collision Occurs" << std::endl;
     if ( d1 ){
-        d1->Touch_Sensor_Fires(timer);
+        d1->Touch_Sensor_Fires();
         // std::cerr << "one :" << d1->Get_ID() << std::endl;
     }
     if ( d2 ){
-            d2->Touch_Sensor_Fires(timer);
+            d2->Touch_Sensor_Fires();
         // std::cerr << "two :" << d2->Get_ID() << std::endl;
     }
 
@@ -132,7 +172,7 @@ static void nearCallback (void *callbackData, dGeomID o1, dGeomID o2)
             contact[i].surface.slip1 = 0.01;
             contact[i].surface.slip2 = 0.01;
 
-            dJointID c = dJointCreateContact (world,contactgroup,&contact[i]);
+            dJointID c = dJointCreateContact (scene->world,scene->contactgroup,&contact[i]);
             dJointAttach (c,
                 dGeomGetBody(contact[i].geom.g1),
                 dGeomGetBody(contact[i].geom.g2));
@@ -140,42 +180,21 @@ static void nearCallback (void *callbackData, dGeomID o1, dGeomID o2)
     }
 }
 
-
-static void captureFrame(int num) {
-
-
-	char s[200];
-
-	//printf("capturing frame %04d\n",num);
-	sprintf (s,"frame/%04d.ppm",num);
-
-	FILE *f = fopen (s,"wb");
-	fprintf (f,"P6\n%d %d\n255\n",data->windowWidth,data->windowHeight);
-
-	void *buf = malloc( data->windowWidth * data->windowHeight * 3 );
-	glReadPixels( 0, 0, data->windowWidth, data->windowHeight, GL_RGB, GL_UNSIGNED_BYTE, buf );
-
-	for (int y=(data->windowHeight - 1); y>=0; y--) {
-		for (int x=0; x<data->windowWidth; x++) {
-			unsigned char *pixel = ((unsigned char *)buf)+((y*data->windowWidth+ x)*3);
-			unsigned char b[3];
-			b[0] = *pixel;
-			b[1] = *(pixel+1);
-			b[2] = *(pixel+2);
-			fwrite(b,3,1,f);
-		}
-	}
-	free(buf);
-	fclose(f);
-
-}
-
+#ifndef HEADLESS
 
 // start simulation - set viewpoint
 
 static void start()
 {
   dAllocateODEDataForThread(dAllocateMaskAll);
+
+  // set before the first frame is drawn, which steps only afterwards
+  Data *data = mainScene->data;
+  dsSetViewpoint (data->xyz,data->hpr);
+  if(data->followBody>=0){
+    mainScene->environment->Get_Object_Position(updated_xyz, data->followBody);
+    for(int i=0;i<LAGSIZE;i++) average_z[i] = updated_xyz[2];
+  }
 }
 
 
@@ -187,116 +206,288 @@ static void command (int cmd)
       case '1': {
           FILE *f = fopen ("state.dif","wt");
           if (f) {
-            dWorldExportDIF (world,f,"");
+            dWorldExportDIF (mainScene->world,f,"");
             fclose (f);
         }
     }
 }
 }
 
+#endif
+
 // simulation loop
 
-void Simulate_For_One_Time_Step(void) {
+void Find_Contacts(SCENE *scene) {
 
-  dSpaceCollide (space,0,&nearCallback);
+  dSpaceCollide (scene->space,scene,&nearCallback);
+  scene->environment->Collide_Within_Groups(scene->data,scene,&nearCallback);
+}
 
-  environment->Poll_Sensors(timer);
-  environment->Update_Neural_Network(timer);
-  environment->Actuate_Joints();
-  environment->Update_Forces(timer);
+void Simulate_For_One_Time_Step(SCENE *scene) {
 
-  dWorldStep (world, data->dt);
+  ENVIRONMENT *environment = scene->environment;
+  Data *data = scene->data;
 
-  dJointGroupEmpty(contactgroup);
+  Find_Contacts(scene);
 
-  timer++;
+  // the rays only need to be tested against the bodies, not each other
+  if ( dSpaceGetNumGeoms(scene->raySpace) > 0 )
+    dSpaceCollide2((dGeomID)scene->raySpace,(dGeomID)scene->space,scene,&rayCallback);
 
-  if ( timer==data->evaluationTime )
-    Terminate();
+  environment->Poll_Sensors(scene->timer);
+  environment->Update_Neural_Network(scene->timer);
+  environment->Record_Sensors(scene->timer);
+
+  int stop = environment->Stop_Condition_Met(scene->timer);
+
+  // the physics may take several shorter steps per time step; the motors
+  // keep the values of the network and the touch sensors record any
+  // contact found in between
+  double stepSize = data->dt / data->substeps;
+  for (int s=0;s<data->substeps;s++) {
+
+    if ( s > 0 )
+      Find_Contacts(scene);
+
+    environment->Actuate_Joints();
+    environment->Update_Forces(scene->timer);
+
+    // quickstep iterates towards the constraint forces instead of solving
+    // for them exactly, which is much cheaper for many joints and contacts
+    if ( data->solver == QUICKSTEP_SOLVER )
+      dWorldQuickStep (scene->world, stepSize);
+    else
+      dWorldStep (scene->world, stepSize);
+
+    dJointGroupEmpty(scene->contactgroup);
+  }
+
+  scene->timer++;
+
+  if ( scene->poseLog )
+    scene->poseLog->Record(environment,scene->timer);
+
+  // end the run after this time step; the sensor data written back
+  // then covers only the steps that were run
+  if ( stop )
+    data->evaluationTime = scene->timer;
+
+  // stream the sensor data back to python every streamChunk time steps
+  if ( data->streamChunk > 0 && scene->timer % data->streamChunk == 0 )
+    environment->Write_Sensor_Data(data->streamChunk);
 }
 
-static void simLoop (int pause)
+#ifndef HEADLESS
+// Moves the camera after the body it follows or turns it to the body it
+// tracks.
+static void Update_Camera(ENVIRONMENT *environment, Data *data, int timeStep)
 {
-    if (!initialized){
-        dsSetViewpoint (data->xyz,data->hpr);
-        if(data->followBody>=0){
-          environment->Get_Object_Position(updated_xyz, data->followBody);
-          for(int i=0;i<LAGSIZE;i++) average_z[i] = updated_xyz[2];
-      }
-    initialized = true;
-    }
+    if (data->followBody>=0)
+    {
+        environment->Get_Object_Position(updated_xyz, data->followBody);
 
-    // accumulator += dsElapsedTime();
-    // if (accumulator>10.0*baseDT)
-    // {
-    //   accumulator = 10.0*baseDT;
-    // }
-    // accumulator to maintain frame rate
-    // while(accumulator>baseDT)
-    //{   
-      // accumulator -= data->dt;
-      if ( !pause ){
-          Simulate_For_One_Time_Step();
- 
-          if (data->followBody>=0)
-          {
-            environment->Get_Object_Position(updated_xyz, data->followBody);
+        average_z[timeStep%LAGSIZE] = updated_xyz[2];
 
-            average_z[timer%LAGSIZE] = updated_xyz[2];
+        updated_xyz[0] += data->xyz[0];
+        updated_xyz[1] += data->xyz[1];
+        updated_xyz[2] += data->xyz[2];
 
-            updated_xyz[0] += data->xyz[0];
-            updated_xyz[1] += data->xyz[1];
-            updated_xyz[2] += data->xyz[2];
+        //for(int i=0;i<LAGSIZE;i++) updated_xyz[2] +=  average_z[i]/float(LAGSIZE); //lag movement
 
-            //for(int i=0;i<LAGSIZE;i++) updated_xyz[2] +=  average_z[i]/float(LAGSIZE); //lag movement
+        dsSetViewpoint(updated_xyz,data->hpr);
+    }
 
-                dsSetViewpoint(updated_xyz,data->hpr);
-          }
+    if (data->trackBody>=0)
+    {
+        float dirVector[3];
+        environment->Get_Object_Position(dirVector, data->trackBody);
 
-        if (data->trackBody>=0)
-         {
-            float dirVector[3];
-            environment->Get_Object_Position(dirVector, data->trackBody);
-            
-            for(int i=0;i<3;i++)
-              dirVector[i] -= data->xyz[i];
+        for(int i=0;i<3;i++)
+            dirVector[i] -= data->xyz[i];
 
-          if (!(dirVector[0]==0 and dirVector[1]==0 and dirVector[2]==0)){
+        if (!(dirVector[0]==0 and dirVector[1]==0 and dirVector[2]==0)){
             float zDrop = dirVector[2];
             float magnitude = sqrt(pow(dirVector[0],2)+ pow(dirVector[1],2)+pow(dirVector[2],2));
             for(int i=0;i<3;i++) dirVector[i] = dirVector[i]/magnitude;
 
-              float heading = -atan2(dirVector[0],dirVector[1]) * 180.0 / 3.14159+90.;
-              float pitch = asin(zDrop/magnitude) * 180.0 / 3.14159;
-              float update_hpr[3];
+            float heading = -atan2(dirVector[0],dirVector[1]) * 180.0 / 3.14159+90.;
+            float pitch = asin(zDrop/magnitude) * 180.0 / 3.14159;
+            float update_hpr[3];
+
+            update_hpr[0] = heading;
+            update_hpr[1] = pitch;
+            update_hpr[2] = data->hpr[2];
+
+            dsSetViewpoint(data->xyz, update_hpr);
+        }
+    }
+}
+
+// The number of time steps to take before the next frame is drawn.
+static int Steps_Per_Frame(Data *data) {
+
+    if ( data->realTime <= 0 )
+        return data->renderEvery;
 
-              update_hpr[0] = heading;
-              update_hpr[1] = pitch;
-              update_hpr[2] = data->hpr[2];
+    accumulator += dsElapsedTime() * data->realTime;
+    if ( accumulator > MAX_FRAME_TIME * data->realTime )
+        accumulator = MAX_FRAME_TIME * data->realTime;
 
-              dsSetViewpoint(data->xyz, update_hpr);
-              }
+    int steps = int(accumulator / data->dt);
+    accumulator -= steps * data->dt;
+
+    return steps;
+}
+
+static void simLoop (int pause)
+{
+    ENVIRONMENT *environment = mainScene->environment;
+    Data *data = mainScene->data;
+
+      if ( !pause ){
+          int steps = Steps_Per_Frame(data);
+
+          // only the last of the steps is drawn
+          for (int s=0;s<steps;s++) {
+            Simulate_For_One_Time_Step(mainScene);
+
+            if ( mainScene->timer==data->evaluationTime )
+              Terminate();
           }
+ 
+          Update_Camera(environment,data,mainScene->timer);
       }
 
-    // }
     environment->Draw(data->debug);
     
-	if((!pause) && data->capture && (timer % data->capture == 0))
-		captureFrame(timer / data->capture);
+	// capture the first frame drawn after every capture time steps; frames
+	// are numbered in order even when several are skipped between them
+	if((!pause) && data->capture && (mainScene->timer / data->capture > framesCaptured))
+		frameCapture->Capture(++framesCaptured);
 }
 
-void Initialize_ODE(void) {
+// Draws the frames of a pose log instead of simulating. The timer holds
+// the frame shown, which render_every and real_time advance like time
+// steps. Replays that capture end with the log; the others show its last
+// frame until the window is closed.
+static void replayLoop (int pause)
+{
+    ENVIRONMENT *environment = mainScene->environment;
+    Data *data = mainScene->data;
+    int lastFrame = replayLog->Get_Number_Of_Frames() - 1;
 
-    dInitODE2(0);
-    world = dWorldCreate();
-    space = dHashSpaceCreate (0);
-    contactgroup = dJointGroupCreate (0);
-    ground = dCreatePlane (space,0,0,1,0);
+    if ( lastFrame < 0 )
+        Terminate();
+
+    if ( !pause && mainScene->timer < lastFrame ) {
+        mainScene->timer += Steps_Per_Frame(data);
+        if ( mainScene->timer > lastFrame )
+            mainScene->timer = lastFrame;
+    }
+
+    environment->Set_Poses(replayLog->Get_Frame(mainScene->timer));
+
+    Update_Camera(environment,data,mainScene->timer);
+
+    environment->Draw(data->debug);
 
-    dGeomSetData(ground,NULL); 
+	if((!pause) && data->capture && (mainScene->timer / data->capture > framesCaptured))
+		frameCapture->Capture(++framesCaptured);
 
-    timer = 0;
+    if ( data->capture && mainScene->timer == lastFrame )
+        Terminate();
+}
+
+// called when a key is pressed during a replay: , and . step back and
+// forth by a frame, [ and ] halve and double the speed and 0 to 9 jump to
+// that tenth of the log
+static void replayCommand (int cmd)
+{
+  Data *data = mainScene->data;
+  int lastFrame = replayLog->Get_Number_Of_Frames() - 1;
+
+  switch (cmd) {
+      case ',':
+          if ( mainScene->timer > 0 )
+            mainScene->timer--;
+          break;
+      case '.':
+          if ( mainScene->timer < lastFrame )
+            mainScene->timer++;
+          break;
+      case '[':
+          if ( data->realTime > 0 )
+            data->realTime /= 2.0;
+          else if ( data->renderEvery > 1 )
+            data->renderEvery /= 2;
+          break;
+      case ']':
+          if ( data->realTime > 0 )
+            data->realTime *= 2.0;
+          else
+            data->renderEvery *= 2;
+          break;
+      default:
+          if ( cmd >= '0' && cmd <= '9' )
+            mainScene->timer = lastFrame * (cmd - '0') / 10;
+  }
+}
+#endif
+
+SCENE *Create_Scene(int runBlind) {
+
+    SCENE *scene = new SCENE;
+
+    scene->world = dWorldCreate();
+    scene->space = dHashSpaceCreate (0);
+    scene->raySpace = dHashSpaceCreate (0);
+    scene->contactgroup = dJointGroupCreate (0);
+    scene->ground = dCreatePlane (scene->space,0,0,1,0);
+
+    dGeomSetData(scene->ground,NULL); 
+
+    scene->timer = 0;
+    scene->poseLog = NULL;
+
+    scene->data = new Data;//struct which keeps all user input values for various parameterss. see datastruct.h
+    scene->data->runBlind = runBlind;
+    scene->data->followBody = -1;
+    scene->data->trackBody = -1;
+
+    scene->environment = new ENVIRONMENT();
+
+    return scene;
+}
+
+void Destroy_Scene(SCENE *scene) {
+
+    delete scene->poseLog;
+    delete scene->environment;
+
+    dJointGroupDestroy(scene->contactgroup);
+    dSpaceDestroy(scene->space);
+    dSpaceDestroy(scene->raySpace);
+    dWorldDestroy(scene->world);
+
+    delete scene->data;
+    delete scene;
+}
+
+#ifndef HEADLESS
+void Load_Replay(const char *fileName) {
+
+    replayLog = new POSE_LOG_READER(fileName);
+
+    mainScene->environment->Read_From_Pose_Log(mainScene->space,replayLog);
+
+    if ( replayLog->Get_Number_Of_Frames() > 0 )
+        mainScene->environment->Set_Poses(replayLog->Get_Frame(0));
+
+    // frames of the log take the place of time steps
+    mainScene->data->dt = replayLog->Get_Time_Interval() * replayLog->Get_Log_Every();
+
+    fn.step = &replayLoop;
+    fn.command = &replayCommand;
 }
 
 void Initialize_Draw_Stuff(void){
@@ -306,53 +497,156 @@ void Initialize_Draw_Stuff(void){
     fn.step = &simLoop;
     fn.command = &command;
     fn.stop = 0;
-    fn.path_to_textures = data->texturePathStr;
+    fn.path_to_textures = mainScene->data->texturePathStr.c_str();
     
 }
-void Initialize_Environment(void) {
-    environment = new ENVIRONMENT();
-    data->followBody = -1;
-    data->trackBody = -1;
-}
+#endif
+
+void Read_From_Python(SCENE *scene) {
+  scene->environment->Read_From_Python(scene->world,scene->space,scene->raySpace,scene->data);
+  dWorldSetGravity(scene->world,0,0,scene->data->gravity);
 
+  Data *data = scene->data;
+  dWorldSetQuickStepNumIterations(scene->world,data->solverIterations);
+  dWorldSetQuickStepW(scene->world,data->sor);
+  if ( data->erp >= 0 )
+    dWorldSetERP(scene->world,data->erp);
+  if ( data->cfm >= 0 )
+    dWorldSetCFM(scene->world,data->cfm);
+
+  if ( data->poseLogEvery > 0 )
+    scene->poseLog = new POSE_LOG_WRITER(data->poseLogFile.c_str(),scene->environment,data->dt,data->poseLogEvery);
+}
 
-void Read_From_Python(void) {
-    //environment->Read_From_Python(world,space, texturePathStr, &evaluationTime,&dt,&gravity,xyz,hpr,&debug,&followBody,&trackBody);
-  environment->Read_From_Python(world,space,data);
+void Write_Remaining_Sensor_Data(SCENE *scene) {
+    Data *data = scene->data;
+    if ( data->streamChunk == 0 )
+        scene->environment->Write_Sensor_Data(data->evaluationTime);
+    else if ( scene->timer % data->streamChunk != 0 )
+        scene->environment->Write_Sensor_Data(scene->timer % data->streamChunk);
 }
 
 void Terminate(void) {
-    environment->Write_Sensor_Data(data->evaluationTime);
-    delete data;
+    Write_Remaining_Sensor_Data(mainScene);
+    delete mainScene->poseLog;
+#ifndef HEADLESS
+    delete frameCapture;
+#endif
     exit(0);
 }
 
 void Run_Blind(void) {
 
-    while ( 1 )
+    while ( mainScene->timer < mainScene->data->evaluationTime )
+
+        Simulate_For_One_Time_Step(mainScene);
 
-        Simulate_For_One_Time_Step();
+    Terminate();
+}
+
+void Run_Batch(SCENE **scenes, int numScenes) {
+
+    // Step the scenes in turn until each has run for its evaluation time.
+
+    int running = numScenes;
+
+    while ( running > 0 ) {
+
+        running = 0;
+
+        for (int b = 0 ; b < numScenes ; b++ )
+
+            if ( scenes[b]->timer < scenes[b]->data->evaluationTime ) {
+
+                Simulate_For_One_Time_Step(scenes[b]);
+
+                running++;
+            }
+    }
+}
+
+void Run_Server(void) {
+
+    // Evaluate the scenes python sends, blind, until it closes the pipe.
+    // The first scene of a batch says how many scenes the batch holds;
+    // they are all loaded, stepped together and their sensor data is
+    // written back in the order they came.
+
+    while ( 1 ) {
+
+        SCENE *first = Create_Scene(true);
+        Read_From_Python(first);
+
+        if ( pythonInput.End_Of_Input() ) {
+            Destroy_Scene(first);
+            break;
+        }
+
+        int numScenes = first->data->batchSize;
+        SCENE **scenes = new SCENE * [numScenes];
+        scenes[0] = first;
+
+        for (int b = 1 ; b < numScenes ; b++ ) {
+            scenes[b] = Create_Scene(true);
+            Read_From_Python(scenes[b]);
+        }
+
+        Run_Batch(scenes, numScenes);
+
+        for (int b = 0 ; b < numScenes ; b++ ) {
+            Write_Remaining_Sensor_Data(scenes[b]);
+            Destroy_Scene(scenes[b]);
+        }
+
+        delete [] scenes;
+    }
+
+    dCloseODE();
 }
 
 int main (int argc, char **argv)
 {
-    data->runBlind = false; 
+    int runBlind = false; 
 
     if ( (argc > 1) && (strcmp(argv[1],"-blind")==0) )
-        data->runBlind = true;
+        runBlind = true;
+
+    // draws a pose log in the scene python sends, without its bodies
+    const char *replayFile = NULL;
 
+    if ( (argc > 2) && (strcmp(argv[1],"-replay")==0) )
+        replayFile = argv[2];
 
-    Initialize_ODE();
-    Initialize_Environment();
-    Read_From_Python();
-    dWorldSetGravity(world,0,0,data->gravity);
+    dInitODE2(0);
+
+    if ( (argc > 1) && (strcmp(argv[1],"-server")==0) ) {
+        Run_Server();
+        return 0;
+    }
 
-    if ( data->runBlind )
+    mainScene = Create_Scene(runBlind);
+    Read_From_Python(mainScene);
+
+    if ( runBlind )
         Run_Blind();
+#ifdef HEADLESS
+    else {
+      std::cerr << "This simulator was built without graphics; run it with -blind or -server" << std::endl;
+      return 1;
+    }
+#else
     else{
       Initialize_Draw_Stuff();
 
-      dsSimulationLoop (argc,argv,data->windowWidth,data->windowHeight,&fn);
+      if ( replayFile )
+        Load_Replay(replayFile);
+
+      Data *data = mainScene->data;
+      if ( data->capture )
+        frameCapture = new FRAME_CAPTURE(data->windowWidth,data->windowHeight,data->captureScale,data->captureStream);
+
+      dsSimulationLoop (argc,argv,mainScene->data->windowWidth,mainScene->data->windowHeight,&fn);
   }
+#endif
   return 0;
 }
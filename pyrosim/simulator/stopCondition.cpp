@@ -0,0 +1,36 @@
+#ifndef _STOP_CONDITION_CPP
+#define _STOP_CONDITION_CPP
+
+#include "stopCondition.h"
+
+STOP_CONDITION::STOP_CONDITION(RECORDER *sensorRecorder, int svi,
+                               int testAbove, double myThreshold,
+                               int startTime) {
+
+	recorder = sensorRecorder;
+
+	sensorValueIndex = svi;
+
+	above = testAbove;
+
+	threshold = myThreshold;
+
+	start = startTime;
+}
+
+int STOP_CONDITION::Is_Met(int timeStep) {
+
+	if ( timeStep < start )
+
+		return false;
+
+	double value = recorder->Get_Latest(sensorValueIndex);
+
+	if ( above )
+
+		return value > threshold;
+	else
+		return value < threshold;
+}
+
+#endif
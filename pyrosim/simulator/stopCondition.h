@@ -0,0 +1,30 @@
+#ifndef _STOP_CONDITION_H
+#define _STOP_CONDITION_H
+
+#include "recorder.h"
+
+// Ends a run early once one value of a sensor drops below or rises
+// above a threshold, e.g. when the robot falls over. The condition is
+// only tested from its start time step on.
+
+class STOP_CONDITION {
+
+private:
+	RECORDER *recorder;
+
+	int sensorValueIndex;
+
+	int above;
+
+	double threshold;
+
+	int start;
+
+public:
+	STOP_CONDITION(RECORDER *sensorRecorder, int svi, int testAbove,
+	               double myThreshold, int startTime);
+
+	int Is_Met(int timeStep);
+};
+
+#endif
@@ -4,6 +4,7 @@
 #include "iostream"
 
 #include "synapse.h"
+#include "pythonInput.h"
 
 SYNAPSE::SYNAPSE(void) {
     sourceNeuronIndex = 0;
@@ -21,12 +22,12 @@ SYNAPSE::~SYNAPSE(void) {
 }
 
 void SYNAPSE::Read_From_Python(void){
-    std::cin >> sourceNeuronIndex; 
-    std::cin >> targetNeuronIndex;
-    std::cin >> startWeight;
-    std::cin >> endWeight;
-    std::cin >> startTime;
-    std::cin >> endTime;
+    pythonInput >> sourceNeuronIndex; 
+    pythonInput >> targetNeuronIndex;
+    pythonInput >> startWeight;
+    pythonInput >> endWeight;
+    pythonInput >> startTime;
+    pythonInput >> endTime;
     weight = startWeight;
 }
 
@@ -45,6 +46,11 @@ double SYNAPSE::Get_Weight(void) {
         return weight; 
 }
 
+int SYNAPSE::Is_Developing(void) {
+
+        return startWeight != endWeight;
+}
+
 void SYNAPSE::Print(void) {
 	std::cerr << sourceNeuronIndex << " ";
     std::cerr << targetNeuronIndex << " ";
@@ -25,6 +25,8 @@ public:
 
 	double Get_Weight(void);
 
+	int  Is_Developing(void);
+
 	void Print(void);
 
 	void Update_Weight(int time);
@@ -5,21 +5,20 @@
 #include "touchSensor.h"
 #include "neuron.h"
 
-TOUCH_SENSOR::TOUCH_SENSOR(int myID, int evalPeriod) {
+TOUCH_SENSOR::TOUCH_SENSOR(int myID, int recordingPeriod, int recordEvery) {
 
 	ID = myID;
 
-	values = new int[evalPeriod];
+	value = 0;
 
-	for (int t = 0 ; t < evalPeriod ; t++ )
-
-		values[t] = 0;
+	recorder = new RECORDER(1,recordingPeriod,recordEvery);
 
         mySensorNeuron = NULL;
 }
 
 TOUCH_SENSOR::~TOUCH_SENSOR(void) {
 
+	delete recorder;
 }
 
 void TOUCH_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
@@ -27,9 +26,9 @@ void TOUCH_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
         mySensorNeuron = sensorNeuron;
 }
 
-void TOUCH_SENSOR::Fires(int t) {
+void TOUCH_SENSOR::Fires(void) {
 
-	values[t] = 1;
+	value = 1;
 }
 
 int  TOUCH_SENSOR::Get_ID(void) {
@@ -37,26 +36,25 @@ int  TOUCH_SENSOR::Get_ID(void) {
         return ID;
 }
 
-void TOUCH_SENSOR::Update_Sensor_Neurons(int t) {
-
-        if ( mySensorNeuron )
+RECORDER *TOUCH_SENSOR::Get_Recorder(void) {
 
-                mySensorNeuron->Set( values[t] );
+        return recorder;
 }
 
-void TOUCH_SENSOR::Write_To_Python(int evalPeriod) {
+void TOUCH_SENSOR::Record(int t) {
 
-        char outString[1000000];
+        recorder->Store(&value,t);
 
-        sprintf(outString,"%d %d ",ID,1);
+	// Touches are detected anew every time step.
 
-        for ( int  t = 0 ; t < evalPeriod ; t++ )
+        value = 0;
+}
 
-                sprintf(outString,"%s %d ",outString,values[t]);
+void TOUCH_SENSOR::Update_Sensor_Neurons(void) {
 
-        sprintf(outString,"%s \n",outString);
+        if ( mySensorNeuron )
 
-        std::cout << outString;
+                mySensorNeuron->Set( value );
 }
 
 #endif
@@ -2,6 +2,7 @@
 #define _TOUCH_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class NEURON;
 
@@ -10,23 +11,27 @@ class TOUCH_SENSOR {
 private:
 
 	int    ID;
-	int *values;
+	double value;
+	RECORDER *recorder;
     NEURON *mySensorNeuron;
 
 public:
-	TOUCH_SENSOR(int myID, int evalPeriod);
+	TOUCH_SENSOR(int myID, int recordingPeriod, int recordEvery);
 
 	~TOUCH_SENSOR(void);
 
         void Connect_To_Sensor_Neuron(NEURON *sensorNeuron);
 
-	void Fires(int t);
+	void Fires(void);
 
         int  Get_ID(void);
 
-        void Update_Sensor_Neurons(int t);
+        RECORDER *Get_Recorder(void);
+
+        void Record(int t);
+
+        void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
@@ -5,17 +5,22 @@
 #include "vestibularSensor.h"
 #include "neuron.h"
 
-VESTIBULAR_SENSOR::VESTIBULAR_SENSOR(int myID, int evalPeriod) {
+VESTIBULAR_SENSOR::VESTIBULAR_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery) {
 
 	ID = myID;
 
-	angles = new double[evalPeriod];
+	geom = myGeom;
+
+	angle = 0.0;
+
+	recorder = new RECORDER(1,recordingPeriod,recordEvery);
 
         mySensorNeuron = NULL;
 }
 
 VESTIBULAR_SENSOR::~VESTIBULAR_SENSOR(void) {
 
+	delete recorder;
 }
 
 void VESTIBULAR_SENSOR::Connect_To_Sensor_Neuron(NEURON *sensorNeuron) {
@@ -28,9 +33,14 @@ int  VESTIBULAR_SENSOR::Get_ID(void) {
         return ID;
 }
 
-void VESTIBULAR_SENSOR::Poll(dBodyID body, int t) {
+RECORDER *VESTIBULAR_SENSOR::Get_Recorder(void) {
+
+        return recorder;
+}
+
+void VESTIBULAR_SENSOR::Poll(void) {
 
-        const dReal *R = dBodyGetRotation(body);
+        const dReal *R = dGeomGetRotation(geom);
 
         double a[3] = {0,0,1};
 
@@ -46,29 +56,19 @@ void VESTIBULAR_SENSOR::Poll(dBodyID body, int t) {
 
         double bLen = sqrt( pow(b[0],2.0) + pow(b[1],2.0) + pow(b[2],2.0) );
 
-        angles[t] = acos( dotProduct / bLen );
+        angle = acos( dotProduct / bLen );
 }
 
-void VESTIBULAR_SENSOR::Update_Sensor_Neurons(int t) {
-
-        if ( mySensorNeuron )
+void VESTIBULAR_SENSOR::Record(int t) {
 
-                mySensorNeuron->Set( angles[t] );
+        recorder->Store(&angle,t);
 }
 
-void VESTIBULAR_SENSOR::Write_To_Python(int evalPeriod) {
-
-        char outString[1000000];
-
-        sprintf(outString,"%d %d ",ID,1);
+void VESTIBULAR_SENSOR::Update_Sensor_Neurons(void) {
 
-        for ( int  t = 0 ; t < evalPeriod ; t++ )
-
-                sprintf(outString,"%s %f ",outString,angles[t]);
-
-        sprintf(outString,"%s \n",outString);
+        if ( mySensorNeuron )
 
-        std::cout << outString;
+                mySensorNeuron->Set( angle );
 }
 
 #endif
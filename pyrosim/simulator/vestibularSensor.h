@@ -2,6 +2,7 @@
 #define _VESTIBULAR_SENSOR_H
 
 #include <ode/ode.h>
+#include "recorder.h"
 
 class NEURON;
 
@@ -11,12 +12,16 @@ private:
 
 	int ID;
 
-	double *angles;
+	dGeomID geom;
+
+	double angle;
+
+	RECORDER *recorder;
 
         NEURON *mySensorNeuron;
 
 public:
-	VESTIBULAR_SENSOR(int myID, int evalPeriod);
+	VESTIBULAR_SENSOR(dGeomID myGeom, int myID, int recordingPeriod, int recordEvery);
 
 	~VESTIBULAR_SENSOR(void);
 
@@ -24,11 +29,14 @@ public:
 
         int  Get_ID(void);
 
-	void Poll(dBodyID body, int t);
+        RECORDER *Get_Recorder(void);
+
+	void Poll(void);
+
+        void Record(int t);
 
-        void Update_Sensor_Neurons(int t);
+        void Update_Sensor_Neurons(void);
 
-	void Write_To_Python(int evalPeriod);
 };
 
 #endif
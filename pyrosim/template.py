@@ -0,0 +1,126 @@
+from __future__ import division, print_function
+import copy
+
+import numpy as np
+
+
+class Parameter(float):
+    """A placeholder for a real valued argument of a send_* method
+
+    A parameter behaves as its value everywhere, so the send_* checks
+    apply to the value. When the scene is turned into a SceneTemplate the
+    fields it was sent in can be given new values for every instance.
+    Only arguments that reach the simulator unchanged can be
+    parameters, e.g. synapse weights, neuron tau and alpha or joint
+    speeds, not synapse times which are scaled to time steps first.
+
+    Attributes
+    ----------
+    name  : str
+            The keyword that sets the parameter in
+            SceneTemplate.instantiate
+    index : int, optional
+            The index of the parameter in the array given for name, None
+            if name is given a single value (the default is None)
+    value : float, optional
+            The value of the parameter in the template scene
+            (the default is 0.0)
+
+    Examples
+    --------
+    >>> weights = [Parameter('weights', i) for i in range(4)]
+    >>> for weight, (source, target) in zip(weights, connections):
+    ...     sim.send_synapse(source, target, weight=weight)
+    >>> template = sim.to_template()
+    >>> new_sim = template.instantiate(weights=np.random.rand(4))
+    """
+
+    def __new__(cls, name, index=None, value=0.0):
+        parameter = float.__new__(cls, value)
+        parameter.name = name
+        parameter.index = index
+
+        return parameter
+
+    def __repr__(self):
+        return ('Parameter(' + repr(self.name) + ', ' + repr(self.index) +
+                ', ' + float.__repr__(self) + ')')
+
+    # the text scene upload sends str() of every argument, which would
+    # otherwise fall back to __repr__
+    __str__ = float.__repr__
+
+
+class SceneTemplate(object):
+    """A packed scene whose parameters are patched for every instance
+
+    Made by Simulator.to_template. Instantiating copies the packed
+    commands of the scene and writes the new parameter values straight
+    into them, so no send_* method runs again.
+    """
+
+    def __init__(self, sim):
+        self._sim = sim
+        self._commands = bytes(sim._binary_commands)
+
+        placeholders = {}
+        for offset, name, index in sim._parameter_offsets:
+            placeholders.setdefault(name, ([], []))
+            placeholders[name][0].append(offset)
+            placeholders[name][1].append(0 if index is None else index)
+
+        # byte positions of every parameter's float64 in the commands
+        self._positions = {}
+        self._indices = {}
+        # the number of values each name is given
+        self._sizes = {}
+        for name, (offsets, indices) in placeholders.items():
+            self._positions[name] = (np.array(offsets)[:, np.newaxis] +
+                                     np.arange(8))
+            self._indices[name] = np.array(indices)
+            self._sizes[name] = max(indices) + 1
+
+    def get_parameter_names(self):
+        """Returns the names of the parameters in the scene"""
+        return sorted(self._positions)
+
+    def instantiate(self, **params):
+        """Returns a new simulator with the given parameter values
+
+        Parameters
+        ----------
+        params : float or numpy array
+                The values of each named parameter, one for each index
+                it was sent with. Parameters that are not given keep
+                their value in the template.
+
+        Returns
+        -------
+        Simulator
+                A simulator that has not been started yet
+        """
+        for name in params:
+            assert name in self._positions, ('Scene has no parameter ' +
+                                             name)
+
+        commands = bytearray(self._commands)
+        patch = np.frombuffer(commands, dtype=np.uint8)
+
+        for name, values in params.items():
+            values = np.asarray(values, dtype='<f8').ravel()
+            assert values.size == self._sizes[name], (
+                'Parameter ' + name + ' needs ' + str(self._sizes[name]) +
+                ' values, got ' + str(values.size))
+            values = values[self._indices[name]]
+            patch[self._positions[name]] = values.view(np.uint8).reshape(
+                -1, 8)
+
+        sim = copy.copy(self._sim)
+        # the send_* methods add to these, which must not reach the
+        # template or the other instances
+        for name, value in list(vars(sim).items()):
+            if isinstance(value, (list, dict, set, np.ndarray)):
+                setattr(sim, name, copy.copy(value))
+        sim._binary_commands = commands
+
+        return sim
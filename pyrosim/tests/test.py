@@ -1,5 +1,18 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
 import pyrosim
 
+from subprocess import check_output
+try:
+    from shutil import which
+except ImportError:
+    # python 2
+    from distutils.spawn import find_executable as which
+
+from nose.plugins.skip import SkipTest
 from nose.tools import assert_equal
 from nose.tools import assert_not_equal
 from nose.tools import assert_raises
@@ -84,3 +97,661 @@ class Test_Pyrosim(object):
         data = self.sim.get_sensor_data(ray_sensor, svi=0)
         assert abs(0.698613-data[200])<0.000001, 'Pendulum fail'
 
+    def test_stream(self):
+        sims = [self.sim, pyrosim.Simulator(play_blind=True,
+                                            eval_time=self.EVAL_TIME)]
+        for sim in sims:
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            sim.send_position_sensor(cyl)
+            sim.send_touch_sensor(cyl)
+
+        blocks = [block.copy() for block in sims[0].stream(chunk=300)]
+        assert [block.shape[2] for block in blocks] == [300, 300, 300, 100]
+        # the blocks are all there is of a streamed run
+        assert_raises(AssertionError, sims[0].get_data)
+        assert_raises(AssertionError, sims[0].get_sensor_data, 0)
+
+        sims[1].start()
+        data = sims[1].wait_to_finish()
+        streamed = np.concatenate(blocks, axis=2)
+        assert np.allclose(streamed, data), 'Streamed data differs'
+
+    def test_record_every(self):
+        sims = [self.sim, pyrosim.Simulator(play_blind=True,
+                                            eval_time=self.EVAL_TIME)]
+        sensors = []
+        for sim, record_every in zip(sims, [1, 7]):
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            sensors.append(sim.send_position_sensor(
+                cyl, record_every=record_every))
+            sensors.append(sim.send_touch_sensor(cyl, record='last'))
+            sim.start()
+            sim.wait_to_finish()
+
+        full = sims[0].get_sensor_data(sensors[0], svi=2)
+        every = sims[1].get_sensor_data(sensors[2], svi=2)
+        assert len(every) == 143
+        assert np.allclose(every, full[::7]), 'Decimated data differs'
+
+        last = sims[0].get_sensor_data(sensors[1])
+        assert len(last) == 1
+
+    def test_binary(self):
+        sims = [self.sim, pyrosim.Simulator(play_blind=True,
+                                            eval_time=self.EVAL_TIME,
+                                            binary=True)]
+        data = []
+        for sim in sims:
+            cyl_1 = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            cyl_2 = sim.send_cylinder(x=1, y=0, z=2.5, r1=1, r2=0, r3=0)
+            joint = sim.send_hinge_joint(cyl_1, cyl_2, x=0.5, y=0, z=2.5)
+            sensor = sim.send_proprioceptive_sensor(joint)
+            sim.send_position_sensor(cyl_2)
+            sensor_neuron = sim.send_sensor_neuron(sensor)
+            motor_neuron = sim.send_motor_neuron(joint)
+            sim.send_synapse(sensor_neuron, motor_neuron, weight=-1.0)
+            sim.start()
+            data.append(sim.wait_to_finish())
+
+        assert np.array_equal(data[0], data[1]), 'Binary upload differs'
+
+    def test_server(self):
+        sims = [self.sim] + [pyrosim.Simulator(play_blind=True,
+                                               eval_time=self.EVAL_TIME)
+                             for _ in range(2)]
+        for sim in sims:
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            sim.send_position_sensor(cyl)
+            sim.send_touch_sensor(cyl)
+
+        sims[0].start()
+        data = sims[0].wait_to_finish()
+
+        with pyrosim.SimulatorServer(self.sim.pyrosim_path) as server:
+            for sim in sims[1:]:
+                assert np.array_equal(server.evaluate(sim), data), (
+                    'Server data differs')
+
+    def test_evaluate_many(self):
+        sims = [pyrosim.Simulator(play_blind=True, eval_time=eval_time)
+                for eval_time in [100, 300, 200, 50]]
+        for sim in sims:
+            sim.pyrosim_path = self.sim.pyrosim_path
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            sim.send_position_sensor(cyl)
+
+        results = pyrosim.evaluate_many(sims, workers=2)
+
+        for sim, data in zip(sims, results):
+            assert data.shape == (1, 4, sim.eval_time)
+            assert data is sim.get_data()
+
+    def test_evaluate_batch(self):
+        sims = [pyrosim.Simulator(play_blind=True, eval_time=eval_time)
+                for eval_time in [100, 300, 200, 300, 100, 200]]
+        for i, sim in enumerate(sims):
+            sim.pyrosim_path = self.sim.pyrosim_path
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5 + i % 3, r1=1, r2=0, r3=0)
+            sim.send_position_sensor(cyl)
+
+        with pyrosim.SimulatorServer(self.sim.pyrosim_path) as server:
+            batched = server.evaluate_batch(sims[:3])
+            alone = [server.evaluate(sim) for sim in sims[3:]]
+
+        for data_1, data_2 in zip(batched, alone):
+            assert np.array_equal(data_1[:, :, :100], data_2[:, :, :100]), (
+                'Batched data differs')
+
+    def test_template(self):
+        def build(sim, weight, tau):
+            cyl_1 = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            cyl_2 = sim.send_cylinder(x=1, y=0, z=2.5, r1=1, r2=0, r3=0)
+            joint = sim.send_hinge_joint(cyl_1, cyl_2, x=0.5, y=0, z=2.5)
+            sensor = sim.send_proprioceptive_sensor(joint)
+            sensor_neuron = sim.send_sensor_neuron(sensor)
+            motor_neuron = sim.send_motor_neuron(joint, tau=tau)
+            sim.send_synapse(sensor_neuron, motor_neuron, weight=weight)
+
+        template_sim = pyrosim.Simulator(play_blind=True,
+                                         eval_time=self.EVAL_TIME, binary=True)
+        build(template_sim, pyrosim.Parameter('weights', 0),
+              pyrosim.Parameter('tau', value=1.0))
+        template = template_sim.to_template()
+        assert template.get_parameter_names() == ['tau', 'weights']
+        for weights in [[], [0.5, 0.5]]:
+            assert_raises(AssertionError, template.instantiate,
+                          weights=weights)
+
+        for weight, tau in [(-1.0, 1.0), (0.5, 0.3)]:
+            sim = template.instantiate(weights=[weight], tau=tau)
+            sim.start()
+            data = sim.wait_to_finish()
+
+            direct = pyrosim.Simulator(play_blind=True,
+                                       eval_time=self.EVAL_TIME, binary=True)
+            build(direct, weight, tau)
+            direct.start()
+            assert np.array_equal(data, direct.wait_to_finish()), (
+                'Template instance differs')
+
+    def test_template_instances_independent(self):
+        template_sim = pyrosim.Simulator(play_blind=True, eval_time=10,
+                                         binary=True)
+        box = template_sim.send_box(x=0, y=0, z=1.0)
+        template_sim.send_position_sensor(box)
+        template = template_sim.to_template()
+
+        first = template.instantiate()
+        wall = first.send_box(x=2, y=0, z=0.5, static=True)
+        first.send_touch_sensor(wall)
+        first.start()
+        assert first.wait_to_finish().shape[0] == 2
+
+        # neither the template nor a sibling sees the new body and sensor
+        assert len(template_sim._body_bounds) == 1
+        assert template_sim._sensor_recording == [1]
+        assert wall not in template_sim._static_bodies
+        second = template.instantiate()
+        assert len(second._body_bounds) == 1
+        assert wall not in second._static_bodies
+        second.start()
+        assert second.wait_to_finish().shape[0] == 1
+
+    def test_parameter_text_upload(self):
+        assert str(pyrosim.Parameter('w', 0, 0.5)) == '0.5'
+
+        data = []
+        for binary in [False, True]:
+            sim = pyrosim.Simulator(play_blind=True,
+                                    eval_time=self.EVAL_TIME, binary=binary)
+            cyl_1 = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            cyl_2 = sim.send_cylinder(x=1, y=0, z=2.5, r1=1, r2=0, r3=0)
+            joint = sim.send_hinge_joint(cyl_1, cyl_2, x=0.5, y=0, z=2.5)
+            sensor = sim.send_proprioceptive_sensor(joint)
+            sensor_neuron = sim.send_sensor_neuron(sensor)
+            motor_neuron = sim.send_motor_neuron(
+                joint, tau=pyrosim.Parameter('tau', value=0.3))
+            sim.send_synapse(sensor_neuron, motor_neuron,
+                             weight=pyrosim.Parameter('weights', 0, -1.0))
+            sim.start()
+            data.append(sim.wait_to_finish())
+
+        assert np.array_equal(data[0], data[1]), (
+            'Text and binary uploads differ')
+
+    def test_stop_condition(self):
+        sims = [self.sim, pyrosim.Simulator(play_blind=True,
+                                            eval_time=self.EVAL_TIME)]
+        sensors = []
+        for sim in sims:
+            cyl = sim.send_cylinder(x=0, y=0, z=2.5, r1=1, r2=0, r3=0)
+            sensors.append(sim.send_position_sensor(cyl))
+        sims[1].add_stop_condition(sensors[1], svi=2, below=2.0)
+
+        for sim in sims:
+            sim.start()
+            sim.wait_to_finish()
+
+        full = sims[0].get_sensor_data(sensors[0], svi=2)
+        stopped = sims[1].get_sensor_data(sensors[1], svi=2)
+        stop_step = sims[1].get_stop_step()
+        assert sims[0].get_stop_step() == self.EVAL_TIME
+        assert 0 < stop_step < self.EVAL_TIME
+        assert sims[1].get_data().shape == (1, 4, stop_step)
+        assert stopped[-1] < 2.0 and stopped[-2] >= 2.0
+        assert np.array_equal(stopped, full[:stop_step]), (
+            'Stopped data differs')
+
+    def test_stop_condition_value_index(self):
+        box = self.sim.send_box(x=0, y=0, z=1.0)
+        touch = self.sim.send_touch_sensor(box)
+        position = self.sim.send_position_sensor(box)
+
+        # touch sensors have a single value
+        assert_raises(AssertionError, self.sim.add_stop_condition, touch,
+                      svi=1, above=0.5)
+        assert_raises(AssertionError, self.sim.add_stop_condition,
+                      position, svi=3, below=0.0)
+        assert self.sim.add_stop_condition(position, svi=2, below=0.0)
+
+    def _run_network(self, dense):
+        # each motor drives a cart along a velocity controlled slider,
+        # so its value is the cart's speed in the next time step
+        eval_time = 30
+        sim = pyrosim.Simulator(play_blind=True, eval_time=eval_time,
+                                gravity=0)
+        carts = [sim.send_box(x=0, y=2 * i, z=1, length=0.2, width=0.2,
+                              height=0.2) for i in range(2)]
+        for cart in carts:
+            sim.send_slider_joint(-1, cart, x=1, y=0, z=0, lo=-100,
+                                  hi=100, speed=0.01, strength=1000,
+                                  position_control=False)
+        positions = [sim.send_position_sensor(cart) for cart in carts]
+
+        # sent out of order, the simulator groups the neurons by type
+        hidden_1 = sim.send_hidden_neuron(tau=0.8, alpha=0.5)
+        sensor = sim.send_sensor_neuron(positions[0], svi=0)
+        motor_1 = sim.send_motor_neuron(0, tau=0.7, alpha=0.3,
+                                        start_value=0.2)
+        bias = sim.send_bias_neuron()
+        function = sim.send_function_neuron(np.cos)
+        hidden_2 = sim.send_hidden_neuron(tau=1.0, alpha=0.0)
+        user_input = sim.send_user_input_neuron([0.5, -0.25, 1.0])
+        motor_2 = sim.send_motor_neuron(1, tau=1.2, alpha=0.0)
+        num_neurons = sim.get_num_neurons()
+
+        synapses = [(sensor, hidden_1, 0.4), (bias, hidden_1, -0.3),
+                    (function, hidden_1, 0.6), (user_input, hidden_1, 0.5),
+                    (hidden_2, hidden_1, -0.7), (hidden_1, hidden_2, 0.9),
+                    (user_input, hidden_2, -0.4), (hidden_1, motor_1, 1.1),
+                    (hidden_2, motor_1, -0.5), (bias, motor_1, 0.2),
+                    (function, motor_1, 0.3), (hidden_2, motor_2, 0.8),
+                    (sensor, motor_2, -0.6), (user_input, motor_2, 0.4)]
+        for source, target, weight in synapses:
+            sim.send_synapse(source, target, weight)
+        if dense:
+            # zero weights fill the rows without changing the values
+            for target in [hidden_1, hidden_2, motor_1, motor_2]:
+                for source in range(num_neurons):
+                    sim.send_synapse(source, target, 0.0)
+        sim.send_developing_synapse(function, hidden_2, start_weight=0.0,
+                                    end_weight=-1.0, start_time=0.0,
+                                    end_time=1.0)
+        sim.start()
+        data = sim.wait_to_finish()
+
+        speeds = -np.diff(data[positions, 0, :], axis=1).T / sim.dt
+
+        # the network worked out step by step
+        taus = {hidden_1: 0.8, hidden_2: 1.0, motor_1: 0.7, motor_2: 1.2}
+        alphas = {hidden_1: 0.5, hidden_2: 0.0, motor_1: 0.3, motor_2: 0.0}
+        times = np.arange(eval_time) * sim.dt
+        inputs = np.resize([0.5, -0.25, 1.0], eval_time)
+        values = np.zeros(num_neurons)
+        values[[motor_1, function, user_input]] = [0.2, 1.0, 0.5]
+        expected = []
+        for t in range(eval_time):
+            previous = values.copy()
+            previous[[sensor, bias]] = [data[positions[0], 0, t], 1.0]
+            weights = synapses + [(function, hidden_2, -t /
+                                   (eval_time - 1.0))]
+            for neuron in taus:
+                total = sum(weight * previous[source]
+                            for source, target, weight in weights
+                            if target == neuron)
+                # in the first time step the start value adds to the input
+                if t == 0:
+                    total += previous[neuron]
+                values[neuron] = np.tanh(alphas[neuron] * previous[neuron] +
+                                         taus[neuron] * total)
+            values[[function, user_input]] = [np.cos(times[t]), inputs[t]]
+            expected.append(values[[motor_1, motor_2]])
+
+        return speeds, np.array(expected[:-1])
+
+    def test_network(self):
+        for dense in [False, True]:
+            speeds, expected = self._run_network(dense)
+            assert np.allclose(speeds, expected, atol=1e-5), (
+                ('Dense' if dense else 'Sparse') +
+                ' network differs from its step by step values')
+
+    def test_collision_spaces(self):
+        data = []
+        for space in ['hash', 'quadtree', 'sap']:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=300,
+                                    collision_space=space)
+            box = sim.send_box(x=0, y=0, z=0.25, length=0.5, width=0.5,
+                               height=0.5, collision_group='a')
+            falling = sim.send_box(x=0.1, y=0, z=1.5, length=0.5, width=0.5,
+                                   height=0.5, collision_group='b')
+            sim.assign_collision('a', 'b')
+            sim.send_position_sensor(box)
+            sim.send_position_sensor(falling)
+            sim.start()
+            data.append(sim.wait_to_finish())
+
+        assert abs(data[0][1, 2, -1] - 0.75) < 0.01, 'Boxes did not collide'
+        for other in data[1:]:
+            # the contacts may be found in another order
+            assert np.allclose(data[0][:, :, -1], other[:, :, -1],
+                               atol=1e-3), 'Collision spaces differ'
+
+    def _overlapping_pairs(self, sim, pairs):
+        # returns the touch sensors of pairs of overlapping boxes floating
+        # apart from each other and from the ground
+        touches = []
+        for i, groups in enumerate(pairs):
+            for j, group in enumerate(groups):
+                box = sim.send_box(x=3 * i, y=0.3 * j, z=2, length=0.5,
+                                   width=0.5, height=0.5,
+                                   collision_group=group)
+                touches.append(sim.send_touch_sensor(box))
+        return touches
+
+    def test_collision_groups(self):
+        pairs = [('a', 'b'), ('a', 'c'), ('b', 'c'), ('a', 'a'), ('s', 's')]
+        allowed = [True, False, True, False, True]
+        for space in ['hash', 'quadtree', 'sap']:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=20,
+                                    gravity=0, collision_space=space)
+            touches = self._overlapping_pairs(sim, pairs)
+            sim.create_collision_matrix('none')
+            for group_1, group_2 in [('a', 'b'), ('b', 'c'), ('s', 's')]:
+                sim.assign_collision(group_1, group_2)
+            sim.start()
+            sim.wait_to_finish()
+
+            for i, touch in enumerate(touches):
+                touched = np.any(sim.get_sensor_data(touch) > 0)
+                assert touched == allowed[i // 2], (
+                    'Boxes of ' + ' and '.join(pairs[i // 2]) +
+                    (' did not' if allowed[i // 2] else ' did') +
+                    ' collide in ' + space)
+
+    def test_many_collision_groups(self):
+        # more groups than category bits, so the near callback filters
+        # the pairs
+        num_pairs = 35
+        sim = pyrosim.Simulator(play_blind=True, eval_time=20, gravity=0)
+        pairs = [(2 * i, 2 * i + 1) for i in range(num_pairs)]
+        touches = self._overlapping_pairs(sim, pairs)
+        assert sim.get_num_groups() > 64
+        sim.create_collision_matrix('none')
+        for group_1, group_2 in pairs[::2]:
+            sim.assign_collision(group_1, group_2)
+        sim.start()
+        sim.wait_to_finish()
+
+        for i, touch in enumerate(touches):
+            touched = np.any(sim.get_sensor_data(touch) > 0)
+            assert touched == (i // 2 % 2 == 0), (
+                'Boxes of groups ' + str(pairs[i // 2]) +
+                (' did not' if i // 2 % 2 == 0 else ' did') + ' collide')
+
+    def test_ray_sensor_targets(self):
+        # a static body, a body in a collision group of its own and a body
+        # with a ray of its own, each 2.5 ahead of a ray cast from the
+        # middle of another body
+        for space in ['hash', 'sap']:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=10,
+                                    gravity=0, collision_space=space)
+            rays = []
+            colors = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+            for i, (r, g, b) in enumerate(colors):
+                eye = sim.send_sphere(x=0, y=5 * i, z=1, radius=0.1)
+                rays.append(sim.send_ray_sensor(eye, x=0, y=5 * i, z=1,
+                                                r1=1, r2=0, r3=0))
+                target = sim.send_box(x=3, y=5 * i, z=1, length=1, width=1,
+                                      height=1, r=r, g=g, b=b,
+                                      static=(i == 0),
+                                      collision_group=('ray_target' if
+                                                       i == 1 else
+                                                       'default'))
+            beyond = sim.send_ray_sensor(target, x=3.5, y=10, z=1,
+                                         r1=1, r2=0, r3=0)
+            sim.start()
+            data = sim.wait_to_finish()
+
+            for ray, color in zip(rays, colors):
+                assert np.allclose(data[ray, :, -1], (2.5,) + color), (
+                    'Ray missed its target in ' + space)
+            assert np.allclose(data[beyond, :, -1], (10, 0, 0, 0)), (
+                'Ray hit nothing but did not report its max distance')
+
+    def test_light_sensor(self):
+        # bodies hold one light sensor each
+        sensor_bodies = [self.sim.send_sphere(x=0, y=0, z=0.1, radius=0.1)
+                         for _ in range(2)]
+        for x in [2, -4]:
+            self.sim.send_light_source(
+                self.sim.send_sphere(x=x, y=0, z=0.1, radius=0.1))
+        nearest = self.sim.send_light_sensor(sensor_bodies[0])
+        total = self.sim.send_light_sensor(sensor_bodies[1], sum_sources=True)
+        self.sim.start()
+        self.sim.wait_to_finish()
+
+        assert abs(self.sim.get_sensor_data(nearest)[-1] - 0.25) < 1e-4
+        assert abs(self.sim.get_sensor_data(total)[-1] - 0.3125) < 1e-4
+
+    def test_offscreen_capture(self):
+        cwd = os.getcwd()
+        frames = tempfile.mkdtemp()
+        os.chdir(frames)
+        try:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=20, capture=5,
+                                    capture_scale=2, window_size=(65, 48))
+            if not os.path.exists(sim.pyrosim_path + '/simulator-offscreen'):
+                raise SkipTest('simulator-offscreen is not built')
+            box = sim.send_box(x=0, y=0, z=1.0)
+            sim.send_position_sensor(box)
+            sim.start()
+            sim.wait_to_finish()
+
+            assert sorted(os.listdir('frame')) == ['0001.ppm', '0002.ppm',
+                                                   '0003.ppm']
+            with open('frame/0001.ppm', 'rb') as ppm:
+                assert ppm.read(12) == b'P6\n32 24\n255'
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(frames)
+
+    def test_movie(self):
+        if which('ffmpeg') is None or which('ffprobe') is None:
+            raise SkipTest('ffmpeg is not installed')
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        os.chdir(directory)
+        try:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=20, capture=5,
+                                    capture_scale=2, window_size=(65, 48),
+                                    movie='run.mp4')
+            if not os.path.exists(sim.pyrosim_path + '/simulator-offscreen'):
+                raise SkipTest('simulator-offscreen is not built')
+            box = sim.send_box(x=0, y=0, z=1.0)
+            sim.send_position_sensor(box)
+            sim.start()
+            sim.wait_to_finish()
+            sim.make_movie()
+
+            assert not os.path.exists('frame'), 'Frames were written to files'
+            assert os.path.getsize('run.mp4') > 0, 'Movie is empty'
+            size = check_output(['ffprobe', '-v', 'error',
+                                 '-select_streams', 'v:0',
+                                 '-show_entries', 'stream=width,height',
+                                 '-of', 'csv=p=0', 'run.mp4'])
+            assert size.decode().strip() == '32,24'
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+    def test_pose_log(self):
+        directory = tempfile.mkdtemp()
+        try:
+            pose_log = os.path.join(directory, 'run.pose')
+            sim = pyrosim.Simulator(play_blind=True, eval_time=20,
+                                    pose_log=pose_log, pose_log_every=2)
+            box = sim.send_box(x=0, y=0, z=1.0, length=0.2, width=0.3,
+                               height=0.4, r=0.5, g=0.25, b=1.0)
+            sphere = sim.send_sphere(x=1, y=0, z=0.5, radius=0.2)
+            box_sensor = sim.send_position_sensor(box)
+            sphere_sensor = sim.send_position_sensor(sphere)
+            sim.start()
+            data = sim.wait_to_finish()
+
+            log = pyrosim.read_pose_log(pose_log)
+            assert log.shapes == ['box', 'sphere']
+            assert np.allclose(log.sizes, [[0.2, 0.3, 0.4], [0.2, 0, 0]])
+            assert np.allclose(log.colors[0], [0.5, 0.25, 1.0])
+            assert log.log_every == 2
+            # the start and every second of the 20 time steps
+            assert log.num_frames == 11
+            assert log.quaternions.shape == (11, 2, 4)
+
+            # the sensors see the poses before each time step
+            assert np.allclose(log.positions[:10, 0],
+                               data[box_sensor, :3, ::2].T, atol=1e-6)
+            assert np.allclose(log.positions[:10, 1],
+                               data[sphere_sensor, :3, ::2].T, atol=1e-6)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_render_every(self):
+        cwd = os.getcwd()
+        frames = tempfile.mkdtemp()
+        os.chdir(frames)
+        try:
+            data = []
+            images = []
+            # drawing every fourth time step captures the same frames as
+            # drawing all of them
+            for render_every in [4, 1]:
+                sim = pyrosim.Simulator(play_blind=True, eval_time=20,
+                                        capture=4, render_every=render_every,
+                                        window_size=(32, 24))
+                if not os.path.exists(sim.pyrosim_path +
+                                      '/simulator-offscreen'):
+                    raise SkipTest('simulator-offscreen is not built')
+                box = sim.send_box(x=0, y=0, z=1.0)
+                sim.send_position_sensor(box)
+                sim.start()
+                data.append(sim.wait_to_finish())
+
+                assert sorted(os.listdir('frame')) == [
+                    '0001.ppm', '0002.ppm', '0003.ppm', '0004.ppm']
+                images.append([open('frame/' + name, 'rb').read()
+                               for name in sorted(os.listdir('frame'))])
+
+            assert np.array_equal(data[0], data[1])
+            assert images[0] == images[1]
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(frames)
+
+    def test_headless(self):
+        blind_simulator = pyrosim.pyrosim.blind_simulator
+        data = []
+        for headless in [True, False]:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=100)
+            if not os.path.exists(sim.pyrosim_path + '/simulator-headless'):
+                raise SkipTest('simulator-headless is not built')
+            if not headless:
+                pyrosim.pyrosim.blind_simulator = (
+                    lambda path: path + '/simulator')
+            try:
+                box = sim.send_box(x=0, y=0, z=1.0)
+                sim.send_position_sensor(box)
+                sim.send_ray_sensor(box, x=0, y=0, z=1.0, r1=1, r2=0, r3=0)
+                sim.start()
+                data.append(sim.wait_to_finish())
+            finally:
+                pyrosim.pyrosim.blind_simulator = blind_simulator
+
+        assert np.array_equal(data[0], data[1]), 'Headless run differs'
+
+    def test_replay(self):
+        cwd = os.getcwd()
+        frames = tempfile.mkdtemp()
+        os.chdir(frames)
+        try:
+            images = []
+            for replay in [None, 'run.pose']:
+                sim = pyrosim.Simulator(play_blind=True, eval_time=20,
+                                        capture=2, window_size=(32, 24),
+                                        replay=replay,
+                                        pose_log=None if replay else
+                                        'run.pose')
+                if not os.path.exists(sim.pyrosim_path +
+                                      '/simulator-offscreen'):
+                    raise SkipTest('simulator-offscreen is not built')
+                if replay is None:
+                    box = sim.send_box(x=0, y=0, z=1.0, r1=1, r2=1, r3=0)
+                    sim.send_position_sensor(box)
+                sim.start()
+                sim.wait_to_finish()
+                images.append([open('frame/' + name, 'rb').read()
+                               for name in sorted(os.listdir('frame'))])
+
+            # the replay draws the last frame as well
+            assert len(images[0]) == 9
+            assert len(images[1]) == 10
+            assert images[0] == images[1][:9]
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(frames)
+
+    def test_solver(self):
+        data = []
+        for solver in ['world', 'quickstep']:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=300,
+                                    solver=solver, solver_iterations=50,
+                                    erp=0.5, cfm=1e-5)
+            box = sim.send_box(x=0, y=0, z=1.0, length=0.5, width=0.5,
+                               height=0.5)
+            arm = sim.send_cylinder(x=0.5, y=2, z=1.0, r1=1, r2=0, r3=0)
+            sim.send_hinge_joint(pyrosim.Simulator.WORLD, arm, x=0, y=2,
+                                 z=1.0, n1=0, n2=1, n3=0,
+                                 position_control=False)
+            sim.send_position_sensor(box)
+            sim.send_position_sensor(arm)
+            sim.start()
+            data.append(sim.wait_to_finish())
+
+        assert abs(data[0][0, 2, -1] - 0.25) < 0.01, 'Box fell through'
+        # quickstep only approximates the forces of the contacts and joints
+        assert np.allclose(data[0][:, :, -1], data[1][:, :, -1],
+                           atol=0.02), 'Solvers differ'
+
+    def test_static(self):
+        sim = pyrosim.Simulator(play_blind=True, eval_time=100)
+        platform = sim.send_box(x=0, y=0, z=0.5, length=1, width=1,
+                                height=1, static=True)
+        box = sim.send_box(x=0, y=0, z=1.5, length=0.5, width=0.5,
+                           height=0.5)
+        floating = sim.send_sphere(x=2, y=0, z=1.0, static=True)
+        ray = sim.send_ray_sensor(floating, x=2, y=0, z=1.0,
+                                  r1=0, r2=0, r3=-1)
+        box_position = sim.send_position_sensor(box)
+        floating_position = sim.send_position_sensor(floating)
+        platform_touch = sim.send_touch_sensor(platform)
+        sim.create_collision_matrix('all')
+        sim.start()
+        data = sim.wait_to_finish()
+
+        # the box rests on the platform, which stays in the air
+        assert abs(data[box_position, 2, -1] - 1.25) < 0.01, (
+            'Box fell through')
+        assert np.all(data[floating_position, 2] == 1.0)
+        assert data[platform_touch, 0, -1] == 1
+        # the ray passes through its own sphere to the ground
+        assert abs(data[ray, 0, -1] - 1.0) < 1e-6
+
+        sim = pyrosim.Simulator(play_blind=True)
+        wall = sim.send_box(static=True)
+        assert_raises(AssertionError, sim.send_fixed_joint,
+                      wall, pyrosim.Simulator.WORLD)
+        assert_raises(AssertionError, sim.send_external_force,
+                      wall, 1, 0, 0)
+
+    def test_substeps(self):
+        data = []
+        for dt, substeps, eval_time in [(0.05, 5, 100), (0.01, 1, 500)]:
+            sim = pyrosim.Simulator(play_blind=True, eval_time=eval_time,
+                                    dt=dt, substeps=substeps)
+            box = sim.send_box(x=0, y=0, z=1.0, length=0.5, width=0.5,
+                               height=0.5)
+            arm = sim.send_cylinder(x=0.5, y=2, z=1.0, r1=1, r2=0, r3=0)
+            sim.send_hinge_joint(pyrosim.Simulator.WORLD, arm, x=0, y=2,
+                                 z=1.0, n1=0, n2=1, n3=0,
+                                 position_control=False)
+            sim.send_position_sensor(box)
+            sim.send_position_sensor(arm)
+            touch = sim.send_touch_sensor(box)
+            sim.start()
+            data.append(sim.wait_to_finish())
+
+        # five substeps take the same path as five steps of a fifth of dt
+        assert data[0].shape[2] == 100
+        assert np.allclose(data[0][:2], data[1][:2, :, ::5], atol=1e-4)
+        # touches between the time steps are not lost
+        assert data[0][2, 0, -1] == 1